@@ -1,17 +1,25 @@
 from . import types
 from ._anthropic import ChatAnthropic, ChatBedrockAnthropic
+from ._cache import ResponseCache
 from ._chat import Chat
 from ._content_image import content_image_file, content_image_plot, content_image_url
+from ._context import KeepLastTurns, SummarizeOlderTurns, TokenBudget
+from ._fallback import FallbackProvider
 from ._github import ChatGithub
 from ._google import ChatGoogle
 from ._groq import ChatGroq
+from ._hedged import HedgedProvider
 from ._interpolate import interpolate, interpolate_file
 from ._ollama import ChatOllama
 from ._openai import ChatAzureOpenAI, ChatOpenAI
+from ._parallel import ParallelResults, parallel_chat, parallel_extract_data
 from ._perplexity import ChatPerplexity
 from ._provider import Provider
-from ._tokens import token_usage
-from ._tools import Tool
+from ._ratelimit import RateLimiter, rate_limit
+from ._retry import RetryPolicy
+from ._tokenizer import count_tokens, register_tokenizer
+from ._tokens import token_price, token_scope, token_usage
+from ._tools import Tool, ToolCache
 from ._turn import Turn
 
 __all__ = (
@@ -25,14 +33,31 @@ __all__ = (
     "ChatAzureOpenAI",
     "ChatPerplexity",
     "Chat",
+    "count_tokens",
     "content_image_file",
     "content_image_plot",
     "content_image_url",
     "interpolate",
     "interpolate_file",
+    "parallel_chat",
+    "parallel_extract_data",
+    "ParallelResults",
+    "FallbackProvider",
+    "HedgedProvider",
+    "KeepLastTurns",
     "Provider",
+    "RateLimiter",
+    "rate_limit",
+    "register_tokenizer",
+    "RetryPolicy",
+    "ResponseCache",
+    "SummarizeOlderTurns",
+    "TokenBudget",
+    "token_price",
+    "token_scope",
     "token_usage",
     "Tool",
+    "ToolCache",
     "Turn",
     "types",
 )
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast, overload
 
 from pydantic import BaseModel
 
+from ._batch import BatchClient
 from ._chat import Chat
 from ._content import (
     Content,
@@ -23,7 +24,9 @@ from ._turn import Turn, normalize_turns
 from ._utils import log_model_default
 
 if TYPE_CHECKING:
+    from anthropic import Anthropic
     from anthropic.types import (
+        CacheControlEphemeralParam,
         Message,
         MessageParam,
         RawMessageStreamEvent,
@@ -58,6 +61,7 @@ def ChatAnthropic(
     model: "Optional[ModelParam]" = None,
     api_key: Optional[str] = None,
     max_tokens: int = 4096,
+    prompt_caching: bool = False,
     kwargs: Optional["ChatClientArgs"] = None,
 ) -> Chat["SubmitInputArgs", Message]:
     """
@@ -117,6 +121,15 @@ def ChatAnthropic(
         variable.
     max_tokens
         Maximum number of tokens to generate before stopping.
+    prompt_caching
+        Whether to use [prompt
+        caching](https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching).
+        If `True`, cache breakpoints are placed on the system prompt, the tool
+        definitions, and the latest message, so that subsequent requests can
+        reuse (rather than re-process) the conversation so far. This reduces
+        both cost and latency for long conversations. The number of input
+        tokens read from, and written to, the cache are available via
+        `Turn.cached_tokens` and [](`~chatlas.token_usage`).
     kwargs
         Additional arguments to pass to the `anthropic.Anthropic()` client
         constructor.
@@ -171,6 +184,7 @@ def ChatAnthropic(
             api_key=api_key,
             model=model,
             max_tokens=max_tokens,
+            prompt_caching=prompt_caching,
             kwargs=kwargs,
         ),
         turns=normalize_turns(
@@ -187,6 +201,7 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
         max_tokens: int,
         model: str,
         api_key: str | None,
+        prompt_caching: bool = False,
         kwargs: Optional["ChatClientArgs"] = None,
     ):
         try:
@@ -199,6 +214,7 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
 
         self._model = model
         self._max_tokens = max_tokens
+        self._prompt_caching = prompt_caching
 
         kwargs_full: "ChatClientArgs" = {
             "api_key": api_key,
@@ -333,8 +349,46 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
             if len(turns) > 0 and turns[0].role == "system":
                 kwargs_full["system"] = turns[0].text
 
+        if self._prompt_caching:
+            self._add_cache_breakpoints(kwargs_full)
+
         return kwargs_full
 
+    @staticmethod
+    def _add_cache_breakpoints(kwargs: "SubmitInputArgs") -> None:
+        """
+        Mark the system prompt, tool definitions, and latest message as cacheable.
+
+        Since the cache is keyed by the prefix of the request up to (and
+        including) each breakpoint, these breakpoints allow the next request in
+        the conversation to read everything but its new message(s) from cache.
+        Note that message params are copied (rather than modified in place),
+        since they are cached on the turn.
+        """
+        cache_control: "CacheControlEphemeralParam" = {"type": "ephemeral"}
+
+        system = kwargs.get("system")
+        if isinstance(system, str) and system:
+            kwargs["system"] = [
+                {"type": "text", "text": system, "cache_control": cache_control}
+            ]
+
+        tools = kwargs.get("tools")
+        if isinstance(tools, list) and tools:
+            last_tool = {**tools[-1], "cache_control": cache_control}
+            kwargs["tools"] = [*tools[:-1], last_tool]  # type: ignore
+
+        messages = kwargs.get("messages")
+        if isinstance(messages, list) and messages:
+            content = messages[-1]["content"]
+            if isinstance(content, list) and content:
+                last_block = {**content[-1], "cache_control": cache_control}
+                messages = [
+                    *messages[:-1],
+                    {**messages[-1], "content": [*content[:-1], last_block]},
+                ]
+                kwargs["messages"] = messages  # type: ignore
+
     def stream_text(self, chunk) -> Optional[str]:
         if chunk.type == "content_block_delta" and chunk.delta.type == "text_delta":
             return chunk.delta.text
@@ -380,6 +434,20 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
     def value_turn(self, completion, has_data_model) -> Turn:
         return self._as_turn(completion, has_data_model)
 
+    def batch_client(self) -> AnthropicBatchClient:
+        return AnthropicBatchClient(self._client)
+
+    def batch_request(self, turns, tools, data_model=None, kwargs=None):
+        args = self._chat_perform_args(False, turns, tools, data_model, kwargs)
+        del args["stream"]
+        return cast(dict, args)
+
+    def batch_turn(self, result, has_data_model) -> Turn:
+        from anthropic.types import Message
+
+        completion = Message.construct(**result)
+        return self._as_turn(completion, has_data_model)
+
     def _as_message_params(self, turns: list[Turn]) -> list["MessageParam"]:
         messages: list["MessageParam"] = []
         for turn in turns:
@@ -388,11 +456,14 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
             if turn.role not in ["user", "assistant"]:
                 raise ValueError(f"Unknown role {turn.role}")
 
-            content = [self._as_content_block(c) for c in turn.contents]
-            role = "user" if turn.role == "user" else "assistant"
-            messages.append({"role": role, "content": content})
+            messages.append(turn._cached("anthropic", self._as_message_param))
         return messages
 
+    def _as_message_param(self, turn: Turn) -> "MessageParam":
+        content = [self._as_content_block(c) for c in turn.contents]
+        role = "user" if turn.role == "user" else "assistant"
+        return {"role": role, "content": content}
+
     @staticmethod
     def _as_content_block(content: Content) -> "ContentBlockParam":
         if isinstance(content, ContentText):
@@ -474,19 +545,62 @@ class AnthropicProvider(Provider[Message, RawMessageStreamEvent, Message]):
                         )
                     )
 
-        tokens = completion.usage.input_tokens, completion.usage.output_tokens
+        usage = completion.usage
+        tokens = usage.input_tokens, usage.output_tokens
+
+        cached_tokens = None
+        cache_read = getattr(usage, "cache_read_input_tokens", None)
+        cache_creation = getattr(usage, "cache_creation_input_tokens", None)
+        if cache_read is not None or cache_creation is not None:
+            cached_tokens = cache_read or 0, cache_creation or 0
 
-        tokens_log(self, tokens)
+        tokens_log(self, tokens, cached_tokens)
 
         return Turn(
             "assistant",
             contents,
             tokens=tokens,
+            cached_tokens=cached_tokens,
             finish_reason=completion.stop_reason,
             completion=completion,
         )
 
 
+class AnthropicBatchClient(BatchClient):
+    """
+    A client for Anthropic's [message batches
+    API](https://docs.anthropic.com/en/docs/build-with-claude/message-batches).
+
+    Parameters
+    ----------
+    client
+        An `anthropic.Anthropic()` client.
+    """
+
+    def __init__(self, client: "Anthropic"):
+        self._client = client
+
+    def submit(self, requests):
+        batch = self._client.messages.batches.create(
+            requests=[
+                {"custom_id": id_, "params": params}  # type: ignore
+                for id_, params in requests.items()
+            ]
+        )
+        return batch.id
+
+    def poll(self, batch_id):
+        batch = self._client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    def results(self, batch_id):
+        res: dict[str, dict[str, Any]] = {}
+        for x in self._client.messages.batches.results(batch_id):
+            if x.result.type == "succeeded":
+                res[x.custom_id] = x.result.message.model_dump()
+        return res
+
+
 def ChatBedrockAnthropic(
     *,
     model: Optional[str] = None,
@@ -628,6 +742,7 @@ class AnthropicBedrockProvider(AnthropicProvider):
 
         self._model = model
         self._max_tokens = max_tokens
+        self._prompt_caching = False
 
         kwargs_full: "ChatBedrockClientArgs" = {
             "aws_secret_key": aws_secret_key,
@@ -641,3 +756,8 @@ class AnthropicBedrockProvider(AnthropicProvider):
 
         self._client = AnthropicBedrock(**kwargs_full)  # type: ignore
         self._async_client = AsyncAnthropicBedrock(**kwargs_full)  # type: ignore
+
+    def batch_client(self) -> AnthropicBatchClient:
+        raise NotImplementedError(
+            "AnthropicBedrockProvider does not support batch requests."
+        )
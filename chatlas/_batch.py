@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from ._utils import logger
+
+__all__ = ("BatchClient",)
+
+
+class BatchClient(ABC):
+    """
+    A client for a provider's batch (i.e., offline) processing API.
+
+    A batch client submits many independent requests as a single job, checks
+    on the job until it's done, and retrieves the results. It's used by
+    [](`~chatlas.Chat.chat_batch`) and [](`~chatlas.Chat.extract_data_batch`),
+    which (by default) use the client provided by the chat's provider.
+
+    Note that this class is exposed for developers who wish to implement their
+    own client (e.g., to talk to a local test server). In general, you should
+    not need to interact with this class directly.
+    """
+
+    @abstractmethod
+    def submit(self, requests: dict[str, dict[str, Any]]) -> str:
+        """
+        Submit a batch job.
+
+        Parameters
+        ----------
+        requests
+            A dictionary mapping a (unique) id to the request arguments (i.e.,
+            the body of an individual, non-streaming, request).
+
+        Returns
+        -------
+        str
+            The id of the batch job.
+        """
+        ...
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> bool:
+        """
+        Check whether a batch job is done (i.e., no longer in progress).
+
+        Parameters
+        ----------
+        batch_id
+            The id of the batch job.
+        """
+        ...
+
+    @abstractmethod
+    def results(self, batch_id: str) -> dict[str, dict[str, Any]]:
+        """
+        Retrieve the results of a (done) batch job.
+
+        Parameters
+        ----------
+        batch_id
+            The id of the batch job.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            A dictionary mapping request ids to the (dictionary representation of
+            the) provider's response. Requests that failed should be omitted.
+        """
+        ...
+
+
+def batch_wait(
+    client: BatchClient,
+    batch_id: str,
+    *,
+    interval: float = 5,
+    max_interval: float = 300,
+    timeout: Optional[float] = None,
+) -> None:
+    """
+    Wait for a batch job to be done, polling with exponential backoff.
+
+    The job is polled right away, then again after `interval` seconds, with the
+    interval doubling (up to `max_interval`) after each poll.
+    """
+    start = time.monotonic()
+    while not client.poll(batch_id):
+        elapsed = time.monotonic() - start
+        if timeout is not None and elapsed + interval > timeout:
+            raise TimeoutError(
+                f"Batch job '{batch_id}' was not done after {elapsed:.0f} seconds."
+            )
+        logger.debug(f"Batch job '{batch_id}' in progress; next poll in {interval}s")
+        time.sleep(interval)
+        interval = min(interval * 2, max_interval)
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from ._content import (
+    Content,
+    ContentImageInline,
+    ContentImageRemote,
+    ContentJson,
+    ContentText,
+    ContentToolRequest,
+    ContentToolResult,
+)
+from ._turn import Turn
+from ._utils import logger
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from ._provider import Provider
+    from ._tools import Tool
+
+__all__ = ("ResponseCache",)
+
+# The content types that can be stored (by name)
+_CONTENT_TYPES: dict[str, type[Content]] = {
+    cls.__name__: cls
+    for cls in (
+        ContentText,
+        ContentJson,
+        ContentToolRequest,
+        ContentToolResult,
+        ContentImageRemote,
+        ContentImageInline,
+    )
+}
+
+
+class ResponseCache:
+    """
+    A persistent, on-disk cache of chat responses
+
+    When the exact same request (i.e., same provider, model, turns, tools, data
+    model, and additional arguments) is sent more than once, the assistant's
+    response is replayed from the cache instead of sending the request again.
+    This is useful for evaluation and testing pipelines that repeatedly send
+    identical prompts. Streaming responses are replayed as a (simulated) stream.
+
+    Responses are stored in a SQLite database, so a cache can be shared between
+    chats and processes. When the database grows beyond `max_size`, the least
+    recently used responses are discarded.
+
+    Responses are stored as JSON (so loading a cache never runs any code), but
+    only their contents (and finish reason) are kept, not the provider's
+    completion object. Replayed responses don't count towards
+    [](`~chatlas.token_usage`) (or [](`~chatlas.Chat.token_usage`)), so their
+    turns have no `tokens`.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, ResponseCache
+
+    chat = ChatOpenAI()
+    chat.set_response_cache(ResponseCache("chatlas-cache.sqlite"))
+    chat.chat("What is the capital of France?")
+    ```
+
+    Parameters
+    ----------
+    path
+        The path of the SQLite database file. It (and its parent directory) is
+        created if it doesn't already exist.
+    max_size
+        The maximum total size (in bytes) of the stored responses. If `None`, the
+        cache is unbounded.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: Optional[int] = 100 * 1024 * 1024,
+    ):
+        if max_size is not None and max_size < 1:
+            raise ValueError("`max_size` must be a positive integer or `None`.")
+
+        self.path = Path(path)
+        self.max_size = max_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            # Recency is tracked with a counter (rather than a timestamp) so
+            # that the order of accesses is exact. The counter and the total
+            # size of the responses are kept up to date (in the database, so
+            # they're shared between processes) rather than being recomputed
+            # on every access.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value) VALUES "
+                "('clock', (SELECT COALESCE(MAX(accessed), 0) FROM responses)), "
+                "('size', (SELECT COALESCE(SUM(size), 0) FROM responses))"
+            )
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of responses replayed from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of responses that weren't found in the cache."""
+        return self._misses
+
+    def clear(self) -> None:
+        """Remove all responses and reset the hit/miss counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("UPDATE meta SET value = 0 WHERE name = 'size'")
+            self._hits = 0
+            self._misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (n,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return n
+
+    def __repr__(self) -> str:
+        return (
+            f"<ResponseCache path='{self.path}' size={len(self)} "
+            f"max_size={self.max_size} hits={self.hits} misses={self.misses}>"
+        )
+
+    def _key(
+        self,
+        provider: Provider,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]],
+        kwargs: Any,
+    ) -> Optional[str]:
+        """
+        Hash the request that would be sent to the provider (or `None` if the
+        provider doesn't expose its request arguments).
+        """
+        chat_perform_args = getattr(provider, "_chat_perform_args", None)
+        if chat_perform_args is None:
+            return None
+
+        args = dict(chat_perform_args(False, turns, tools, data_model, kwargs))
+        # Streamed and non-streamed responses are interchangeable
+        args.pop("stream", None)
+        args.pop("stream_options", None)
+
+        # Some providers (e.g., Google) configure the model (and system prompt)
+        # on the client rather than in the request
+        client = getattr(provider, "_client", None)
+        request = {
+            "provider": type(provider).__name__,
+            "client": {
+                attr: getattr(client, attr, None)
+                for attr in ("base_url", "model_name", "_system_instruction")
+            },
+            "args": args,
+        }
+        payload = json.dumps(request, sort_keys=True, default=_json_default)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Turn]:
+        """
+        Get a response (or `None`), counting the hit or miss. A database error
+        (e.g., a locked or corrupt file) is treated as a miss.
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE responses SET accessed = ? WHERE key = ?",
+                            (self._tick(), key),
+                        )
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read from the response cache: {e}")
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+
+        try:
+            turn = _load_turn(row[0])
+        except Exception as e:
+            logger.debug(f"Failed to load cached response: {e}")
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return turn
+
+    def _set(self, key: str, turn: Turn) -> None:
+        try:
+            value = _dump_turn(turn)
+        except Exception as e:
+            logger.debug(f"Failed to cache response: {e}")
+            return
+
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            try:
+                with self._conn:
+                    accessed = self._tick()
+                    row = self._conn.execute(
+                        "SELECT size FROM responses WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO responses "
+                        "(key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                        (key, value, size, accessed),
+                    )
+                    self._grow(size - (row[0] if row else 0))
+                    self._evict()
+            except sqlite3.Error as e:
+                # Caching is best effort; the response itself was fine
+                logger.warning(f"Failed to write to the response cache: {e}")
+
+    def _tick(self) -> int:
+        """Advance the access counter (within a transaction)."""
+        self._conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'clock'")
+        (n,) = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'clock'"
+        ).fetchone()
+        return n
+
+    def _grow(self, size: int) -> None:
+        self._conn.execute(
+            "UPDATE meta SET value = value + ? WHERE name = 'size'", (size,)
+        )
+
+    def _evict(self) -> None:
+        if self.max_size is None:
+            return
+        (total,) = self._conn.execute(
+            "SELECT value FROM meta WHERE name = 'size'"
+        ).fetchone()
+        if total <= self.max_size:
+            return
+        stale: list[tuple[str]] = []
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        )
+        for key, size in rows:
+            if total - evicted <= self.max_size:
+                break
+            stale.append((key,))
+            evicted += size
+        rows.close()
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self._grow(-evicted)
+
+
+def _dump_turn(turn: Turn) -> str:
+    """
+    Serialize a response to JSON (leaving out its completion, timing, and
+    tokens, since a replayed response doesn't cost any).
+    """
+    contents = []
+    for x in turn.contents:
+        name = type(x).__name__
+        if name not in _CONTENT_TYPES:
+            raise TypeError(f"Can't cache content of type {name}.")
+        contents.append({"type": name, **dataclasses.asdict(x)})
+    return json.dumps(
+        {
+            "role": turn.role,
+            "contents": contents,
+            "finish_reason": turn.finish_reason,
+            "provider": turn.provider,
+            "model": turn.model,
+        }
+    )
+
+
+def _load_turn(value: str) -> Turn:
+    x = json.loads(value)
+    contents = [
+        _CONTENT_TYPES[content.pop("type")](**content) for content in x["contents"]
+    ]
+    return Turn(
+        x["role"],
+        contents,
+        finish_reason=x["finish_reason"],
+        provider=x["provider"],
+        model=x["model"],
+    )
+
+
+def _json_default(x: Any) -> Any:
+    if hasattr(x, "model_dump"):
+        return x.model_dump()
+    if isinstance(x, (bytes, bytearray)):
+        return hashlib.sha256(x).hexdigest()
+    if isinstance(x, (set, frozenset)):
+        return sorted(x, key=repr)
+    return repr(x)
+
+
+def replay_chunks(text: str) -> list[str]:
+    """Split a cached response's text into chunks for a simulated stream."""
+    return text.splitlines(keepends=True)
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import copy
 import os
+import time
+import warnings
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from threading import Thread
 from typing import (
@@ -20,6 +26,8 @@ from typing import (
 
 from pydantic import BaseModel
 
+from ._batch import BatchClient, batch_wait
+from ._cache import ResponseCache, replay_chunks
 from ._content import (
     Content,
     ContentJson,
@@ -27,6 +35,7 @@ from ._content import (
     ContentToolRequest,
     ContentToolResult,
 )
+from ._context import ContextPolicy
 from ._display import (
     EchoOptions,
     IPyMarkdownDisplay,
@@ -35,10 +44,22 @@ from ._display import (
     MockMarkdownDisplay,
 )
 from ._provider import Provider
-from ._tools import Tool
+from ._ratelimit import get_rate_limiter
+from ._retry import RetryPolicy
+from ._timing import TurnTimer
+from ._tokenizer import count_tokens
+from ._tokens import TokenUsage, provider_key, token_cost, turns_usage
+from ._tools import Tool, ToolCache
 from ._turn import Turn, user_turn
 from ._typing_extensions import TypedDict
-from ._utils import html_escape
+from ._utils import (
+    MISSING_TYPE,
+    ContentAccumulator,
+    html_escape,
+    logger,
+    wrap_async_daemon,
+    wrap_async_threaded,
+)
 
 
 class AnyTypeDict(TypedDict, total=False):
@@ -54,6 +75,13 @@ method of a [](`~chatlas.Chat`) instance.
 CompletionT = TypeVar("CompletionT")
 
 
+class ToolOptions(TypedDict):
+    concurrent: bool
+    max_concurrency: Optional[int]
+    executor: Optional[Executor]
+    timeout: Optional[float]
+
+
 class Chat(Generic[SubmitInputArgsT, CompletionT]):
     """
     A chat object that can be used to interact with a language model.
@@ -86,12 +114,25 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         """
         self.provider = provider
         self._turns: list[Turn] = list(turns or [])
+        # Whether _turns is shared with a fork (and so must be copied on write)
+        self._turns_shared = False
         self.tools: dict[str, Tool] = {}
         self._echo_options: EchoOptions = {
             "rich_markdown": {},
             "rich_console": {},
             "css_styles": {},
+            "refresh_per_second": 10,
+        }
+        self._tool_options: ToolOptions = {
+            "concurrent": False,
+            "max_concurrency": None,
+            "executor": None,
+            "timeout": None,
         }
+        self._response_cache: Optional[ResponseCache] = None
+        self._retry_policy: Optional[RetryPolicy] = None
+        self._context_policy: Optional[ContextPolicy] = None
+        self._timing_callback: Optional[Callable[[Turn], None]] = None
 
     def turns(
         self,
@@ -105,14 +146,20 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         ----------
         include_system_prompt
             Whether to include the system prompt in the turns.
+
+        Returns
+        -------
+        list[Turn]
+            A new list of the turns, so modifying it doesn't affect the chat (or
+            any chat forked from it).
         """
 
         if not self._turns:
-            return self._turns
+            return []
 
         if not include_system_prompt and self._turns[0].role == "system":
             return self._turns[1:]
-        return self._turns
+        return list(self._turns)
 
     def last_turn(
         self,
@@ -153,6 +200,65 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
                 "if you want to change the system prompt."
             )
         self._turns = list(turns)
+        self._turns_shared = False
+
+    def fork(self) -> Chat[SubmitInputArgsT, CompletionT]:
+        """
+        Create a new chat that branches off from this one.
+
+        The new chat starts with the same turns, tools, and options as this
+        chat, but (from then on) the two chats are independent: new turns added
+        to one aren't added to the other, registering a tool with one doesn't
+        register it with the other, and setting options on one doesn't change
+        the other. Forking is cheap, since the chats share the provider (i.e.,
+        its HTTP client) as well as the existing turns, which are only copied
+        (by reference) once either chat is modified. This makes it practical to
+        explore many branches of a long conversation (e.g., best-of-N sampling
+        or tree search).
+
+        Note that turns are shared (rather than copied), so they shouldn't be
+        modified in place. The response cache (see `.set_response_cache()`),
+        retry policy, timing callback, and any tool caches are shared too (and
+        meant to be), while the context policy is copied, so that (e.g.) each
+        fork keeps its own summary with [](`~chatlas.SummarizeOlderTurns`).
+
+        Examples
+        --------
+
+        ```python
+        from chatlas import ChatOpenAI
+
+        chat = ChatOpenAI()
+        chat.chat("Tell me a joke about cats.")
+
+        branches = [chat.fork() for _ in range(3)]
+        for branch in branches:
+            branch.chat("Now make it about dogs.")
+        ```
+
+        Returns
+        -------
+        Chat
+            The new chat.
+        """
+        clone = copy.copy(self)
+        clone.tools = dict(self.tools)
+        clone._echo_options = {
+            k: copy.copy(v)  # type: ignore
+            for k, v in self._echo_options.items()
+        }
+        clone._tool_options = copy.copy(self._tool_options)
+        clone._context_policy = copy.copy(self._context_policy)
+        self._turns_shared = True
+        clone._turns_shared = True
+        return clone
+
+    def _mutable_turns(self) -> list[Turn]:
+        """Get the turns for modification, copying them first if shared."""
+        if self._turns_shared:
+            self._turns = list(self._turns)
+            self._turns_shared = False
+        return self._turns
 
     @property
     def system_prompt(self) -> str | None:
@@ -165,10 +271,11 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
 
     @system_prompt.setter
     def system_prompt(self, value: str | None):
-        if self._turns and self._turns[0].role == "system":
-            self._turns.pop(0)
+        turns = self._mutable_turns()
+        if turns and turns[0].role == "system":
+            turns.pop(0)
         if value is not None:
-            self._turns.insert(0, Turn("system", value))
+            turns.insert(0, Turn("system", value))
 
     def tokens(self) -> list[tuple[int, int] | None]:
         """
@@ -182,6 +289,84 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         """
         return [turn.tokens for turn in self._turns]
 
+    def token_usage(self) -> list[TokenUsage] | None:
+        """
+        Report on the token usage of this chat
+
+        Unlike [](`~chatlas.token_usage`), which reports on every chat in the
+        session, this sums the tokens of this chat's turns (including any turns
+        it was created, or forked, with).
+
+        Returns
+        -------
+        list[TokenUsage] | None
+            A list of dictionaries (one per provider and model), in the same
+            format as [](`~chatlas.token_usage`), or `None` if no turn has
+            recorded tokens.
+        """
+        return turns_usage(self._turns, *provider_key(self.provider))
+
+    def estimate_tokens(self, *args: Content | str) -> int:
+        """
+        Estimate the number of input tokens of the next request (before sending).
+
+        The count is computed locally, with the tokenizer for the provider's
+        model (see [](`~chatlas.register_tokenizer`)), and is cached on each
+        turn, so estimating repeatedly (as the chat grows) is cheap. Note that
+        every turn is counted, even if a context policy (see
+        `.set_context_policy()`) would send fewer of them.
+
+        Parameters
+        ----------
+        args
+            The user input(s) of the next request. If none are given, only the
+            existing turns are counted.
+
+        Returns
+        -------
+        int
+            The (estimated) number of input tokens.
+        """
+        turns = [*self._turns, user_turn(*args)] if args else self._turns
+        return count_tokens(turns, self.provider)
+
+    def estimate_cost(
+        self, *args: Content | str, output_tokens: int = 0
+    ) -> Optional[float]:
+        """
+        Estimate the cost of the next request (before sending).
+
+        The number of input tokens is estimated with `.estimate_tokens()`, and
+        priced with the provider's (and model's) price (see
+        [](`~chatlas.token_price`)). Since the length of the response isn't
+        known in advance, output tokens are only included if you provide an
+        (expected or maximum) number of them.
+
+        Parameters
+        ----------
+        args
+            The user input(s) of the next request. If none are given, only the
+            existing turns are counted.
+        output_tokens
+            The number of output tokens to include in the estimate.
+
+        Returns
+        -------
+        float | None
+            The (estimated) cost, or `None` if the price is unknown.
+        """
+        name, model = provider_key(self.provider)
+        usage: TokenUsage = {
+            "name": name,
+            "model": model,
+            "input": self.estimate_tokens(*args),
+            "output": output_tokens,
+            "cache_read": 0,
+            "cache_creation": 0,
+            "cost": None,
+        }
+        return token_cost(usage)
+
     def app(
         self,
         *,
@@ -608,11 +793,165 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         json = res[0]
         return json.value
 
+    def chat_batch(
+        self,
+        prompts: Sequence[str | Content | Sequence[Content | str]],
+        *,
+        client: Optional[BatchClient] = None,
+        poll_interval: float = 5,
+        timeout: Optional[float] = None,
+        kwargs: Optional[SubmitInputArgsT] = None,
+    ) -> list[Turn | None]:
+        """
+        Submit many (independent) prompts as a batch job.
+
+        Each prompt is appended to the current conversation and sent, as a
+        separate request, in a single batch job via the provider's batch API
+        (which is typically much cheaper, but slower, than sending them one at
+        a time). This method then waits for the job to finish.
+
+        Note that the chat's turns are left unchanged, and tools are not
+        invoked (i.e., the returned turns may contain tool requests).
+
+        Parameters
+        ----------
+        prompts
+            The prompts. Each is either a string or content object, or a
+            sequence of them (to be sent as one user turn).
+        client
+            The [](`~chatlas.types.BatchClient`) to submit the batch with. If
+            `None`, the provider's default client is used.
+        poll_interval
+            The job is first checked as soon as it's submitted. If it isn't done,
+            it's checked again after this many seconds, and the interval doubles
+            (up to 5 minutes) after each check.
+        timeout
+            The maximum number of seconds to wait for the job to finish. If
+            `None`, wait indefinitely.
+        kwargs
+            Additional keyword arguments to pass to the method used for
+            requesting the response.
+
+        Returns
+        -------
+        list[Turn | None]
+            The assistant turn for each prompt (in the same order), or `None` if
+            the request failed.
+        """
+        return self._submit_batch(
+            prompts,
+            client=client,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            kwargs=kwargs,
+        )
+
+    def extract_data_batch(
+        self,
+        prompts: Sequence[str | Content | Sequence[Content | str]],
+        *,
+        data_model: type[BaseModel],
+        client: Optional[BatchClient] = None,
+        poll_interval: float = 5,
+        timeout: Optional[float] = None,
+    ) -> list[dict[str, Any] | None]:
+        """
+        Extract structured data from many inputs in a batch job.
+
+        This is the batch counterpart of `.extract_data()`. See `.chat_batch()`
+        for details.
+
+        Parameters
+        ----------
+        prompts
+            The inputs to extract data from. Each is either a string or content
+            object, or a sequence of them (to be sent as one user turn).
+        data_model
+            A Pydantic model describing the structure of the data to extract.
+        client
+            The [](`~chatlas.types.BatchClient`) to submit the batch with. If
+            `None`, the provider's default client is used.
+        poll_interval
+            The job is first checked as soon as it's submitted. If it isn't done,
+            it's checked again after this many seconds, and the interval doubles
+            (up to 5 minutes) after each check.
+        timeout
+            The maximum number of seconds to wait for the job to finish. If
+            `None`, wait indefinitely.
+
+        Returns
+        -------
+        list[dict[str, Any] | None]
+            The extracted data for each input (in the same order), or `None` if
+            the request (or the extraction) failed.
+        """
+        turns = self._submit_batch(
+            prompts,
+            data_model=data_model,
+            client=client,
+            poll_interval=poll_interval,
+            timeout=timeout,
+        )
+
+        res: list[dict[str, Any] | None] = []
+        for turn in turns:
+            json = None
+            if turn is not None:
+                values = [x for x in turn.contents if isinstance(x, ContentJson)]
+                if len(values) == 1:
+                    json = values[0].value
+            res.append(json)
+        return res
+
+    def _submit_batch(
+        self,
+        prompts: Sequence[str | Content | Sequence[Content | str]],
+        *,
+        data_model: type[BaseModel] | None = None,
+        client: Optional[BatchClient] = None,
+        poll_interval: float = 5,
+        timeout: Optional[float] = None,
+        kwargs: Optional[SubmitInputArgsT] = None,
+    ) -> list[Turn | None]:
+        if client is None:
+            client = self.provider.batch_client()
+
+        requests: dict[str, dict[str, Any]] = {}
+        for i, prompt in enumerate(prompts):
+            if isinstance(prompt, (str, Content)):
+                turn = user_turn(prompt)
+            else:
+                turn = user_turn(*prompt)
+            turns = [*self._turns, turn]
+            if self._context_policy is not None:
+                turns = self._context_policy.apply(turns)
+            requests[f"chatlas-{i}"] = self.provider.batch_request(
+                turns, self.tools, data_model, kwargs
+            )
+
+        batch_id = client.submit(requests)
+        batch_wait(client, batch_id, interval=poll_interval, timeout=timeout)
+        results = client.results(batch_id)
+
+        res: list[Turn | None] = []
+        for id_ in requests:
+            result = results.get(id_, None)
+            if result is None:
+                res.append(None)
+            else:
+                turn = self.provider.batch_turn(
+                    result, has_data_model=data_model is not None
+                )
+                res.append(turn)
+        return res
+
     def register_tool(
         self,
         func: Callable[..., Any] | Callable[..., Awaitable[Any]],
         *,
         model: Optional[type[BaseModel]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[ToolCache] = None,
     ):
         """
         Register a tool (function) with the chat.
@@ -687,8 +1026,18 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
             The primary reason why you might want to provide a model in
             Note that the name and docstring of the model takes precedence over the
             name and docstring of the function.
+        timeout
+            The maximum number of seconds to wait for the tool to return. If a
+            call takes longer, the model is sent an error result instead (the
+            call is cancelled if the tool is async, and abandoned otherwise). If
+            `None`, the default set via `.set_tool_options()` applies.
+        cache
+            A [](`~chatlas.ToolCache`) to memoize the tool's results with (i.e.,
+            calls with the same arguments as a previous call return its result
+            without invoking `func`). This is only appropriate for tools whose
+            result depends only on their arguments.
         """
-        tool = Tool(func, model=model)
+        tool = Tool(func, model=model, timeout=timeout, cache=cache)
         self.tools[tool.name] = tool
 
     def export(
@@ -831,6 +1180,8 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
                 kwargs=kwargs,
             ):
                 yield chunk
+            # Show the whole response before (possibly slow) tools are invoked
+            display.flush()
             user_turn_result = self._invoke_tools()
 
     async def _chat_impl_async(
@@ -851,6 +1202,8 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
                 kwargs=kwargs,
             ):
                 yield chunk
+            # Show the whole response before (possibly slow) tools are invoked
+            display.flush()
             user_turn_result = await self._invoke_tools_async()
 
     def _submit_turns(
@@ -865,6 +1218,8 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         if any(x._is_async for x in self.tools.values()):
             raise ValueError("Cannot use async tools in a synchronous chat")
 
+        timer = TurnTimer()
+
         def emit(text: str | Content):
             display.update(str(text))
 
@@ -873,52 +1228,147 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         if echo == "all":
             emit_user_contents(user_turn, emit)
 
-        if stream:
-            response = self.provider.chat_perform(
-                stream=True,
-                turns=[*self._turns, user_turn],
-                tools=self.tools,
-                data_model=data_model,
-                kwargs=kwargs,
-            )
-
-            result = None
-            for chunk in response:
-                text = self.provider.stream_text(chunk)
-                if text:
-                    emit(text)
-                    yield text
-                result = self.provider.stream_merge_chunks(result, chunk)
-
-            turn = self.provider.stream_turn(
-                result,
-                has_data_model=data_model is not None,
-                stream=response,
-            )
-
-            if echo == "all":
-                emit_other_contents(turn, emit)
-
-        else:
-            response = self.provider.chat_perform(
-                stream=False,
-                turns=[*self._turns, user_turn],
-                tools=self.tools,
-                data_model=data_model,
-                kwargs=kwargs,
-            )
-
-            turn = self.provider.value_turn(
-                response, has_data_model=data_model is not None
-            )
-            if turn.text:
-                emit(turn.text)
-                yield turn.text
-
-            if echo == "all":
-                emit_other_contents(turn, emit)
+        turns = [*self._turns, user_turn]
+        if self._context_policy is not None:
+            turns = self._context_policy.apply(turns)
+        cache = self._response_cache
+        cache_key = None
+        cached_turn = None
+        if cache is not None:
+            cache_key = cache._key(self.provider, turns, self.tools, data_model, kwargs)
+            if cache_key is not None:
+                cached_turn = cache._get(cache_key)
+
+        limiter = None
+        estimate = 0
+        reserved: Optional[float] = None
+        if cached_turn is None:
+            limiter = get_rate_limiter(self.provider)
+            if limiter is not None:
+                estimate = count_tokens(turns, self.provider)
+                reserved = limiter.acquire(estimate)
+
+        # The tokens to charge the rate limiter for, unless the provider
+        # reports the actual usage
+        actual = estimate
+        try:
+            if cached_turn is not None:
+                turn = cached_turn
+                chunks = replay_chunks(turn.text) if stream else [turn.text]
+                for text in chunks:
+                    if text:
+                        emit(text)
+                        yield text
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
+
+            elif stream:
+                attempt = 0
+                while True:
+                    # Once text has been yielded, the response can't be retried
+                    yielded = False
+                    try:
+                        timer.sent()
+                        response = self.provider.chat_perform(
+                            stream=True,
+                            turns=turns,
+                            tools=self.tools,
+                            data_model=data_model,
+                            kwargs=kwargs,
+                        )
+
+                        result = None
+                        for chunk in response:
+                            timer.chunk()
+                            text = self.provider.stream_text(chunk)
+                            if text:
+                                emit(text)
+                                yielded = True
+                                yield text
+                            result = self.provider.stream_merge_chunks(result, chunk)
+
+                        timer.received()
+                        turn = self.provider.stream_turn(
+                            result,
+                            has_data_model=data_model is not None,
+                            stream=response,
+                        )
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        delay = None if yielded else self._retry_delay(e, attempt)
+                        if limiter is not None and reserved is not None and not yielded:
+                            # The failed attempt (most likely) used no tokens
+                            limiter.reconcile(reserved, 0)
+                            reserved = None
+                        if delay is None:
+                            raise
+                        time.sleep(delay)
+                        if limiter is not None:
+                            reserved = limiter.acquire(estimate)
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
 
-        self._turns.extend([user_turn, turn])
+            else:
+                attempt = 0
+                while True:
+                    try:
+                        timer.sent()
+                        response = self.provider.chat_perform(
+                            stream=False,
+                            turns=turns,
+                            tools=self.tools,
+                            data_model=data_model,
+                            kwargs=kwargs,
+                        )
+                        timer.received()
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        delay = self._retry_delay(e, attempt)
+                        if limiter is not None and reserved is not None:
+                            # The failed attempt (most likely) used no tokens
+                            limiter.reconcile(reserved, 0)
+                            reserved = None
+                        if delay is None:
+                            raise
+                        time.sleep(delay)
+                        if limiter is not None:
+                            reserved = limiter.acquire(estimate)
+
+                turn = self.provider.value_turn(
+                    response, has_data_model=data_model is not None
+                )
+                if turn.text:
+                    emit(turn.text)
+                    yield turn.text
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
+
+            if turn.tokens is not None:
+                actual = sum(turn.tokens)
+        finally:
+            # Reconcile the reservation exactly once, even if the request
+            # failed (or the stream was closed) after it started
+            if limiter is not None and reserved is not None:
+                limiter.reconcile(reserved, actual)
+
+        if turn.provider is None:
+            turn.provider, turn.model = provider_key(self.provider)
+
+        if cached_turn is None:
+            turn.timing = timer.timing(turn)
+
+        self._mutable_turns().extend([user_turn, turn])
+
+        if cache is not None and cache_key is not None and cached_turn is None:
+            cache._set(cache_key, turn)
+
+        if cached_turn is None:
+            self._report_timing(turn)
 
     async def _submit_turns_async(
         self,
@@ -929,6 +1379,8 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         data_model: type[BaseModel] | None = None,
         kwargs: Optional[SubmitInputArgsT] = None,
     ) -> AsyncGenerator[str, None]:
+        timer = TurnTimer()
+
         def emit(text: str | Content):
             display.update(str(text))
 
@@ -937,68 +1389,181 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         if echo == "all":
             emit_user_contents(user_turn, emit)
 
-        if stream:
-            response = await self.provider.chat_perform_async(
-                stream=True,
-                turns=[*self._turns, user_turn],
-                tools=self.tools,
-                data_model=data_model,
-                kwargs=kwargs,
-            )
-
-            result = None
-            async for chunk in response:
-                text = self.provider.stream_text(chunk)
-                if text:
-                    emit(text)
-                    yield text
-                result = self.provider.stream_merge_chunks(result, chunk)
-
-            turn = await self.provider.stream_turn_async(
-                result,
-                has_data_model=data_model is not None,
-                stream=response,
-            )
-
-            if echo == "all":
-                emit_other_contents(turn, emit)
-
-        else:
-            response = await self.provider.chat_perform_async(
-                stream=False,
-                turns=[*self._turns, user_turn],
-                tools=self.tools,
-                data_model=data_model,
-                kwargs=kwargs,
-            )
-
-            turn = self.provider.value_turn(
-                response, has_data_model=data_model is not None
-            )
-            if turn.text:
-                emit(turn.text)
-                yield turn.text
-
-            if echo == "all":
-                emit_other_contents(turn, emit)
+        turns = [*self._turns, user_turn]
+        if self._context_policy is not None:
+            turns = await self._context_policy.apply_async(turns)
+        cache = self._response_cache
+        cache_key = None
+        cached_turn = None
+        if cache is not None:
+            cache_key = cache._key(self.provider, turns, self.tools, data_model, kwargs)
+            if cache_key is not None:
+                cached_turn = cache._get(cache_key)
+
+        limiter = None
+        estimate = 0
+        reserved: Optional[float] = None
+        if cached_turn is None:
+            limiter = get_rate_limiter(self.provider)
+            if limiter is not None:
+                estimate = count_tokens(turns, self.provider)
+                reserved = await limiter.acquire_async(estimate)
+
+        # The tokens to charge the rate limiter for, unless the provider
+        # reports the actual usage
+        actual = estimate
+        try:
+            if cached_turn is not None:
+                turn = cached_turn
+                chunks = replay_chunks(turn.text) if stream else [turn.text]
+                for text in chunks:
+                    if text:
+                        emit(text)
+                        yield text
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
+
+            elif stream:
+                attempt = 0
+                while True:
+                    # Once text has been yielded, the response can't be retried
+                    yielded = False
+                    try:
+                        timer.sent()
+                        response = await self.provider.chat_perform_async(
+                            stream=True,
+                            turns=turns,
+                            tools=self.tools,
+                            data_model=data_model,
+                            kwargs=kwargs,
+                        )
+
+                        result = None
+                        async for chunk in response:
+                            timer.chunk()
+                            text = self.provider.stream_text(chunk)
+                            if text:
+                                emit(text)
+                                yielded = True
+                                yield text
+                            result = self.provider.stream_merge_chunks(result, chunk)
+
+                        timer.received()
+                        turn = await self.provider.stream_turn_async(
+                            result,
+                            has_data_model=data_model is not None,
+                            stream=response,
+                        )
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        delay = None if yielded else self._retry_delay(e, attempt)
+                        if limiter is not None and reserved is not None and not yielded:
+                            # The failed attempt (most likely) used no tokens
+                            limiter.reconcile(reserved, 0)
+                            reserved = None
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                        if limiter is not None:
+                            reserved = await limiter.acquire_async(estimate)
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
 
-        self._turns.extend([user_turn, turn])
+            else:
+                attempt = 0
+                while True:
+                    try:
+                        timer.sent()
+                        response = await self.provider.chat_perform_async(
+                            stream=False,
+                            turns=turns,
+                            tools=self.tools,
+                            data_model=data_model,
+                            kwargs=kwargs,
+                        )
+                        timer.received()
+                        break
+                    except Exception as e:
+                        attempt += 1
+                        delay = self._retry_delay(e, attempt)
+                        if limiter is not None and reserved is not None:
+                            # The failed attempt (most likely) used no tokens
+                            limiter.reconcile(reserved, 0)
+                            reserved = None
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                        if limiter is not None:
+                            reserved = await limiter.acquire_async(estimate)
+
+                turn = self.provider.value_turn(
+                    response, has_data_model=data_model is not None
+                )
+                if turn.text:
+                    emit(turn.text)
+                    yield turn.text
+
+                if echo == "all":
+                    emit_other_contents(turn, emit)
+
+            if turn.tokens is not None:
+                actual = sum(turn.tokens)
+        finally:
+            # Reconcile the reservation exactly once, even if the request
+            # failed (or the stream was closed) after it started
+            if limiter is not None and reserved is not None:
+                limiter.reconcile(reserved, actual)
+
+        if turn.provider is None:
+            turn.provider, turn.model = provider_key(self.provider)
+
+        if cached_turn is None:
+            turn.timing = timer.timing(turn)
+
+        self._mutable_turns().extend([user_turn, turn])
+
+        if cache is not None and cache_key is not None and cached_turn is None:
+            cache._set(cache_key, turn)
+
+        if cached_turn is None:
+            self._report_timing(turn)
 
     def _invoke_tools(self) -> Turn | None:
         turn = self.last_turn()
         if turn is None:
             return None
 
-        results: list[ContentToolResult] = []
-        for x in turn.contents:
-            if isinstance(x, ContentToolRequest):
-                tool_def = self.tools.get(x.name, None)
-                func = tool_def.func if tool_def is not None else None
-                results.append(self._invoke_tool(func, x.arguments, x.id))
-
-        if not results:
+        requests = [x for x in turn.contents if isinstance(x, ContentToolRequest)]
+        if not requests:
             return None
 
+        def invoke(x: ContentToolRequest) -> ContentToolResult:
+            tool_def = self.tools.get(x.name, None)
+            func = tool_def.func if tool_def is not None else None
+            timeout = self._tool_timeout(tool_def)
+            cache = tool_def.cache if tool_def is not None else None
+            return self._invoke_tool(
+                func, x.arguments, x.id, timeout=timeout, cache=cache, name=x.name
+            )
+
+        results: list[ContentToolResult] = []
+        if self._tool_options["concurrent"] and len(requests) > 1:
+            executor = self._tool_options["executor"]
+            if executor is not None:
+                futures = [executor.submit(invoke, x) for x in requests]
+                results = [f.result() for f in futures]
+            else:
+                max_workers = self._tool_options["max_concurrency"]
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    # map() returns results in the order of the requests
+                    results = list(pool.map(invoke, requests))
+        else:
+            for x in requests:
+                results.append(invoke(x))
+
         return Turn("user", results)
 
     async def _invoke_tools_async(self) -> Turn | None:
@@ -1006,53 +1571,167 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         if turn is None:
             return None
 
+        requests = [x for x in turn.contents if isinstance(x, ContentToolRequest)]
+        if not requests:
+            return None
+
+        executor = self._tool_options["executor"]
+
+        async def invoke(x: ContentToolRequest) -> ContentToolResult:
+            tool_def = self.tools.get(x.name, None)
+            timeout = self._tool_timeout(tool_def)
+            func = None
+            if tool_def is not None:
+                func = tool_def.func
+                # Run synchronous tools in a worker thread so they don't block
+                # the event loop. A timed call can't be cancelled, so (unless
+                # there's an executor) it gets its own daemon thread, which is
+                # abandoned on timeout rather than tying up the default pool.
+                if not tool_def._is_async:
+                    if timeout is not None and executor is None:
+                        func = wrap_async_daemon(func)
+                    else:
+                        func = wrap_async_threaded(func, executor)
+            cache = tool_def.cache if tool_def is not None else None
+            return await self._invoke_tool_async(
+                func, x.arguments, x.id, timeout=timeout, cache=cache, name=x.name
+            )
+
         results: list[ContentToolResult] = []
-        for x in turn.contents:
-            if isinstance(x, ContentToolRequest):
-                tool_def = self.tools.get(x.name, None)
-                func = tool_def.func if tool_def is not None else None
-                results.append(await self._invoke_tool_async(func, x.arguments, x.id))
+        if self._tool_options["concurrent"] and len(requests) > 1:
+            max_concurrency = self._tool_options["max_concurrency"]
+            if max_concurrency is not None:
+                semaphore = asyncio.Semaphore(max_concurrency)
 
-        if not results:
-            return None
+                async def invoke_limited(x: ContentToolRequest) -> ContentToolResult:
+                    async with semaphore:
+                        return await invoke(x)
+
+                tasks = [invoke_limited(x) for x in requests]
+            else:
+                tasks = [invoke(x) for x in requests]
+            # gather() returns results in the order of the requests
+            results = list(await asyncio.gather(*tasks))
+        else:
+            for x in requests:
+                results.append(await invoke(x))
 
         return Turn("user", results)
 
+    def _tool_timeout(self, tool: Tool | None) -> float | None:
+        if tool is not None and tool.timeout is not None:
+            return tool.timeout
+        return self._tool_options["timeout"]
+
     @staticmethod
     def _invoke_tool(
         func: Callable[..., Any] | None,
         arguments: object,
         id_: str,
+        timeout: float | None = None,
+        cache: ToolCache | None = None,
+        name: str | None = None,
     ) -> ContentToolResult:
         if func is None:
             return ContentToolResult(id_, None, "Unknown tool")
 
-        try:
+        if cache is None:
+            return Chat._call_tool(func, arguments, id_, timeout)
+
+        key = cache._key(name or func.__name__, arguments)
+        value = cache._get(key)
+        if not isinstance(value, MISSING_TYPE):
+            return ContentToolResult(id_, value, None)
+
+        res = Chat._call_tool(func, arguments, id_, timeout)
+        if res.error is None:
+            cache._set(key, res.value)
+        return res
+
+    @staticmethod
+    def _call_tool(
+        func: Callable[..., Any],
+        arguments: object,
+        id_: str,
+        timeout: float | None,
+    ) -> ContentToolResult:
+        def call():
             if isinstance(arguments, dict):
-                result = func(**arguments)
+                return func(**arguments)
             else:
-                result = func(arguments)
-
-            return ContentToolResult(id_, result, None)
-        except Exception as e:
-            return ContentToolResult(id_, None, str(e))
+                return func(arguments)
+
+        if timeout is None:
+            try:
+                return ContentToolResult(id_, call(), None)
+            except Exception as e:
+                return ContentToolResult(id_, None, str(e))
+
+        # There's no way to cancel a synchronous function, so run it in a
+        # (daemon) thread that gets abandoned if it doesn't finish in time
+        outcome: dict[str, Any] = {}
+
+        def target():
+            try:
+                outcome["value"] = call()
+            except Exception as e:
+                outcome["error"] = str(e)
+
+        ctx = contextvars.copy_context()
+        thread = Thread(target=ctx.run, args=(target,), daemon=True)
+        thread.start()
+        thread.join(timeout)
+
+        if thread.is_alive():
+            return ContentToolResult(id_, None, _timeout_message(timeout))
+        if "error" in outcome:
+            return ContentToolResult(id_, None, outcome["error"])
+        return ContentToolResult(id_, outcome.get("value"), None)
 
     @staticmethod
     async def _invoke_tool_async(
         func: Callable[..., Awaitable[Any]] | None,
         arguments: object,
         id_: str,
+        timeout: float | None = None,
+        cache: ToolCache | None = None,
+        name: str | None = None,
     ) -> ContentToolResult:
         if func is None:
             return ContentToolResult(id_, None, "Unknown tool")
 
+        if cache is None:
+            return await Chat._call_tool_async(func, arguments, id_, timeout)
+
+        key = cache._key(name or func.__name__, arguments)
+        value = cache._get(key)
+        if not isinstance(value, MISSING_TYPE):
+            return ContentToolResult(id_, value, None)
+
+        res = await Chat._call_tool_async(func, arguments, id_, timeout)
+        if res.error is None:
+            cache._set(key, res.value)
+        return res
+
+    @staticmethod
+    async def _call_tool_async(
+        func: Callable[..., Awaitable[Any]],
+        arguments: object,
+        id_: str,
+        timeout: float | None,
+    ) -> ContentToolResult:
         try:
             if isinstance(arguments, dict):
-                result = await func(**arguments)
+                coro = func(**arguments)
             else:
-                result = await func(arguments)
+                coro = func(arguments)
+
+            # wait_for() cancels the call if it doesn't finish in time
+            result = await asyncio.wait_for(coro, timeout)
 
             return ContentToolResult(id_, result, None)
+        except asyncio.TimeoutError:
+            return ContentToolResult(id_, None, _timeout_message(timeout))
         except Exception as e:
             return ContentToolResult(id_, None, str(e))
 
@@ -1086,6 +1765,7 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         rich_markdown: Optional[dict[str, Any]] = None,
         rich_console: Optional[dict[str, Any]] = None,
         css_styles: Optional[dict[str, str]] = None,
+        refresh_per_second: float = 10,
     ):
         """
         Set echo styling options for the chat.
@@ -1101,13 +1781,193 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         css_styles
             A dictionary of CSS styles to apply to `IPython.display.Markdown()`.
             This is only relevant when outputing to the browser.
+        refresh_per_second
+            The maximum number of times per second to re-render the (streaming)
+            response. Since each refresh renders the entire response so far,
+            lower values use less CPU for long responses. Any remaining content
+            is always rendered once the response is complete (before any tools
+            are invoked).
         """
+        if refresh_per_second <= 0:
+            raise ValueError("`refresh_per_second` must be a positive number.")
+
         self._echo_options: EchoOptions = {
             "rich_markdown": rich_markdown or {},
             "rich_console": rich_console or {},
             "css_styles": css_styles or {},
+            "refresh_per_second": refresh_per_second,
         }
 
+    def set_tool_options(
+        self,
+        *,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Set options for how tools are invoked.
+
+        Parameters
+        ----------
+        concurrent
+            Whether to invoke the tools requested in a single assistant turn
+            concurrently (rather than one after the other). In async chats
+            (e.g., `.chat_async()`), the tool calls are run with
+            `asyncio.gather()`. In synchronous chats (e.g., `.chat()`), they are
+            dispatched to a thread pool (see `executor`). Regardless, the tool
+            results are always returned in the same order as the requests.
+        max_concurrency
+            The maximum number of tool calls to run at the same time when
+            `concurrent=True`. In synchronous chats, this is the maximum number
+            of worker threads. If `None`, there is no limit for async chats, and
+            `concurrent.futures.ThreadPoolExecutor`'s default number of workers
+            is used for synchronous chats.
+        executor
+            A `concurrent.futures.Executor` to run synchronous tools in.
+
+            In synchronous chats, tool calls are dispatched to it when
+            `concurrent=True`. If `None`, a `ThreadPoolExecutor` is created
+            (and shut down) for each assistant turn that requests more than one
+            tool. When provided, the executor determines the number of workers
+            (i.e., `max_concurrency` doesn't apply to it).
+
+            In async chats, synchronous tools are always run in a worker thread
+            (so they don't block the event loop). If `None`, this is done with
+            `asyncio.to_thread()` (or, for calls with a `timeout`, in a new
+            daemon thread); otherwise, the tool is run in this executor.
+        timeout
+            The default maximum number of seconds to wait for a tool to return
+            (for tools that weren't registered with their own `timeout`). If a
+            call takes longer, the model is sent an error result instead (the
+            call is cancelled if the tool is async, and abandoned otherwise). If
+            `None`, tool calls can take as long as they need.
+
+            Note that an abandoned synchronous tool keeps running until it
+            returns. Without an `executor`, it runs in its own daemon thread, so
+            it doesn't keep the program from exiting; with an `executor`, it
+            keeps occupying one of the executor's workers.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be a positive integer or `None`.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("`timeout` must be a positive number or `None`.")
+
+        self._tool_options: ToolOptions = {
+            "concurrent": concurrent,
+            "max_concurrency": max_concurrency,
+            "executor": executor,
+            "timeout": timeout,
+        }
+
+    def set_response_cache(self, cache: Optional[ResponseCache]):
+        """
+        Set (or remove) a cache of the assistant's responses.
+
+        When a request identical to one sent before (by any chat using the same
+        cache) is about to be sent, the cached response is replayed instead.
+
+        Parameters
+        ----------
+        cache
+            A [](`~chatlas.ResponseCache`), or `None` to stop caching responses.
+        """
+        self._response_cache = cache
+
+    def set_retry_policy(self, policy: Optional[RetryPolicy]):
+        """
+        Set (or remove) a policy for retrying failed requests.
+
+        Parameters
+        ----------
+        policy
+            A [](`~chatlas.RetryPolicy`), or `None` to not retry failed requests
+            (beyond any retries done by the provider's SDK).
+        """
+        self._retry_policy = policy
+
+    def set_context_policy(self, policy: Optional[ContextPolicy]):
+        """
+        Set (or remove) a policy for trimming the turns sent with each request.
+
+        Long conversations grow the cost and latency of each request, and
+        eventually exceed the model's context window. A context policy limits
+        what is sent (e.g., to the most recent turns, or to what fits in a
+        token budget) without changing the chat's turns.
+
+        Parameters
+        ----------
+        policy
+            A policy such as [](`~chatlas.KeepLastTurns`),
+            [](`~chatlas.TokenBudget`), or [](`~chatlas.SummarizeOlderTurns`), or
+            `None` to send every turn.
+        """
+        self._context_policy = policy
+
+    def set_timing_callback(self, callback: Optional[Callable[[Turn], None]]):
+        """
+        Set (or remove) a function to call with each new assistant turn's timing.
+
+        The timing of each request (e.g., the time to first token) is recorded
+        in the resulting turn's `.timing` (see [](`~chatlas.types.TurnTiming`)).
+        This callback makes it easy to export it (e.g., to a metrics system).
+
+        Examples
+        --------
+
+        ```python
+        from chatlas import ChatOpenAI
+
+        chat = ChatOpenAI()
+        chat.set_timing_callback(
+            lambda turn: print(f"{turn.model}: {turn.timing.ttft:.2f}s to first token")
+        )
+        chat.chat("What is the capital of France?")
+        ```
+
+        Parameters
+        ----------
+        callback
+            A function that takes the (assistant) [](`~chatlas.Turn`), or `None`
+            to remove the callback. It's called once the response is complete
+            and the turn has been added to the chat (but not for responses
+            replayed from a response cache). Errors raised by the callback are
+            turned into warnings.
+        """
+        self._timing_callback = callback
+
+    def _report_timing(self, turn: Turn) -> None:
+        """
+        Call the timing callback (if any), without letting its errors disrupt
+        the chat (the turn has already been added to it).
+        """
+        if self._timing_callback is None:
+            return
+        try:
+            self._timing_callback(turn)
+        except Exception as e:
+            warnings.warn(
+                f"The timing callback raised an error: {e!r}",
+                stacklevel=2,
+            )
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """
+        Get the number of seconds to wait before retrying a failed request (or
+        `None` if it shouldn't be retried).
+        """
+        policy = self._retry_policy
+        if policy is None:
+            return None
+        delay = policy._delay(error, attempt)
+        if delay is not None:
+            logger.info(
+                f"Request failed ({error!r}); retrying in {delay:.1f} seconds "
+                f"(retry {attempt} of {policy.max_retries})."
+            )
+        return delay
+
     def __str__(self):
         turns = self.turns(include_system_prompt=False)
         res = ""
@@ -1125,7 +1985,7 @@ class Chat(Generic[SubmitInputArgsT, CompletionT]):
         return res + "\n"
 
 
-class ChatResponse:
+class ChatResponse(ContentAccumulator):
     """
     Chat response object.
 
@@ -1151,14 +2011,14 @@ class ChatResponse:
 
     def __init__(self, generator: Generator[str, None]):
         self._generator = generator
-        self.content: str = ""
+        self._reset_content()
 
     def __iter__(self) -> Iterator[str]:
         return self
 
     def __next__(self) -> str:
         chunk = next(self._generator)
-        self.content += chunk  # Keep track of accumulated content
+        self._append_content(chunk)  # Keep track of accumulated content
         return chunk
 
     def get_content(self) -> str:
@@ -1177,7 +2037,7 @@ class ChatResponse:
         return self.get_content()
 
 
-class ChatResponseAsync:
+class ChatResponseAsync(ContentAccumulator):
     """
     Chat response (async) object.
 
@@ -1203,14 +2063,14 @@ class ChatResponseAsync:
 
     def __init__(self, generator: AsyncGenerator[str, None]):
         self._generator = generator
-        self.content: str = ""
+        self._reset_content()
 
     def __aiter__(self) -> AsyncIterator[str]:
         return self
 
     async def __anext__(self) -> str:
         chunk = await self._generator.__anext__()
-        self.content += chunk  # Keep track of accumulated content
+        self._append_content(chunk)  # Keep track of accumulated content
         return chunk
 
     async def get_content(self) -> str:
@@ -1224,6 +2084,10 @@ class ChatResponseAsync:
         return self._generator.ag_frame is None
 
 
+def _timeout_message(timeout: float | None) -> str:
+    return f"Tool call timed out after {timeout} seconds."
+
+
 # ----------------------------------------------------------------------------
 # Helpers for emitting content
 # ----------------------------------------------------------------------------
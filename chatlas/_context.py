@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Optional
+
+from ._content import ContentToolResult
+from ._tokenizer import get_tokenizer
+from ._turn import Turn
+
+if TYPE_CHECKING:
+    from ._chat import Chat
+    from ._provider import Provider
+
+__all__ = (
+    "KeepLastTurns",
+    "TokenBudget",
+    "SummarizeOlderTurns",
+)
+
+
+class ContextPolicy(ABC):
+    """
+    A policy for trimming (or compacting) a chat's turns before they're sent.
+
+    A context policy is applied (via [](`~chatlas.Chat.set_context_policy`))
+    each time a request is about to be sent. It only changes what is sent to
+    the provider; the chat's turns are left unchanged.
+
+    Note that this class is exposed for developers who wish to implement their
+    own policy. Policies should only drop turns in front of a user turn that
+    isn't a tool result (see `ContextPolicy._cut_points()`), so that tool
+    requests are never separated from their results.
+    """
+
+    @abstractmethod
+    def apply(self, turns: list[Turn]) -> list[Turn]:
+        """
+        Get the turns to send.
+
+        Parameters
+        ----------
+        turns
+            The turns of the chat, including the system prompt (if any) and the
+            turn about to be sent.
+
+        Returns
+        -------
+        list[Turn]
+            The turns to send.
+        """
+        ...
+
+    async def apply_async(self, turns: list[Turn]) -> list[Turn]:
+        """
+        The async counterpart of `.apply()`.
+        """
+        return self.apply(turns)
+
+    @staticmethod
+    def _cut_points(turns: list[Turn]) -> list[int]:
+        """
+        Get the indices of the turns that the history may be cut in front of
+        (i.e., user turns that aren't tool results, excluding the first turn).
+        """
+        return [
+            i
+            for i, turn in enumerate(turns)
+            if i > 0
+            and turn.role == "user"
+            and not any(isinstance(x, ContentToolResult) for x in turn.contents)
+        ]
+
+
+def _split_system(turns: list[Turn]) -> tuple[list[Turn], list[Turn]]:
+    if turns and turns[0].role == "system":
+        return turns[:1], turns[1:]
+    return [], turns
+
+
+class KeepLastTurns(ContextPolicy):
+    """
+    Send only the system prompt and the most recent turns
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, KeepLastTurns
+
+    chat = ChatOpenAI(system_prompt="Be terse.")
+    chat.set_context_policy(KeepLastTurns(10))
+    ```
+
+    Parameters
+    ----------
+    n
+        The (maximum) number of turns to send, not counting the system prompt.
+        Since tool requests and their results are kept together, fewer turns
+        may be sent. If the latest user turn (and the turns that follow it)
+        alone exceed `n` turns, they are sent anyway.
+    """
+
+    def __init__(self, n: int):
+        if n < 1:
+            raise ValueError("`n` must be a positive integer.")
+        self.n = n
+
+    def __repr__(self) -> str:
+        return f"<KeepLastTurns n={self.n}>"
+
+    def apply(self, turns: list[Turn]) -> list[Turn]:
+        system, history = _split_system(turns)
+        if len(history) <= self.n:
+            return turns
+        cuts = self._cut_points(history)
+        if not cuts:
+            return turns
+        start = next((i for i in cuts if len(history) - i <= self.n), cuts[-1])
+        return system + history[start:]
+
+
+class TokenBudget(ContextPolicy):
+    """
+    Send only as many of the most recent turns as fit in a token budget
+
+    The number of tokens is estimated (locally) before the request is sent, so
+    the budget should leave some headroom below the model's context window (and
+    for the response).
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, TokenBudget
+
+    chat = ChatOpenAI()
+    chat.set_context_policy(TokenBudget(50_000, provider=chat.provider))
+    ```
+
+    Parameters
+    ----------
+    max_tokens
+        The maximum number of (input) tokens to send. The system prompt is
+        always sent, as is the latest user turn (and the turns that follow it),
+        even if they alone exceed the budget.
+    provider
+        The provider whose tokenizer is used to count tokens (see
+        [](`~chatlas.register_tokenizer`)). If `None`, a heuristic (of ~4
+        characters per token) is used.
+    """
+
+    def __init__(self, max_tokens: int, provider: Optional[Provider] = None):
+        if max_tokens < 1:
+            raise ValueError("`max_tokens` must be a positive integer.")
+        self.max_tokens = max_tokens
+        self.provider = provider
+
+    def __repr__(self) -> str:
+        return f"<TokenBudget max_tokens={self.max_tokens}>"
+
+    def apply(self, turns: list[Turn]) -> list[Turn]:
+        system, history = _split_system(turns)
+        cuts = self._cut_points(history)
+        if not cuts:
+            return turns
+
+        # Token counts are cached on the turns, so only new turns are counted
+        tokenizer = get_tokenizer(self.provider)
+        sizes = [tokenizer.count_turn(turn) for turn in history]
+        total = sum(tokenizer.count_turn(turn) for turn in system) + sum(sizes)
+        if total <= self.max_tokens:
+            return turns
+
+        start = 0
+        for i in cuts:
+            total -= sum(sizes[start:i])
+            start = i
+            if total <= self.max_tokens:
+                break
+        return system + history[start:]
+
+
+class SummarizeOlderTurns(ContextPolicy):
+    """
+    Replace older turns with a summary written by another (cheaper) model
+
+    Once there are more than `max_turns` turns, the older turns (all but the
+    most recent `keep_last` or so) are summarized (via `chat`), and the summary
+    is appended to the system prompt that's sent instead of them. The summary
+    is reused until there are again more than `max_turns` turns after it, and
+    is then updated (incrementally) with the turns that have since become old.
+    Since the policy keeps track of the summary, use a separate policy for each
+    chat.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, SummarizeOlderTurns
+
+    chat = ChatOpenAI(model="gpt-4o")
+    summarizer = ChatOpenAI(model="gpt-4o-mini")
+    chat.set_context_policy(SummarizeOlderTurns(summarizer, max_turns=20))
+    ```
+
+    Parameters
+    ----------
+    chat
+        The chat used to write the summaries. Each summary is requested from a
+        fork of it (see `Chat.fork()`), so its own turns are left unchanged.
+    max_turns
+        The number of turns (not counting the system prompt) above which older
+        turns are summarized.
+    keep_last
+        The (approximate) number of recent turns to send as is. Since the
+        history is only cut in front of a user turn (so that tool requests stay
+        with their results), slightly more turns may be kept.
+    prompt
+        The instructions for writing the summary. The conversation (and any
+        previous summary) is appended to it.
+    """
+
+    def __init__(
+        self,
+        chat: Chat,
+        max_turns: int = 20,
+        keep_last: int = 6,
+        prompt: str = (
+            "Summarize the following conversation between a user and an "
+            "assistant. Keep any facts, decisions, and open questions that may "
+            "be needed to continue the conversation. Be concise."
+        ),
+    ):
+        if keep_last < 1:
+            raise ValueError("`keep_last` must be a positive integer.")
+        if max_turns <= keep_last:
+            raise ValueError("`max_turns` must be greater than `keep_last`.")
+        self.chat = chat
+        self.max_turns = max_turns
+        self.keep_last = keep_last
+        self.prompt = prompt
+        # The turns summarized so far, and their summary
+        self._state: tuple[list[Turn], str] = ([], "")
+        # The system turn sent in place of the summarized turns (and the system
+        # prompt and summary it was built from), reused as long as they're the
+        # same, so that caches keyed on the turn (e.g., of its message params
+        # or token count) keep working
+        self._compacted: Optional[tuple[Optional[Turn], str, Turn]] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<SummarizeOlderTurns max_turns={self.max_turns} "
+            f"keep_last={self.keep_last}>"
+        )
+
+    def apply(self, turns: list[Turn]) -> list[Turn]:
+        split = self._split(turns)
+        if split is None:
+            return turns
+        system, old, recent = split
+        prompt = self._summary_prompt(old)
+        if prompt is not None:
+            response = self.chat.fork().chat(prompt, echo="none", stream=False)
+            self._state = (old, response.content)
+        return self._compact(system, recent)
+
+    async def apply_async(self, turns: list[Turn]) -> list[Turn]:
+        split = self._split(turns)
+        if split is None:
+            return turns
+        system, old, recent = split
+        prompt = self._summary_prompt(old)
+        if prompt is not None:
+            response = await self.chat.fork().chat_async(
+                prompt, echo="none", stream=False
+            )
+            self._state = (old, await response.get_content())
+        return self._compact(system, recent)
+
+    def _split(
+        self, turns: list[Turn]
+    ) -> Optional[tuple[list[Turn], list[Turn], list[Turn]]]:
+        """
+        Split the turns into the system prompt, the turns to summarize, and the
+        turns to send as is (or return `None` if nothing needs summarizing).
+        """
+        system, history = _split_system(turns)
+        if len(history) <= self.max_turns:
+            return None
+
+        # Keep using the current summary until enough new turns have piled up
+        n = len(self._state[0])
+        if (
+            n
+            and len(history) - n <= self.max_turns
+            and self._is_summarized(history[:n])
+        ):
+            return system, history[:n], history[n:]
+
+        cuts = self._cut_points(history)
+        if not cuts:
+            return None
+        start = next(
+            (i for i in reversed(cuts) if len(history) - i >= self.keep_last),
+            cuts[0],
+        )
+        return system, history[:start], history[start:]
+
+    def _is_summarized(self, turns: list[Turn]) -> bool:
+        summarized = self._state[0]
+        return len(turns) == len(summarized) and all(
+            x is y for x, y in zip(turns, summarized)
+        )
+
+    def _summary_prompt(self, old: list[Turn]) -> Optional[str]:
+        """
+        Get the prompt for summarizing `old` (or `None` if it's summarized).
+        """
+        if self._is_summarized(old):
+            return None
+        summarized, summary = self._state
+        n = len(summarized)
+        if n and self._is_summarized(old[:n]):
+            # Only summarize the new turns (along with the previous summary)
+            new = old[n:]
+        else:
+            new, summary = old, ""
+
+        prompt = self.prompt
+        if summary:
+            prompt += f"\n\n<summary>\n{summary}\n</summary>"
+        conversation = "\n\n".join(
+            f"{turn.role}: " + "".join(str(x) for x in turn.contents) for turn in new
+        )
+        return prompt + f"\n\n<conversation>\n{conversation}\n</conversation>"
+
+    def _compact(self, system: list[Turn], recent: list[Turn]) -> list[Turn]:
+        source = system[0] if system else None
+        summary = self._state[1]
+        compacted = self._compacted
+        if compacted is None or compacted[0] is not source or compacted[1] != summary:
+            text = source.text + "\n\n" if source is not None else ""
+            text += f"Summary of the conversation so far:\n\n{summary}"
+            compacted = (source, summary, Turn("system", text))
+            self._compacted = compacted
+        return [compacted[2], *recent]
@@ -1,15 +1,59 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 from uuid import uuid4
 
 from rich.live import Live
 
 from ._typing_extensions import TypedDict
+from ._utils import ContentAccumulator
 
 
-class MarkdownDisplay(ABC):
-    @abstractmethod
+class MarkdownDisplay(ContentAccumulator, ABC):
+    """
+    Display chunks of markdown as they stream in.
+
+    Since every refresh renders all the markdown received so far, refreshes are
+    throttled to (at most) `refresh_per_second`. Any content received since the
+    last refresh is rendered by `.flush()` (e.g., before tools are invoked), and
+    when the display is exited.
+    """
+
+    def __init__(self, refresh_per_second: float = 10):
+        self._reset_content()
+        self._refresh_interval = 1 / refresh_per_second
+        self._last_refresh: Optional[float] = None
+        self._pending = False
+
     def update(self, content: str):
+        self._append_content(content)
+        now = time.monotonic()
+        if (
+            self._last_refresh is not None
+            and now - self._last_refresh < self._refresh_interval
+        ):
+            self._pending = True
+            return
+        self._refresh()
+
+    def flush(self):
+        """Render any content received since the last refresh."""
+        if self._pending:
+            self._refresh()
+
+    def _refresh(self):
+        self._render(self.content)
+        self._last_refresh = time.monotonic()
+        self._pending = False
+
+    def _reset(self):
+        self._reset_content()
+        self._last_refresh = None
+        self._pending = False
+
+    @abstractmethod
+    def _render(self, content: str):
+        """Render (all) the content received so far."""
         pass
 
     @abstractmethod
@@ -25,6 +69,9 @@ class MockMarkdownDisplay(MarkdownDisplay):
     def update(self, content: str):
         pass
 
+    def _render(self, content: str):
+        pass
+
     def __enter__(self):
         return self
 
@@ -40,7 +87,7 @@ class LiveMarkdownDisplay(MarkdownDisplay):
     def __init__(self, echo_options: "EchoOptions"):
         from rich.console import Console
 
-        self.content: str = ""
+        super().__init__(echo_options["refresh_per_second"])
         self.live = Live(
             auto_refresh=False,
             vertical_overflow="visible",
@@ -50,13 +97,12 @@ class LiveMarkdownDisplay(MarkdownDisplay):
         )
         self._markdown_options = echo_options["rich_markdown"]
 
-    def update(self, content: str):
+    def _render(self, content: str):
         from rich.markdown import Markdown
 
-        self.content += content
         self.live.update(
             Markdown(
-                self.content,
+                content,
                 **self._markdown_options,
             ),
             refresh=True,
@@ -67,25 +113,28 @@ class LiveMarkdownDisplay(MarkdownDisplay):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.content = ""
+        self.flush()
+        self._reset()
         return self.live.__exit__(exc_type, exc_value, traceback)
 
 
 class IPyMarkdownDisplay(MarkdownDisplay):
     """
     Stream chunks of markdown into an IPython notebook.
+
+    Each update sends all the markdown received so far to the frontend, so the
+    throttling also limits the number of bytes sent.
     """
 
     def __init__(self, echo_options: "EchoOptions"):
-        self.content: str = ""
+        super().__init__(echo_options["refresh_per_second"])
         self._css_styles = echo_options["css_styles"]
 
-    def update(self, content: str):
+    def _render(self, content: str):
         from IPython.display import Markdown, update_display
 
-        self.content += content
         update_display(
-            Markdown(self.content),
+            Markdown(content),
             display_id=self._ipy_display_id,
         )
 
@@ -118,6 +167,8 @@ class IPyMarkdownDisplay(MarkdownDisplay):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        self._reset()
         self._ipy_display_id = None
 
 
@@ -125,3 +176,4 @@ class EchoOptions(TypedDict):
     rich_markdown: dict[str, Any]
     rich_console: dict[str, Any]
     css_styles: dict[str, str]
+    refresh_per_second: float
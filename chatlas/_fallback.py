@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from typing import Any, Callable, Optional, Sequence
+
+from pydantic import BaseModel
+
+from ._hedged import TaggedProvider, TaggedStream, perform, perform_async
+from ._provider import Provider
+from ._retry import is_transient_error
+from ._tools import Tool
+from ._turn import Turn
+from ._utils import logger
+
+__all__ = ("FallbackProvider",)
+
+
+class FallbackProvider(TaggedProvider):
+    """
+    Fall back to other providers when a provider fails
+
+    Send each request to the first provider and, if it fails (e.g., with a
+    connection error, timeout, or server error), send the same request to the
+    next provider (and so on). A streaming response that fails (or times out)
+    before its first chunk falls back too. Errors that the next provider would
+    likely run into as well (e.g., an invalid request) are raised right away,
+    as is the error of the last provider if they all fail.
+
+    Since each provider converts the turns to its own request format, they
+    don't need to be the same kind of provider (e.g., OpenAI, Azure OpenAI, and
+    AWS Bedrock). The provider that generated each turn is recorded in
+    `Turn.provider`.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatBedrockAnthropic, ChatAnthropic, Chat, FallbackProvider
+
+    anthropic = ChatAnthropic(model="claude-3-5-sonnet-latest")
+    bedrock = ChatBedrockAnthropic(model="anthropic.claude-3-5-sonnet-20241022-v2:0")
+
+    chat = Chat(FallbackProvider([anthropic.provider, bedrock.provider]))
+    chat.chat("What is the capital of France?")
+    print(chat.last_turn().provider)
+    ```
+
+    Parameters
+    ----------
+    providers
+        The providers to try, in order of preference.
+    timeout
+        The number of seconds to wait for each provider to start responding
+        (i.e., to stream the first chunk, or return the complete response)
+        before falling back to the next provider. If `None`, there's no
+        timeout (beyond that of the provider's SDK).
+    should_fall_back
+        A function that takes the error of a failed request and returns whether
+        to fall back to the next provider. By default, requests fall back on
+        connection errors, timeouts, and transient HTTP errors (e.g., 429 or
+        5xx), but not on other errors (e.g., 400 or 401).
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[Provider],
+        timeout: Optional[float] = None,
+        should_fall_back: Optional[Callable[[Exception], bool]] = None,
+    ):
+        if len(providers) < 1:
+            raise ValueError("At least one provider is required.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("`timeout` must be a positive number or `None`.")
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.should_fall_back = should_fall_back or is_transient_error
+
+    def chat_perform(  # type: ignore
+        self,
+        *,
+        stream: bool,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]] = None,
+        kwargs: Optional[Any] = None,
+    ):
+        args = (stream, turns, tools, data_model, kwargs)
+        for i, provider in enumerate(self.providers):
+            try:
+                return _perform_with_timeout(provider, args, self.timeout)
+            except Exception as e:
+                if i == len(self.providers) - 1 or not self.should_fall_back(e):
+                    raise
+                _log_fallback(provider, e)
+
+    async def chat_perform_async(  # type: ignore
+        self,
+        *,
+        stream: bool,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]] = None,
+        kwargs: Optional[Any] = None,
+    ):
+        args = (stream, turns, tools, data_model, kwargs)
+        for i, provider in enumerate(self.providers):
+            try:
+                return await _perform_with_timeout_async(provider, args, self.timeout)
+            except Exception as e:
+                if i == len(self.providers) - 1 or not self.should_fall_back(e):
+                    raise
+                _log_fallback(provider, e)
+
+
+def _perform_with_timeout(
+    provider: Provider, args: tuple, timeout: Optional[float]
+) -> Any:
+    """
+    Perform a request (see `perform()`), raising a `TimeoutError` if the
+    provider doesn't start responding within `timeout` seconds.
+    """
+    if timeout is None:
+        return perform(provider, *args)
+
+    # The request can't be interrupted, so it's performed in a worker thread
+    # (and, if it responds too late, closed once it's done)
+    results: queue.Queue[tuple[Any, Optional[BaseException]]] = queue.Queue()
+
+    def run():
+        try:
+            results.put((perform(provider, *args), None))
+        except BaseException as e:
+            results.put((None, e))
+
+    threading.Thread(target=run, daemon=True).start()
+    try:
+        value, error = results.get(timeout=timeout)
+    except queue.Empty:
+
+        def close_late():
+            late, _ = results.get()
+            if isinstance(late, TaggedStream):
+                late.close()
+
+        threading.Thread(target=close_late, daemon=True).start()
+        raise _timeout_error(provider, timeout) from None
+
+    if error is not None:
+        raise error
+    return value
+
+
+async def _perform_with_timeout_async(
+    provider: Provider, args: tuple, timeout: Optional[float]
+) -> Any:
+    """
+    The async counterpart of `_perform_with_timeout()` (where the request is
+    cancelled if it times out).
+    """
+    if timeout is None:
+        return await perform_async(provider, *args)
+    try:
+        return await asyncio.wait_for(perform_async(provider, *args), timeout)
+    except asyncio.TimeoutError:
+        raise _timeout_error(provider, timeout) from None
+
+
+def _timeout_error(provider: Provider, timeout: float) -> TimeoutError:
+    name = provider.__class__.__name__.replace("Provider", "")
+    return TimeoutError(f"{name} didn't start responding within {timeout} seconds.")
+
+
+def _log_fallback(provider: Provider, error: Exception) -> None:
+    name = provider.__class__.__name__.replace("Provider", "")
+    logger.info(f"{name} request failed ({error!r}); falling back to next provider.")
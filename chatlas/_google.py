@@ -337,16 +337,17 @@ class GoogleProvider(
         for turn in turns:
             if turn.role == "system":
                 continue  # System messages are handled separately
-            elif turn.role == "user":
-                parts = [self._as_part_type(c) for c in turn.contents]
-                contents.append({"role": turn.role, "parts": parts})
-            elif turn.role == "assistant":
-                parts = [self._as_part_type(c) for c in turn.contents]
-                contents.append({"role": "model", "parts": parts})
+            elif turn.role in ("user", "assistant"):
+                contents.append(turn._cached("google", self._google_content))
             else:
                 raise ValueError(f"Unknown role {turn.role}")
         return contents
 
+    def _google_content(self, turn: Turn) -> "ContentDict":
+        parts = [self._as_part_type(c) for c in turn.contents]
+        role = "user" if turn.role == "user" else "model"
+        return {"role": role, "parts": parts}
+
     def _as_part_type(self, content: Content) -> "PartType":
         from google.generativeai.types.content_types import protos
 
@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import queue
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+from ._provider import Provider
+from ._tokens import provider_key
+from ._tools import Tool
+from ._turn import Turn
+from ._utils import logger
+
+__all__ = ("HedgedProvider",)
+
+T = TypeVar("T")
+
+
+class Tagged(Generic[T]):
+    """A value (e.g., a chunk or completion) and the provider that produced it."""
+
+    def __init__(self, provider: Provider, value: T):
+        self.provider = provider
+        self.value = value
+
+
+class TaggedProvider(Provider[Tagged, Tagged, Tagged]):
+    """
+    A provider that delegates each request to one of several providers.
+
+    Chunks and completions are tagged with the provider that produced them,
+    so that they can be handled by that same provider.
+    """
+
+    def stream_text(self, chunk):
+        return chunk.provider.stream_text(chunk.value)
+
+    def stream_merge_chunks(self, completion, chunk):
+        value = completion.value if completion is not None else None
+        provider = chunk.provider
+        return Tagged(provider, provider.stream_merge_chunks(value, chunk.value))
+
+    def stream_turn(self, completion, has_data_model, stream) -> Turn:
+        turn = stream.provider.stream_turn(
+            completion.value if completion is not None else None,
+            has_data_model=has_data_model,
+            stream=stream.response,
+        )
+        return _set_turn_provider(turn, stream.provider)
+
+    async def stream_turn_async(self, completion, has_data_model, stream) -> Turn:
+        turn = await stream.provider.stream_turn_async(
+            completion.value if completion is not None else None,
+            has_data_model=has_data_model,
+            stream=stream.response,
+        )
+        return _set_turn_provider(turn, stream.provider)
+
+    def value_turn(self, completion, has_data_model) -> Turn:
+        turn = completion.provider.value_turn(
+            completion.value, has_data_model=has_data_model
+        )
+        return _set_turn_provider(turn, completion.provider)
+
+
+def _set_turn_provider(turn: Turn, provider: Provider) -> Turn:
+    if turn.provider is None:
+        turn.provider, turn.model = provider_key(provider)
+    return turn
+
+
+def perform(
+    provider: Provider,
+    stream: bool,
+    turns: list[Turn],
+    tools: dict[str, Tool],
+    data_model: Optional[type[BaseModel]],
+    kwargs: Optional[Any],
+) -> Any:
+    """
+    Perform a request with `provider`, tagging the result. For streams, wait for
+    the first chunk (so that a stream that fails to start fails here).
+    """
+    response = provider.chat_perform(
+        stream=stream,  # type: ignore
+        turns=turns,
+        tools=tools,
+        data_model=data_model,
+        kwargs=kwargs,
+    )
+    if not stream:
+        return Tagged(provider, response)
+    chunks = iter(response)
+    first = next(chunks, _EMPTY)
+    return TaggedStream(provider, response, chunks, first)
+
+
+async def perform_async(
+    provider: Provider,
+    stream: bool,
+    turns: list[Turn],
+    tools: dict[str, Tool],
+    data_model: Optional[type[BaseModel]],
+    kwargs: Optional[Any],
+) -> Any:
+    """
+    The async counterpart of `perform()`.
+    """
+    response = await provider.chat_perform_async(
+        stream=stream,  # type: ignore
+        turns=turns,
+        tools=tools,
+        data_model=data_model,
+        kwargs=kwargs,
+    )
+    if not stream:
+        return Tagged(provider, response)
+    chunks = response.__aiter__()
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = _EMPTY
+    return TaggedStreamAsync(provider, response, chunks, first)
+
+
+class HedgedProvider(TaggedProvider):
+    """
+    Race the same request across multiple providers
+
+    Send each request to the first provider and, if it hasn't started
+    responding within `delay` seconds (or fails), send the same request to the
+    next provider (and so on). Whichever provider responds first (i.e., streams
+    the first chunk, or returns the complete response) is used, and the others
+    are cancelled. This reduces tail latency (and guards against outages) at
+    the cost of (occasionally) paying for duplicate requests.
+
+    Since each provider converts the turns to its own request format, they
+    don't need to be the same kind of provider (e.g., OpenAI and Azure OpenAI,
+    or Anthropic and AWS Bedrock), but they should serve equivalent models.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatAzureOpenAI, ChatOpenAI, Chat, HedgedProvider
+
+    openai = ChatOpenAI(model="gpt-4o")
+    azure = ChatAzureOpenAI(
+        endpoint="https://my-endpoint.openai.azure.com",
+        deployment_id="gpt-4o",
+        api_version="2024-08-01-preview",
+    )
+
+    chat = Chat(HedgedProvider([openai.provider, azure.provider], delay=0.5))
+    chat.chat("What is the capital of France?")
+    ```
+
+    Parameters
+    ----------
+    providers
+        The providers to race, in order of preference.
+    delay
+        The number of seconds to wait for a provider to start responding before
+        sending the request to the next provider.
+    """
+
+    def __init__(self, providers: Sequence[Provider], delay: float = 1):
+        if len(providers) < 1:
+            raise ValueError("At least one provider is required.")
+        if delay < 0:
+            raise ValueError("`delay` must be a non-negative number.")
+        self.providers = list(providers)
+        self.delay = delay
+
+    def chat_perform(  # type: ignore
+        self,
+        *,
+        stream: bool,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]] = None,
+        kwargs: Optional[Any] = None,
+    ):
+        args = (stream, turns, tools, data_model, kwargs)
+        starters = [functools.partial(perform, p, *args) for p in self.providers]
+        return _race_sync(starters, self.delay)
+
+    async def chat_perform_async(  # type: ignore
+        self,
+        *,
+        stream: bool,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]] = None,
+        kwargs: Optional[Any] = None,
+    ):
+        args = (stream, turns, tools, data_model, kwargs)
+        starters = [functools.partial(perform_async, p, *args) for p in self.providers]
+        return await _race_async(starters, self.delay)
+
+
+# Marks a stream that ended without producing any chunks
+_EMPTY = object()
+
+
+class TaggedStream:
+    """The (tagged) chunks of a provider's stream."""
+
+    def __init__(self, provider: Provider, response: Any, chunks: Iterator, first):
+        self.provider = provider
+        self.response = response
+        self._chunks = chunks
+        self._first = first
+
+    def __iter__(self) -> Iterator[Tagged]:
+        if self._first is not _EMPTY:
+            yield Tagged(self.provider, self._first)
+        for chunk in self._chunks:
+            yield Tagged(self.provider, chunk)
+
+    def close(self) -> None:
+        close = getattr(self.response, "close", None)
+        if close is not None and not inspect.iscoroutinefunction(close):
+            close()
+
+
+class TaggedStreamAsync:
+    """The (tagged) chunks of a provider's async stream."""
+
+    def __init__(self, provider: Provider, response: Any, chunks: AsyncIterator, first):
+        self.provider = provider
+        self.response = response
+        self._chunks = chunks
+        self._first = first
+
+    async def __aiter__(self) -> AsyncIterator[Tagged]:
+        if self._first is not _EMPTY:
+            yield Tagged(self.provider, self._first)
+        async for chunk in self._chunks:
+            yield Tagged(self.provider, chunk)
+
+    async def close(self) -> None:
+        close = getattr(self.response, "close", None)
+        if close is not None:
+            res = close()
+            if inspect.isawaitable(res):
+                await res
+
+
+def _race_sync(starters: list[Callable[[], Any]], delay: float) -> Any:
+    """
+    Run `starters` (in worker threads), starting each one after the previous
+    one has either failed or been running for `delay` seconds. Return the first
+    successful result (and close any others once they're done).
+    """
+    results: queue.Queue[tuple[Any, Optional[BaseException]]] = queue.Queue()
+
+    def start(i: int):
+        def run():
+            try:
+                results.put((starters[i](), None))
+            except BaseException as e:
+                results.put((None, e))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    start(0)
+    n_started, n_pending = 1, 1
+    errors: list[BaseException] = []
+    while True:
+        timeout = delay if n_started < len(starters) else None
+        try:
+            value, error = results.get(timeout=timeout)
+        except queue.Empty:
+            logger.debug(f"Hedging request (provider {n_started + 1})")
+            start(n_started)
+            n_started += 1
+            n_pending += 1
+            continue
+
+        n_pending -= 1
+        if error is None:
+            break
+
+        errors.append(error)
+        if n_started < len(starters):
+            start(n_started)
+            n_started += 1
+            n_pending += 1
+        elif n_pending == 0:
+            raise errors[0]
+
+    if n_pending > 0:
+        # The losers can't be interrupted, so close them once they're done
+        def close_losers():
+            for _ in range(n_pending):
+                loser, _ = results.get()
+                if isinstance(loser, TaggedStream):
+                    loser.close()
+
+        threading.Thread(target=close_losers, daemon=True).start()
+
+    return value
+
+
+async def _race_async(starters: list[Callable[[], Awaitable[Any]]], delay: float):
+    """
+    The async counterpart of `_race_sync()` (where the losers are cancelled).
+    """
+    tasks: set[asyncio.Task] = {asyncio.ensure_future(starters[0]())}
+    n_started = 1
+    errors: list[BaseException] = []
+    try:
+        while True:
+            timeout = delay if n_started < len(starters) else None
+            done, _ = await asyncio.wait(
+                tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.debug(f"Hedging request (provider {n_started + 1})")
+                tasks.add(asyncio.ensure_future(starters[n_started]()))
+                n_started += 1
+                continue
+
+            winner = None
+            for task in done:
+                tasks.discard(task)
+                error = task.exception()
+                if error is not None:
+                    errors.append(error)
+                elif winner is None:
+                    winner = task.result()
+                elif isinstance(task.result(), TaggedStreamAsync):
+                    await task.result().close()
+            if winner is not None:
+                return winner
+
+            if n_started < len(starters):
+                tasks.add(asyncio.ensure_future(starters[n_started]()))
+                n_started += 1
+            elif not tasks:
+                raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            losers = await asyncio.gather(*tasks, return_exceptions=True)
+            for loser in losers:
+                if isinstance(loser, TaggedStreamAsync):
+                    await loser.close()
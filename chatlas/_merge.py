@@ -31,34 +31,47 @@ def merge_dicts(left: dict[str, Any], *others: dict[str, Any]) -> dict[str, Any]
     """
     merged = left.copy()
     for right in others:
-        for right_k, right_v in right.items():
-            left_v = merged.get(right_k, None)
-
-            if right_v is None:
-                if right_k not in merged:
-                    merged[right_k] = None
-            elif left_v is None:
-                merged[right_k] = right_v
-            elif left_v == right_v:
-                continue
-            elif isinstance(left_v, str):
-                merged[right_k] += right_v
-            elif isinstance(left_v, (int, float)):
-                merged[right_k] = right_v
-            elif isinstance(merged[right_k], dict):
-                merged[right_k] = merge_dicts(merged[right_k], right_v)
-            elif isinstance(merged[right_k], list):
-                merged[right_k] = merge_lists(merged[right_k], right_v)
-            elif type(merged[right_k]) is not type(right_v):
-                raise TypeError(
-                    f'additional_kwargs["{right_k}"] already exists in this message,'
-                    " but with a different type."
-                )
-            else:
-                raise TypeError(
-                    f"Additional kwargs key {right_k} already exists in left dict and "
-                    f"value has unsupported type {type(merged[right_k])}."
-                )
+        _merge_dict_into(merged, right)
+    return merged
+
+
+def _merge_dict_into(
+    merged: dict[str, Any],
+    right: dict[str, Any],
+    skip: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """Merge 'right' into 'merged' (in place), ignoring any keys in 'skip'."""
+    for right_k, right_v in right.items():
+        if right_k in skip:
+            continue
+
+        left_v = merged.get(right_k, None)
+
+        if right_v is None:
+            if right_k not in merged:
+                merged[right_k] = None
+        elif left_v is None:
+            merged[right_k] = right_v
+        elif left_v == right_v:
+            continue
+        elif isinstance(left_v, str):
+            merged[right_k] += right_v
+        elif isinstance(left_v, (int, float)):
+            merged[right_k] = right_v
+        elif isinstance(merged[right_k], dict):
+            merged[right_k] = merge_dicts(merged[right_k], right_v)
+        elif isinstance(merged[right_k], list):
+            merged[right_k] = merge_lists(merged[right_k], right_v)
+        elif type(merged[right_k]) is not type(right_v):
+            raise TypeError(
+                f'additional_kwargs["{right_k}"] already exists in this message,'
+                " but with a different type."
+            )
+        else:
+            raise TypeError(
+                f"Additional kwargs key {right_k} already exists in left dict and "
+                f"value has unsupported type {type(merged[right_k])}."
+            )
     return merged
 
 
@@ -81,23 +94,37 @@ def merge_lists(
         elif merged is None:
             merged = other.copy()
         else:
+            # Map each `index` to the position of the (first) element in `merged`
+            # with that index, so matching elements are found in constant time.
+            positions: dict[int, int] | None = None
             for e in other:
-                if isinstance(e, dict) and "index" in e and isinstance(e["index"], int):
-                    to_merge = [
-                        i
-                        for i, e_left in enumerate(merged)
-                        if e_left["index"] == e["index"]
-                    ]
-                    if to_merge:
-                        # TODO: Remove this once merge_dict is updated with special
-                        # handling for 'type'.
-                        if "type" in e:
-                            e: dict[str, Any] = {  # noqa: PLW2901
-                                k: v for k, v in e.items() if k != "type"
-                            }
-                        merged[to_merge[0]] = merge_dicts(merged[to_merge[0]], e)
-                    else:
-                        merged.append(e)
-                else:
+                if not _has_int_index(e):
                     merged.append(e)
+                    continue
+
+                if positions is None:
+                    positions = _index_positions(merged)
+
+                pos = positions.get(e["index"])
+                if pos is None:
+                    positions[e["index"]] = len(merged)
+                    merged.append(e)
+                else:
+                    # TODO: Remove this once merge_dict is updated with special
+                    # handling for 'type'.
+                    merged[pos] = _merge_dict_into(
+                        merged[pos].copy(), e, skip=("type",)
+                    )
     return merged
+
+
+def _has_int_index(x: Any) -> bool:
+    return isinstance(x, dict) and isinstance(x.get("index", None), int)
+
+
+def _index_positions(x: list[Any]) -> dict[int, int]:
+    positions: dict[int, int] = {}
+    for i, e in enumerate(x):
+        if _has_int_index(e):
+            positions.setdefault(e["index"], i)
+    return positions
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Literal, Optional, cast, overload
 
 from pydantic import BaseModel
 
+from ._batch import BatchClient
 from ._chat import Chat
 from ._content import (
     Content,
@@ -24,6 +25,7 @@ from ._turn import Turn, normalize_turns
 from ._utils import MISSING, MISSING_TYPE, is_testing, log_model_default
 
 if TYPE_CHECKING:
+    from openai import OpenAI
     from openai.types.chat import (
         ChatCompletion,
         ChatCompletionChunk,
@@ -181,7 +183,179 @@ def ChatOpenAI(
     )
 
 
-class OpenAIProvider(Provider[ChatCompletion, ChatCompletionChunk, ChatCompletionDict]):
+class ChatCompletionAccumulator:
+    """
+    Accumulate streamed `ChatCompletionChunk`s into a `ChatCompletion` (dict).
+
+    Merging each chunk into the (growing) completion dictionary means copying
+    it and concatenating strings on every chunk, which is quadratic in the
+    length of the response. Instead, text deltas (content, refusals, and tool
+    call arguments) are appended to list buffers, and only joined once the
+    stream is finished (via `.result()`).
+    """
+
+    def __init__(self):
+        self._fields: dict[str, Any] = {}
+        self._extra: dict[str, Any] = {}
+        self._choices: dict[int, _ChoiceAccumulator] = {}
+
+    def add(self, chunk: "ChatCompletionChunk") -> None:
+        for key in ("id", "created", "model", "object", "service_tier"):
+            value = getattr(chunk, key, None)
+            if value is not None:
+                self._fields.setdefault(key, value)
+
+        fingerprint = getattr(chunk, "system_fingerprint", None)
+        if fingerprint is not None:
+            self._fields["system_fingerprint"] = fingerprint
+
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self._fields["usage"] = usage.model_dump()
+
+        # Some OpenAI-compatible APIs (e.g., Groq) include extra fields
+        if chunk.model_extra:
+            self._extra = merge_dicts(self._extra, chunk.model_extra)
+
+        for choice in chunk.choices:
+            acc = self._choices.get(choice.index)
+            if acc is None:
+                acc = self._choices[choice.index] = _ChoiceAccumulator(choice.index)
+            acc.add(choice)
+
+    def result(self) -> ChatCompletionDict:
+        return {
+            **self._extra,
+            **self._fields,
+            "choices": [x.result() for x in self._choices.values()],
+        }
+
+
+# The delta fields that _ChoiceAccumulator accumulates specifically
+_DELTA_FIELDS = {"content", "function_call", "refusal", "role", "tool_calls"}
+
+
+class _ChoiceAccumulator:
+    def __init__(self, index: int):
+        self.index = index
+        self.role: Optional[str] = None
+        self.content: list[str] = []
+        self.refusal: list[str] = []
+        self.function_call: Optional[_ToolCallAccumulator] = None
+        self.tool_calls: dict[int, _ToolCallAccumulator] = {}
+        self.finish_reason: Optional[str] = None
+        self.logprobs: Optional[dict[str, list[Any]]] = None
+        self.extra: dict[str, Any] = {}
+        self.delta_extra: dict[str, Any] = {}
+
+    def add(self, choice: Any) -> None:
+        delta = choice.delta
+        if delta is not None:
+            if delta.role is not None and self.role is None:
+                self.role = delta.role
+            if delta.content is not None:
+                self.content.append(delta.content)
+            if getattr(delta, "refusal", None) is not None:
+                self.refusal.append(delta.refusal)
+            if delta.function_call is not None:
+                if self.function_call is None:
+                    self.function_call = _ToolCallAccumulator()
+                self.function_call.add_function(delta.function_call)
+            for call in delta.tool_calls or []:
+                acc = self.tool_calls.get(call.index)
+                if acc is None:
+                    acc = self.tool_calls[call.index] = _ToolCallAccumulator()
+                acc.add(call)
+            # Other fields (e.g., `audio`, or the `reasoning_content` of some
+            # OpenAI-compatible APIs) are merged generically
+            if delta.model_extra or getattr(delta, "audio", None) is not None:
+                extra = delta.model_dump(exclude=_DELTA_FIELDS, exclude_none=True)
+                self.delta_extra = merge_dicts(self.delta_extra, extra)
+
+        if choice.finish_reason is not None:
+            self.finish_reason = choice.finish_reason
+
+        if choice.logprobs is not None:
+            if self.logprobs is None:
+                self.logprobs = {}
+            for key in ("content", "refusal"):
+                tokens = getattr(choice.logprobs, key, None)
+                if tokens is not None:
+                    buffer = self.logprobs.setdefault(key, [])
+                    buffer.extend(x.model_dump() for x in tokens)
+
+        if choice.model_extra:
+            self.extra = merge_dicts(self.extra, choice.model_extra)
+
+    def result(self) -> dict[str, Any]:
+        delta: dict[str, Any] = {
+            **self.delta_extra,
+            "content": "".join(self.content) if self.content else None,
+            "function_call": (
+                self.function_call.result()["function"] if self.function_call else None
+            ),
+            "refusal": "".join(self.refusal) if self.refusal else None,
+            "role": self.role,
+            "tool_calls": (
+                [{"index": i, **x.result()} for i, x in sorted(self.tool_calls.items())]
+                if self.tool_calls
+                else None
+            ),
+        }
+
+        logprobs = None
+        if self.logprobs is not None:
+            logprobs = {
+                "content": self.logprobs.get("content"),
+                "refusal": self.logprobs.get("refusal"),
+            }
+
+        return {
+            **self.extra,
+            "delta": delta,
+            "finish_reason": self.finish_reason,
+            "index": self.index,
+            "logprobs": logprobs,
+        }
+
+
+class _ToolCallAccumulator:
+    def __init__(self):
+        self.id: Optional[str] = None
+        self.type: Optional[str] = None
+        self.name: Optional[str] = None
+        self.arguments: list[str] = []
+
+    def add(self, call: Any) -> None:
+        if call.id is not None:
+            self.id = call.id
+        if call.type is not None:
+            self.type = call.type
+        if call.function is not None:
+            self.add_function(call.function)
+
+    def add_function(self, function: Any) -> None:
+        # Unlike the arguments, the name generally arrives in a single chunk,
+        # but some OpenAI-compatible APIs repeat it in every chunk
+        if function.name is not None and function.name != self.name:
+            self.name = (self.name or "") + function.name
+        if function.arguments is not None:
+            self.arguments.append(function.arguments)
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "function": {
+                "arguments": "".join(self.arguments) if self.arguments else None,
+                "name": self.name,
+            },
+            "type": self.type,
+        }
+
+
+class OpenAIProvider(
+    Provider[ChatCompletion, ChatCompletionChunk, ChatCompletionAccumulator]
+):
     def __init__(
         self,
         *,
@@ -330,17 +504,18 @@ class OpenAIProvider(Provider[ChatCompletion, ChatCompletionChunk, ChatCompletio
         return chunk.choices[0].delta.content
 
     def stream_merge_chunks(self, completion, chunk):
-        chunkd = chunk.model_dump()
         if completion is None:
-            return chunkd
-        return merge_dicts(completion, chunkd)
+            completion = ChatCompletionAccumulator()
+        completion.add(chunk)
+        return completion
 
     def stream_turn(self, completion, has_data_model, stream) -> Turn:
         from openai.types.chat import ChatCompletion
 
-        delta = completion["choices"][0].pop("delta")  # type: ignore
-        completion["choices"][0]["message"] = delta  # type: ignore
-        completion = ChatCompletion.construct(**completion)
+        completiond = completion.result()
+        delta = completiond["choices"][0].pop("delta")
+        completiond["choices"][0]["message"] = delta
+        completion = ChatCompletion.construct(**completiond)
         return self._as_turn(completion, has_data_model)
 
     async def stream_turn_async(self, completion, has_data_model, stream):
@@ -349,8 +524,29 @@ class OpenAIProvider(Provider[ChatCompletion, ChatCompletionChunk, ChatCompletio
     def value_turn(self, completion, has_data_model) -> Turn:
         return self._as_turn(completion, has_data_model)
 
+    def batch_client(self) -> OpenAIBatchClient:
+        return OpenAIBatchClient(self._client)
+
+    def batch_request(self, turns, tools, data_model=None, kwargs=None):
+        args = self._chat_perform_args(False, turns, tools, data_model, kwargs)
+        del args["stream"]
+        return cast(dict, args)
+
+    def batch_turn(self, result, has_data_model) -> Turn:
+        from openai.types.chat import ChatCompletion
+
+        completion = ChatCompletion.construct(**result)
+        return self._as_turn(completion, has_data_model)
+
     @staticmethod
     def _as_message_param(turns: list[Turn]) -> list["ChatCompletionMessageParam"]:
+        res: list["ChatCompletionMessageParam"] = []
+        for turn in turns:
+            res.extend(turn._cached("openai", OpenAIProvider._turn_as_message_params))
+        return res
+
+    @staticmethod
+    def _turn_as_message_params(turn: Turn) -> list["ChatCompletionMessageParam"]:
         from openai.types.chat import (
             ChatCompletionAssistantMessageParam,
             ChatCompletionMessageToolCallParam,
@@ -360,91 +556,88 @@ class OpenAIProvider(Provider[ChatCompletion, ChatCompletionChunk, ChatCompletio
         )
 
         res: list["ChatCompletionMessageParam"] = []
-        for turn in turns:
-            if turn.role == "system":
-                res.append(
-                    ChatCompletionSystemMessageParam(content=turn.text, role="system")
-                )
-            elif turn.role == "assistant":
-                content_parts: list["ContentArrayOfContentPart"] = []
-                tool_calls: list["ChatCompletionMessageToolCallParam"] = []
-                for x in turn.contents:
-                    if isinstance(x, ContentText):
-                        content_parts.append({"type": "text", "text": x.text})
-                    elif isinstance(x, ContentJson):
-                        content_parts.append({"type": "text", "text": ""})
-                    elif isinstance(x, ContentToolRequest):
-                        tool_calls.append(
-                            {
-                                "id": x.id,
-                                "function": {
-                                    "name": x.name,
-                                    "arguments": json.dumps(x.arguments),
-                                },
-                                "type": "function",
-                            }
-                        )
-                    else:
-                        raise ValueError(
-                            f"Don't know how to handle content type {type(x)} for role='assistant'."
-                        )
+        if turn.role == "system":
+            res.append(
+                ChatCompletionSystemMessageParam(content=turn.text, role="system")
+            )
+        elif turn.role == "assistant":
+            content_parts: list["ContentArrayOfContentPart"] = []
+            tool_calls: list["ChatCompletionMessageToolCallParam"] = []
+            for x in turn.contents:
+                if isinstance(x, ContentText):
+                    content_parts.append({"type": "text", "text": x.text})
+                elif isinstance(x, ContentJson):
+                    content_parts.append({"type": "text", "text": ""})
+                elif isinstance(x, ContentToolRequest):
+                    tool_calls.append(
+                        {
+                            "id": x.id,
+                            "function": {
+                                "name": x.name,
+                                "arguments": json.dumps(x.arguments),
+                            },
+                            "type": "function",
+                        }
+                    )
+                else:
+                    raise ValueError(
+                        f"Don't know how to handle content type {type(x)} for role='assistant'."
+                    )
 
-                # Some OpenAI-compatible models (e.g., Groq) don't work nicely with empty content
-                args = {
-                    "role": "assistant",
-                    "content": content_parts,
-                    "tool_calls": tool_calls,
-                }
-                if not content_parts:
-                    del args["content"]
-                if not tool_calls:
-                    del args["tool_calls"]
-
-                res.append(ChatCompletionAssistantMessageParam(**args))
-
-            elif turn.role == "user":
-                contents: list["ChatCompletionContentPartParam"] = []
-                tool_results: list["ChatCompletionToolMessageParam"] = []
-                for x in turn.contents:
-                    if isinstance(x, ContentText):
-                        contents.append({"type": "text", "text": x.text})
-                    elif isinstance(x, ContentJson):
-                        contents.append({"type": "text", "text": ""})
-                    elif isinstance(x, ContentImageRemote):
-                        contents.append(
-                            {"type": "image_url", "image_url": {"url": x.url}}
-                        )
-                    elif isinstance(x, ContentImageInline):
-                        contents.append(
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{x.content_type};base64,{x.data}"
-                                },
-                            }
-                        )
-                    elif isinstance(x, ContentToolResult):
-                        tool_results.append(
-                            ChatCompletionToolMessageParam(
-                                # TODO: a tool could return an image!?!
-                                content=x.get_final_value(),
-                                tool_call_id=x.id,
-                                role="tool",
-                            )
-                        )
-                    else:
-                        raise ValueError(
-                            f"Don't know how to handle content type {type(x)} for role='user'."
+            # Some OpenAI-compatible models (e.g., Groq) don't work nicely with empty content
+            args = {
+                "role": "assistant",
+                "content": content_parts,
+                "tool_calls": tool_calls,
+            }
+            if not content_parts:
+                del args["content"]
+            if not tool_calls:
+                del args["tool_calls"]
+
+            res.append(ChatCompletionAssistantMessageParam(**args))
+
+        elif turn.role == "user":
+            contents: list["ChatCompletionContentPartParam"] = []
+            tool_results: list["ChatCompletionToolMessageParam"] = []
+            for x in turn.contents:
+                if isinstance(x, ContentText):
+                    contents.append({"type": "text", "text": x.text})
+                elif isinstance(x, ContentJson):
+                    contents.append({"type": "text", "text": ""})
+                elif isinstance(x, ContentImageRemote):
+                    contents.append({"type": "image_url", "image_url": {"url": x.url}})
+                elif isinstance(x, ContentImageInline):
+                    contents.append(
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{x.content_type};base64,{x.data}"
+                            },
+                        }
+                    )
+                elif isinstance(x, ContentToolResult):
+                    tool_results.append(
+                        ChatCompletionToolMessageParam(
+                            # TODO: a tool could return an image!?!
+                            content=x.get_final_value(),
+                            tool_call_id=x.id,
+                            role="tool",
                         )
-
-                if contents:
-                    res.append(
-                        ChatCompletionUserMessageParam(content=contents, role="user")
                     )
-                res.extend(tool_results)
+                else:
+                    raise ValueError(
+                        f"Don't know how to handle content type {type(x)} for role='user'."
+                    )
 
-            else:
-                raise ValueError(f"Unknown role: {turn.role}")
+            if contents:
+                res.append(
+                    ChatCompletionUserMessageParam(content=contents, role="user")
+                )
+            res.extend(tool_results)
+
+        else:
+            raise ValueError(f"Unknown role: {turn.role}")
 
         return res
 
@@ -510,6 +703,74 @@ class OpenAIProvider(Provider[ChatCompletion, ChatCompletionChunk, ChatCompletio
         )
 
 
+class OpenAIBatchClient(BatchClient):
+    """
+    A client for OpenAI's [batch API](https://platform.openai.com/docs/guides/batch).
+
+    Parameters
+    ----------
+    client
+        An `openai.OpenAI()` client.
+    endpoint
+        The endpoint the batched requests are sent to.
+    completion_window
+        The time frame within which the batch should be processed.
+    """
+
+    def __init__(
+        self,
+        client: "OpenAI",
+        endpoint: str = "/v1/chat/completions",
+        completion_window: str = "24h",
+    ):
+        self._client = client
+        self._endpoint = endpoint
+        self._completion_window = completion_window
+
+    def submit(self, requests):
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": id_,
+                    "method": "POST",
+                    "url": self._endpoint,
+                    "body": body,
+                }
+            )
+            for id_, body in requests.items()
+        ]
+        input_file = self._client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self._client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=self._endpoint,  # type: ignore
+            completion_window=self._completion_window,  # type: ignore
+        )
+        return batch.id
+
+    def poll(self, batch_id):
+        batch = self._client.batches.retrieve(batch_id)
+        return batch.status in ("completed", "failed", "expired", "cancelled")
+
+    def results(self, batch_id):
+        batch = self._client.batches.retrieve(batch_id)
+        if batch.output_file_id is None:
+            return {}
+
+        res: dict[str, dict[str, Any]] = {}
+        content = self._client.files.content(batch.output_file_id)
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") == 200:
+                res[result["custom_id"]] = response["body"]
+        return res
+
+
 def ChatAzureOpenAI(
     *,
     endpoint: str,
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+from ._content import Content
+from ._utils import logger
+
+if TYPE_CHECKING:
+    from ._chat import Chat
+
+__all__ = (
+    "parallel_chat",
+    "parallel_extract_data",
+    "ParallelResults",
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ParallelResults(Generic[T]):
+    """
+    The results of running many chats in parallel.
+
+    Each list has one element per prompt (in the same order as the prompts).
+
+    Parameters
+    ----------
+    chats
+        The (forked) chat used for each prompt, including the new turns. `None`
+        if the prompt failed.
+    values
+        The result for each prompt (i.e., the response text, or the extracted
+        data). `None` if the prompt failed.
+    errors
+        The (last) exception raised for each prompt, or `None` if it succeeded.
+    tokens
+        The total number of input and output tokens (respectively) used by the
+        successful prompts.
+    """
+
+    chats: list[Optional[Chat]]
+    values: list[Optional[T]]
+    errors: list[Optional[BaseException]]
+    tokens: tuple[int, int]
+
+
+async def parallel_chat(
+    chat: Chat,
+    prompts: Sequence[str | Content | Sequence[Content | str]],
+    *,
+    max_concurrency: int = 10,
+    max_retries: int = 2,
+    retry_delay: float = 1,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    kwargs: Optional[dict[str, Any]] = None,
+) -> ParallelResults[str]:
+    """
+    Submit many prompts to (forks of) a chat in parallel.
+
+    Each prompt is submitted (via `.chat_async()`) to its own fork of `chat`
+    (see `Chat.fork()`), so every prompt continues the same conversation
+    without interfering with one another, and `chat` itself is left unchanged.
+
+    Examples
+    --------
+
+    ```python
+    import asyncio
+    from chatlas import ChatOpenAI, parallel_chat
+
+    chat = ChatOpenAI(system_prompt="Be terse.")
+    countries = ["France", "Germany", "Italy"]
+    prompts = [f"What is the capital of {x}?" for x in countries]
+
+    res = asyncio.run(parallel_chat(chat, prompts, max_concurrency=5))
+    print(res.values)
+    ```
+
+    Parameters
+    ----------
+    chat
+        The chat to fork for each prompt.
+    prompts
+        The prompts. Each is either a string or content object, or a sequence of
+        them (to be sent as one user turn).
+    max_concurrency
+        The maximum number of prompts to submit at the same time.
+    max_retries
+        The maximum number of times to retry a prompt that fails (with a fresh
+        fork of `chat`).
+    retry_delay
+        The number of seconds to wait before the first retry of a prompt. The
+        delay doubles with each subsequent retry.
+    on_progress
+        A function to call each time a prompt is done (successfully or not). It
+        is called with the number of prompts done and the total number of
+        prompts.
+    kwargs
+        Additional keyword arguments to pass to the method used for requesting
+        the response.
+
+    Returns
+    -------
+    ParallelResults[str]
+        The response text for each prompt (along with the chats, errors, and the
+        token usage).
+    """
+
+    async def submit(clone: Chat, args: list[Content | str]) -> str:
+        response = await clone.chat_async(*args, echo="none", kwargs=kwargs)
+        return response.content
+
+    return await _parallel_map(
+        chat,
+        prompts,
+        submit,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        on_progress=on_progress,
+    )
+
+
+async def parallel_extract_data(
+    chat: Chat,
+    prompts: Sequence[str | Content | Sequence[Content | str]],
+    *,
+    data_model: type[BaseModel],
+    max_concurrency: int = 10,
+    max_retries: int = 2,
+    retry_delay: float = 1,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> ParallelResults[dict[str, Any]]:
+    """
+    Extract structured data from many inputs in parallel.
+
+    This is the counterpart of [](`~chatlas.parallel_chat`) for
+    `.extract_data_async()`.
+
+    Parameters
+    ----------
+    chat
+        The chat to fork for each input.
+    prompts
+        The inputs to extract data from. Each is either a string or content
+        object, or a sequence of them (to be sent as one user turn).
+    data_model
+        A Pydantic model describing the structure of the data to extract.
+    max_concurrency
+        The maximum number of inputs to submit at the same time.
+    max_retries
+        The maximum number of times to retry an input that fails (with a fresh
+        fork of `chat`).
+    retry_delay
+        The number of seconds to wait before the first retry of an input. The
+        delay doubles with each subsequent retry.
+    on_progress
+        A function to call each time an input is done (successfully or not). It
+        is called with the number of inputs done and the total number of
+        inputs.
+
+    Returns
+    -------
+    ParallelResults[dict[str, Any]]
+        The extracted data for each input (along with the chats, errors, and
+        the token usage).
+    """
+
+    async def submit(clone: Chat, args: list[Content | str]) -> dict[str, Any]:
+        return await clone.extract_data_async(*args, data_model=data_model)
+
+    return await _parallel_map(
+        chat,
+        prompts,
+        submit,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        on_progress=on_progress,
+    )
+
+
+async def _parallel_map(
+    chat: Chat,
+    prompts: Sequence[str | Content | Sequence[Content | str]],
+    submit: Callable[[Chat, list[Content | str]], Awaitable[T]],
+    *,
+    max_concurrency: int,
+    max_retries: int,
+    retry_delay: float,
+    on_progress: Optional[Callable[[int, int], None]],
+) -> ParallelResults[T]:
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be a positive integer.")
+    if max_retries < 0:
+        raise ValueError("`max_retries` must be a non-negative integer.")
+
+    n = len(prompts)
+    chats: list[Optional[Chat]] = [None] * n
+    values: list[Optional[T]] = [None] * n
+    errors: list[Optional[BaseException]] = [None] * n
+    semaphore = asyncio.Semaphore(max_concurrency)
+    done = 0
+
+    async def run(i: int, prompt: str | Content | Sequence[Content | str]):
+        nonlocal done
+        if isinstance(prompt, (str, Content)):
+            args: list[Content | str] = [prompt]
+        else:
+            args = list(prompt)
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(retry_delay * 2 ** (attempt - 1))
+            clone = chat.fork()
+            try:
+                async with semaphore:
+                    values[i] = await submit(clone, args)
+            except Exception as e:
+                logger.debug(f"Prompt {i} failed (attempt {attempt + 1}): {e}")
+                errors[i] = e
+            else:
+                chats[i] = clone
+                errors[i] = None
+                break
+
+        done += 1
+        if on_progress is not None:
+            on_progress(done, n)
+
+    await asyncio.gather(*(run(i, prompt) for i, prompt in enumerate(prompts)))
+
+    n_turns = len(chat._turns)
+    input_tokens, output_tokens = 0, 0
+    for clone in chats:
+        if clone is None:
+            continue
+        for turn in clone._turns[n_turns:]:
+            if turn.tokens is not None:
+                input_tokens += turn.tokens[0]
+                output_tokens += turn.tokens[1]
+
+    return ParallelResults(
+        chats=chats,
+        values=values,
+        errors=errors,
+        tokens=(input_tokens, output_tokens),
+    )
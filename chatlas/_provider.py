@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from typing import (
+    TYPE_CHECKING,
     Any,
     AsyncIterable,
     Generic,
@@ -17,6 +18,9 @@ from pydantic import BaseModel
 from ._tools import Tool
 from ._turn import Turn
 
+if TYPE_CHECKING:
+    from ._batch import BatchClient
+
 ChatCompletionT = TypeVar("ChatCompletionT")
 ChatCompletionChunkT = TypeVar("ChatCompletionChunkT")
 # A dictionary representation of a chat completion
@@ -141,3 +145,36 @@ class Provider(
         completion: ChatCompletionT,
         has_data_model: bool,
     ) -> Turn: ...
+
+    def batch_client(self) -> "BatchClient":
+        """
+        Get a client for the provider's batch API.
+
+        Providers that support batch requests should override this method, as
+        well as `batch_request()` and `batch_turn()`.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support batch requests."
+        )
+
+    def batch_request(
+        self,
+        turns: list[Turn],
+        tools: dict[str, Tool],
+        data_model: Optional[type[BaseModel]],
+        kwargs: Any,
+    ) -> dict[str, Any]:
+        """
+        Build the arguments of a (non-streaming) request to include in a batch.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support batch requests."
+        )
+
+    def batch_turn(self, result: dict[str, Any], has_data_model: bool) -> Turn:
+        """
+        Convert a (dictionary representation of a) batch result into a turn.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support batch requests."
+        )
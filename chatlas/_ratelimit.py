@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from ._tokens import provider_key
+
+if TYPE_CHECKING:
+    from ._provider import Provider
+
+__all__ = (
+    "RateLimiter",
+    "rate_limit",
+)
+
+
+class RateLimiter:
+    """
+    Limit the rate of requests (and tokens) sent to a provider
+
+    A token-bucket rate limiter for requests per minute and/or tokens per
+    minute. Each bucket starts full (i.e., allows an initial burst of up to a
+    minute's worth of requests/tokens) and refills continuously. Requests wait
+    (in the order they were made) until there is enough capacity for them.
+
+    Since the number of tokens a request uses isn't known until it's done, an
+    estimate (of the input tokens) is reserved before the request is sent, and
+    the bucket is corrected (via `.reconcile()`) once the actual usage is
+    known. Each reservation should be reconciled exactly once (e.g., with 0
+    tokens if the request failed).
+
+    Rate limiters are generally created (and shared by every chat in the
+    process) via [](`~chatlas.rate_limit`).
+
+    Parameters
+    ----------
+    requests_per_minute
+        The maximum number of requests per minute. If `None`, requests aren't
+        limited.
+    tokens_per_minute
+        The maximum number of (input and output) tokens per minute. If `None`,
+        tokens aren't limited.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        if requests_per_minute is not None and requests_per_minute <= 0:
+            raise ValueError("`requests_per_minute` must be positive or `None`.")
+        if tokens_per_minute is not None and tokens_per_minute <= 0:
+            raise ValueError("`tokens_per_minute` must be positive or `None`.")
+
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = Lock()
+        self._requests = requests_per_minute or 0.0
+        self._tokens = tokens_per_minute or 0.0
+        self._updated = time.monotonic()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RateLimiter requests_per_minute={self.requests_per_minute} "
+            f"tokens_per_minute={self.tokens_per_minute}>"
+        )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait (blocking) until a request using `tokens` tokens can be sent.
+
+        Returns the number of tokens reserved (to pass to `.reconcile()`).
+        """
+        reserved = self._reserved(tokens)
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return reserved
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """
+        Wait (without blocking the event loop) until a request using `tokens`
+        tokens can be sent.
+
+        Returns the number of tokens reserved (to pass to `.reconcile()`). If
+        the wait is cancelled, the reservation is given back.
+        """
+        reserved = self._reserved(tokens)
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._release(reserved)
+                raise
+        return reserved
+
+    def reconcile(self, reserved: float, actual: int) -> None:
+        """
+        Correct the token bucket once the actual token usage of a request (for
+        which `reserved` tokens were acquired) is known.
+        """
+        if self.tokens_per_minute is None:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens + reserved - actual, self.tokens_per_minute)
+
+    def _reserved(self, tokens: int) -> float:
+        """The number of tokens reserved for a request using `tokens` tokens."""
+        if self.tokens_per_minute is None:
+            return 0
+        # A single request may never exceed the bucket's capacity
+        return min(tokens, self.tokens_per_minute)
+
+    def _release(self, reserved: float) -> None:
+        """Give back the reservation of a request that won't be sent."""
+        with self._lock:
+            self._refill()
+            if self.requests_per_minute is not None:
+                self._requests = min(self._requests + 1, self.requests_per_minute)
+            if self.tokens_per_minute is not None:
+                self._tokens = min(self._tokens + reserved, self.tokens_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute is not None:
+            self._requests = min(
+                self._requests + elapsed * self.requests_per_minute / 60,
+                self.requests_per_minute,
+            )
+        if self.tokens_per_minute is not None:
+            self._tokens = min(
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+                self.tokens_per_minute,
+            )
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Take a request (and `tokens` tokens) from the buckets, returning the
+        number of seconds to wait before the request may be sent.
+
+        Buckets may go into debt, so that waiting requests are served in order.
+        """
+        wait = 0.0
+        with self._lock:
+            self._refill()
+            if self.requests_per_minute is not None:
+                self._requests -= 1
+                if self._requests < 0:
+                    wait = -self._requests * 60 / self.requests_per_minute
+            if self.tokens_per_minute is not None:
+                self._tokens -= self._reserved(tokens)
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60 / self.tokens_per_minute)
+        return wait
+
+
+_rate_limiters: dict[tuple[str, Optional[str]], RateLimiter] = {}
+_rate_limiters_lock = Lock()
+
+
+def rate_limit(
+    provider: str,
+    model: Optional[str] = None,
+    *,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+) -> Optional[RateLimiter]:
+    """
+    Limit the rate of requests sent to a provider (and model)
+
+    Rate limits are shared by every chat in the current process, so that (for
+    example) a burst of concurrent chats stays within the provider's quota
+    instead of running into rate limit (i.e., 429) errors.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, rate_limit
+
+    rate_limit("OpenAI", "gpt-4o", requests_per_minute=500, tokens_per_minute=30_000)
+
+    chat = ChatOpenAI(model="gpt-4o")
+    chat.chat("What is the capital of France?")
+    ```
+
+    Parameters
+    ----------
+    provider
+        The name of the provider (e.g., "OpenAI" or "Anthropic"), as reported by
+        [](`~chatlas.token_usage`). Note that a chat with a
+        [](`~chatlas.HedgedProvider`) or [](`~chatlas.FallbackProvider`) is
+        limited as a whole (under the name "Hedged" or "Fallback"): limits set
+        for the providers it wraps don't apply to its requests.
+    model
+        The name of the model. If `None`, the limit applies to every model of
+        the provider that doesn't have a limit of its own.
+    requests_per_minute
+        The maximum number of requests per minute.
+    tokens_per_minute
+        The maximum number of tokens (input and output) per minute. Since the
+        number of input tokens is estimated before each request is sent, this
+        limit is approximate.
+
+    Returns
+    -------
+    RateLimiter | None
+        The rate limiter, or `None` if neither limit was specified (in which
+        case any existing limit for the provider and model is removed).
+    """
+    key = (provider, model)
+    with _rate_limiters_lock:
+        if requests_per_minute is None and tokens_per_minute is None:
+            _rate_limiters.pop(key, None)
+            return None
+        limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        _rate_limiters[key] = limiter
+        return limiter
+
+
+def get_rate_limiter(provider: Provider) -> Optional[RateLimiter]:
+    """
+    Get the rate limiter that applies to a provider (if any).
+    """
+    if not _rate_limiters:
+        return None
+    name, model = provider_key(provider)
+    with _rate_limiters_lock:
+        return _rate_limiters.get((name, model)) or _rate_limiters.get((name, None))
+
+
+def rate_limit_reset() -> None:
+    """
+    Remove all rate limits
+    """
+    with _rate_limiters_lock:
+        _rate_limiters.clear()
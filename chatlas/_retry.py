@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import time
+from typing import Any, Optional, Sequence
+
+__all__ = ("RetryPolicy",)
+
+# Names of (provider SDK and HTTP library) exception classes that indicate a
+# transient connection problem. Matching on names keeps this provider-agnostic
+# (and avoids importing optional dependencies).
+_CONNECTION_ERRORS = (
+    "APIConnectionError",
+    "APITimeoutError",
+    "TransportError",
+    "TimeoutException",
+    "RemoteProtocolError",
+    "ServiceUnavailable",
+    "DeadlineExceeded",
+    "InternalServerError",
+)
+
+# HTTP status codes that indicate a (typically) transient problem
+_TRANSIENT_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """
+    Retry failed requests with jittered exponential backoff
+
+    A request is retried if it fails with a connection error, a timeout, or a
+    (typically transient) HTTP status code (e.g., 429 or 5xx). If the server
+    says how long to wait (via a `Retry-After` header), that's respected.
+
+    Streaming responses that fail before any content has been received are
+    retried too. Once content has been received (and passed along), the
+    error is raised instead. Either way, a failed response is never added to
+    the chat's turns.
+
+    Note that most provider SDKs also retry some failures by default. If you
+    use a retry policy, consider disabling those (e.g., by passing
+    `kwargs={"max_retries": 0}` to `ChatOpenAI()` or `ChatAnthropic()`).
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, RetryPolicy
+
+    chat = ChatOpenAI(kwargs={"max_retries": 0})
+    chat.set_retry_policy(RetryPolicy(max_retries=5, max_delay=30))
+    ```
+
+    Parameters
+    ----------
+    max_retries
+        The maximum number of times to retry a request.
+    initial_delay
+        The number of seconds to wait before the first retry.
+    max_delay
+        The maximum number of seconds to wait before any retry (including delays
+        requested by the server).
+    backoff
+        The factor by which the delay grows after each retry.
+    jitter
+        The fraction of each delay that is randomized (so that many clients
+        failing at once don't retry in lockstep). For example, with `0.5`, the
+        delay is somewhere between 50% and 100% of the (exponential) delay.
+    status_codes
+        The HTTP status codes to retry.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        initial_delay: float = 1,
+        max_delay: float = 60,
+        backoff: float = 2,
+        jitter: float = 0.5,
+        status_codes: Sequence[int] = _TRANSIENT_STATUS_CODES,
+    ):
+        if max_retries < 0:
+            raise ValueError("`max_retries` must be a non-negative integer.")
+        if initial_delay < 0 or max_delay < 0:
+            raise ValueError("Delays must be non-negative numbers.")
+        if backoff < 1:
+            raise ValueError("`backoff` must be at least 1.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("`jitter` must be between 0 and 1.")
+
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.status_codes = tuple(status_codes)
+
+    def __repr__(self) -> str:
+        return (
+            f"<RetryPolicy max_retries={self.max_retries} "
+            f"initial_delay={self.initial_delay} max_delay={self.max_delay}>"
+        )
+
+    def _delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """
+        Get the number of seconds to wait before retrying the `attempt`-th
+        (starting at 1) retry, or `None` if the error shouldn't be retried.
+        """
+        if attempt > self.max_retries or not self._is_retryable(error):
+            return None
+
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        delay = min(self.initial_delay * self.backoff ** (attempt - 1), self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+    def _is_retryable(self, error: BaseException) -> bool:
+        return is_transient_error(error, self.status_codes)
+
+
+def is_transient_error(
+    error: BaseException,
+    status_codes: Sequence[int] = _TRANSIENT_STATUS_CODES,
+) -> bool:
+    """
+    Whether an error is (likely) transient: a connection error, a timeout, or
+    an HTTP error with one of `status_codes`.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in status_codes
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in _CONNECTION_ERRORS for cls in type(error).__mro__)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    # openai/anthropic use `status_code`; google.api_core uses `code`
+    for attr in ("status_code", "code"):
+        code = getattr(error, attr, None)
+        if isinstance(code, int) and 100 <= code < 600:
+            return code
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    response: Any = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+    # Retry-After may also be an HTTP date
+    date = email.utils.parsedate_tz(retry_after)
+    if date is None:
+        return None
+    return max(email.utils.mktime_tz(date) - time.time(), 0)
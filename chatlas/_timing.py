@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ._turn import Turn
+
+__all__ = ("TurnTiming",)
+
+
+@dataclass
+class TurnTiming:
+    """
+    Timing of the request that generated an (assistant) turn.
+
+    All times are in seconds. They're measured around the provider's SDK call,
+    so `build` is the time chatlas spent before sending the request, while
+    `ttft` and `duration` are (mostly) the provider's latency. Note that, when
+    streaming, the time spent handling each chunk (e.g., displaying it) is
+    included in the times that follow it.
+
+    Parameters
+    ----------
+    build
+        The time from submitting the input until the request was sent. This
+        includes applying the context policy, checking the response cache, and
+        waiting for the rate limiter (but not the time the provider's SDK takes
+        to build the HTTP request).
+    ttft
+        The time to first token, i.e., from sending the request until the first
+        chunk was received. For responses that aren't streamed, this is the
+        same as `duration`.
+    duration
+        The time from sending the request until the response was complete.
+    chunks
+        The number of chunks received (0 if the response wasn't streamed).
+    max_chunk_interval
+        The longest time between two consecutive chunks (0 if there were fewer
+        than two chunks).
+    attempts
+        The number of times the request was sent (i.e., 1 plus the number of
+        retries). The other times are of the last (successful) attempt.
+    tokens_per_second
+        The number of output tokens per second of generating them (i.e., after
+        the first chunk, when streaming). `None` if the number of output tokens
+        is unknown.
+    """
+
+    build: float
+    ttft: float
+    duration: float
+    chunks: int
+    max_chunk_interval: float
+    attempts: int
+    tokens_per_second: Optional[float]
+
+
+class TurnTimer:
+    """
+    Record the timing of a request (see `TurnTiming`).
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._build: Optional[float] = None
+        self._attempts = 0
+        self._sent = self._start
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._received: Optional[float] = None
+        self._chunks = 0
+        self._max_chunk_interval = 0.0
+
+    def sent(self) -> None:
+        """Mark that the request is (re-)sent."""
+        now = time.perf_counter()
+        if self._build is None:
+            self._build = now - self._start
+        self._attempts += 1
+        self._sent = now
+        self._first = self._last = self._received = None
+        self._chunks = 0
+        self._max_chunk_interval = 0.0
+
+    def chunk(self) -> None:
+        """Mark that a chunk was received."""
+        now = time.perf_counter()
+        if self._last is None:
+            self._first = now
+        else:
+            self._max_chunk_interval = max(self._max_chunk_interval, now - self._last)
+        self._last = now
+        self._chunks += 1
+
+    def received(self) -> None:
+        """Mark that the response is complete."""
+        self._received = time.perf_counter()
+
+    def timing(self, turn: Turn) -> TurnTiming:
+        received = self._received or time.perf_counter()
+        duration = received - self._sent
+        ttft = (self._first or received) - self._sent
+        generating = duration - ttft if self._chunks > 1 else duration
+        tokens_per_second = None
+        if turn.tokens is not None and generating > 0:
+            tokens_per_second = turn.tokens[1] / generating
+        return TurnTiming(
+            build=self._build or 0.0,
+            ttft=ttft,
+            duration=duration,
+            chunks=self._chunks,
+            max_chunk_interval=self._max_chunk_interval,
+            attempts=self._attempts,
+            tokens_per_second=tokens_per_second,
+        )
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ._content import ContentImage, ContentText
+from ._tokens import provider_key
+
+if TYPE_CHECKING:
+    from ._provider import Provider
+    from ._turn import Turn
+
+__all__ = (
+    "count_tokens",
+    "register_tokenizer",
+)
+
+# A few tokens of overhead per message (e.g., for the role)
+_TURN_OVERHEAD = 4
+# Images are priced by size, but are typically ~1000 tokens
+_IMAGE_TOKENS = 1000
+
+
+class Tokenizer:
+    """
+    A named function that counts the tokens in a string.
+
+    The name identifies the encoding, so that token counts cached on turns
+    (which may be sent to different models) aren't mixed up.
+    """
+
+    def __init__(self, name: str, count: Callable[[str], int]):
+        self.name = name
+        self.count = count
+
+    def __repr__(self) -> str:
+        return f"<Tokenizer name='{self.name}'>"
+
+    def count_turn(self, turn: Turn) -> int:
+        """
+        Count the tokens needed to send a turn (cached on the turn).
+        """
+        return turn._cached(f"n_tokens/{self.name}", self._count_turn)
+
+    def _count_turn(self, turn: Turn) -> int:
+        n = _TURN_OVERHEAD
+        for content in turn.contents:
+            if isinstance(content, ContentText):
+                n += self.count(content.text)
+            elif isinstance(content, ContentImage):
+                n += _IMAGE_TOKENS
+            else:
+                n += self.count(str(content))
+        return n
+
+
+def _count_heuristic(text: str) -> int:
+    # ~4 characters per token is typical for English text
+    return (len(text) + 3) // 4
+
+
+HEURISTIC = Tokenizer("heuristic", _count_heuristic)
+
+# Tokenizers registered by the user (by provider name and model)
+_registry: dict[tuple[str, Optional[str]], Tokenizer] = {}
+# Tokenizers resolved (and loaded) by default (by provider name and model)
+_defaults: dict[tuple[str, Optional[str]], Tokenizer] = {}
+_lock = Lock()
+
+
+def register_tokenizer(
+    provider: str,
+    model: Optional[str] = None,
+    *,
+    tokenizer: Optional[Callable[[str], int]],
+) -> None:
+    """
+    Register a function for counting the tokens sent to a provider (and model)
+
+    Token counts are estimated locally (i.e., before a request is sent) for
+    rate limiting ([](`~chatlas.rate_limit`)), context trimming
+    ([](`~chatlas.TokenBudget`)), [](`~chatlas.Chat.estimate_tokens`), and
+    [](`~chatlas.Chat.estimate_cost`).
+
+    By default, OpenAI models are counted with `tiktoken` (if it's installed),
+    and other models are counted with a heuristic (of ~4 characters per token).
+    Registering a tokenizer allows more accurate counts for other models.
+
+    Examples
+    --------
+
+    ```python
+    from tokenizers import Tokenizer
+    from chatlas import register_tokenizer
+
+    tok = Tokenizer.from_pretrained("meta-llama/Llama-3.1-8B-Instruct")
+    register_tokenizer(
+        "OpenAI",
+        "llama3.1",
+        tokenizer=lambda text: len(tok.encode(text).ids),
+    )
+    ```
+
+    Parameters
+    ----------
+    provider
+        The name of the provider (e.g., "OpenAI" or "Anthropic"), as reported by
+        [](`~chatlas.token_usage`).
+    model
+        The name of the model. If `None`, the tokenizer applies to every model of
+        the provider that doesn't have a tokenizer of its own.
+    tokenizer
+        A function that takes a string and returns its number of tokens, or
+        `None` to remove a registered tokenizer.
+    """
+    key = (provider, model)
+    with _lock:
+        if tokenizer is None:
+            _registry.pop(key, None)
+        else:
+            name = f"{provider}/{model}/{id(tokenizer)}"
+            _registry[key] = Tokenizer(name, tokenizer)
+
+
+def get_tokenizer(provider: Optional[Provider] = None) -> Tokenizer:
+    """
+    Get the tokenizer for a provider (or the heuristic tokenizer).
+    """
+    if provider is None:
+        return HEURISTIC
+    key = provider_key(provider)
+    with _lock:
+        res = _registry.get(key) or _registry.get((key[0], None))
+        if res is None:
+            res = _defaults.get(key)
+        if res is None:
+            res = _defaults[key] = _default_tokenizer(*key)
+    return res
+
+
+def _default_tokenizer(name: str, model: Optional[str]) -> Tokenizer:
+    if not name.startswith("OpenAI") or model is None:
+        return HEURISTIC
+    try:
+        import tiktoken
+    except ImportError:
+        return HEURISTIC
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Not an OpenAI model (e.g., one served via an OpenAI-compatible API)
+        return HEURISTIC
+    return Tokenizer(
+        f"tiktoken/{encoding.name}",
+        lambda text: len(encoding.encode(text, disallowed_special=())),
+    )
+
+
+def count_tokens(turns: list[Turn], provider: Optional[Provider] = None) -> int:
+    """
+    Estimate the number of input tokens needed to send turns
+
+    The count is computed locally, with the tokenizer for the provider's model
+    (see [](`~chatlas.register_tokenizer`)), and cached on each turn, so
+    counting a growing conversation only counts the new turns.
+
+    Parameters
+    ----------
+    turns
+        The turns to count.
+    provider
+        The provider the turns are to be sent to. If `None`, a heuristic (of ~4
+        characters per token) is used.
+
+    Returns
+    -------
+    int
+        The (estimated) number of tokens.
+    """
+    tokenizer = get_tokenizer(provider)
+    return sum(tokenizer.count_turn(turn) for turn in turns)
@@ -1,60 +1,208 @@
 from __future__ import annotations
 
-import copy
+import contextlib
+import contextvars
+import threading
 from threading import Lock
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
 from ._typing_extensions import TypedDict
 
 if TYPE_CHECKING:
     from ._provider import Provider
+    from ._turn import Turn
+
+
+CounterKey = tuple[str, Optional[str]]
 
 
 class TokenUsage(TypedDict):
     """
-    Token usage for a given provider (name).
+    Token usage for a given provider (name) and model.
     """
 
     name: str
+    model: Optional[str]
     input: int
     output: int
+    cache_read: int
+    cache_creation: int
+    cost: Optional[float]
+
+
+class TokenPrice(TypedDict):
+    """
+    The price (e.g., in USD) per million tokens of a given provider and model.
+    """
+
+    input: float
+    output: float
+    cache_read: float
+    cache_creation: float
+
+
+# The (input, output, cache_read, cache_creation) tokens of a provider and model
+Counts = list[int]
 
 
 class ThreadSafeTokenCounter:
+    """
+    Counts tokens per provider and model.
+
+    To avoid contention when many threads log tokens at once, each thread
+    counts in its own shard (without taking a lock), and the shards are merged
+    when the usage is read. The shards of threads that have exited are folded
+    together (when the usage is read, and as new shards are registered), so
+    they don't pile up when threads come and go.
+    """
+
+    # The minimum number of shards before they're folded on registration
+    _FOLD_MIN = 16
+
     def __init__(self):
+        self._local = threading.local()
+        # The shards of live threads (and the thread each belongs to)
+        self._shards: list[tuple[threading.Thread, dict[CounterKey, Counts]]] = []
+        # The (merged) counts of threads that have since exited
+        self._retired: dict[CounterKey, Counts] = {}
+        # The number of shards at which they're next folded on registration
+        self._fold_at = self._FOLD_MIN
         self._lock = Lock()
-        self._tokens: dict[str, TokenUsage] = {}
 
-    def log_tokens(self, name: str, input_tokens: int, output_tokens: int) -> None:
-        with self._lock:
-            if name not in self._tokens:
-                self._tokens[name] = {
-                    "name": name,
-                    "input": input_tokens,
-                    "output": output_tokens,
-                }
+    def log_tokens(
+        self,
+        name: str,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_creation_tokens: int = 0,
+        model: Optional[str] = None,
+    ) -> None:
+        shard = self._shard()
+        key = (name, model)
+        counts = shard.get(key)
+        if counts is None:
+            shard[key] = [
+                input_tokens,
+                output_tokens,
+                cache_read_tokens,
+                cache_creation_tokens,
+            ]
+        else:
+            counts[0] += input_tokens
+            counts[1] += output_tokens
+            counts[2] += cache_read_tokens
+            counts[3] += cache_creation_tokens
+
+    def _shard(self) -> dict[CounterKey, Counts]:
+        """Get the current thread's shard (creating it if needed)."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: dict[CounterKey, Counts] = {}
+            self._local.shard = shard
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+                # Fold whenever the number of shards doubles, so that the cost
+                # of folding is spread over the registrations
+                if len(self._shards) >= self._fold_at:
+                    self._fold()
+                    self._fold_at = max(self._FOLD_MIN, 2 * len(self._shards))
+            return shard
+
+    def _fold(self) -> None:
+        """
+        Fold the shards of exited threads into the retired counts, so they
+        aren't merged again (the lock must be held).
+        """
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
             else:
-                self._tokens[name]["input"] += input_tokens
-                self._tokens[name]["output"] += output_tokens
+                _merge(self._retired, shard)
+        self._shards = live
 
-    def get_usage(self) -> list[TokenUsage] | None:
+    def snapshot(self) -> dict[CounterKey, tuple[int, int, int, int]]:
+        """
+        Get the (merged) counts per provider and model.
+
+        Counts logged while the snapshot is taken may or may not be included.
+        """
         with self._lock:
-            if not self._tokens:
-                return None
-            # Create a deep copy to avoid external modifications
-            return copy.deepcopy(list(self._tokens.values()))
+            self._fold()
+            res: dict[CounterKey, Counts] = {}
+            _merge(res, self._retired)
+            for _, shard in self._shards:
+                _merge(res, shard)
+        return {key: tuple(counts) for key, counts in res.items()}  # type: ignore
+
+    def get_usage(self) -> list[TokenUsage] | None:
+        snapshot = self.snapshot()
+        if not snapshot:
+            return None
+        usage: list[TokenUsage] = []
+        for (name, model), counts in snapshot.items():
+            x: TokenUsage = {
+                "name": name,
+                "model": model,
+                "input": counts[0],
+                "output": counts[1],
+                "cache_read": counts[2],
+                "cache_creation": counts[3],
+                "cost": None,
+            }
+            x["cost"] = token_cost(x)
+            usage.append(x)
+        return usage
+
+
+def _merge(into: dict[CounterKey, Counts], shard: dict[CounterKey, Counts]) -> None:
+    # Copying is atomic, so the shard's owner may keep logging meanwhile
+    for key, counts in shard.copy().items():
+        total = into.get(key)
+        if total is None:
+            into[key] = list(counts)
+        else:
+            for i, n in enumerate(counts):
+                total[i] += n
 
 
 # Global instance
 _token_counter = ThreadSafeTokenCounter()
 
+# The counters of the active token scopes (innermost last)
+_scope_counters: contextvars.ContextVar[tuple[ThreadSafeTokenCounter, ...]] = (
+    contextvars.ContextVar("chatlas_token_scopes", default=())
+)
 
-def tokens_log(provider: "Provider", tokens: tuple[int, int]) -> None:
+
+def provider_key(provider: "Provider") -> tuple[str, str | None]:
     """
-    Log token usage for a provider in a thread-safe manner.
+    Get the name (e.g., "OpenAI") and model (if known) of a provider.
     """
     name = provider.__class__.__name__.replace("Provider", "")
-    _token_counter.log_tokens(name, tokens[0], tokens[1])
+    model = getattr(provider, "_model", None)
+    if model is None:
+        # Some providers (e.g., Google) configure the model on the client
+        model = getattr(getattr(provider, "_client", None), "model_name", None)
+    return name, model
+
+
+def tokens_log(
+    provider: "Provider",
+    tokens: tuple[int, int],
+    cached_tokens: tuple[int, int] | None = None,
+) -> None:
+    """
+    Log token usage for a provider in a thread-safe manner.
+    """
+    name, model = provider_key(provider)
+    cache_read, cache_creation = cached_tokens or (0, 0)
+    args = (name, tokens[0], tokens[1], cache_read, cache_creation, model)
+    _token_counter.log_tokens(*args)
+    for counter in _scope_counters.get():
+        counter.log_tokens(*args)
 
 
 def tokens_reset() -> None:
@@ -70,12 +218,226 @@ def token_usage() -> list[TokenUsage] | None:
     Report on token usage in the current session
 
     Call this function to find out the cumulative number of tokens that you
-    have sent and received in the current session.
+    have sent and received in the current session. To report on the usage of a
+    particular chat, see [](`~chatlas.Chat.token_usage`), or of a particular
+    block of code (e.g., a request or a tenant), see
+    [](`~chatlas.token_scope`).
 
     Returns
     -------
     list[TokenUsage] | None
-        A list of dictionaries with the following keys: "name", "input", and "output".
-        If no tokens have been logged, then None is returned.
+        A list of dictionaries (one per provider and model) with the following
+        keys: "name", "model", "input", "output", "cache_read", and
+        "cache_creation" (the latter two being the number of input tokens read
+        from, and written to, the provider's prompt cache), and "cost" (see
+        [](`~chatlas.token_price`)). If no tokens have been logged, then None is
+        returned.
     """
     return _token_counter.get_usage()
+
+
+class TokenScope:
+    """
+    The token usage logged within a [](`~chatlas.token_scope`).
+
+    Parameters
+    ----------
+    name
+        The name of the scope.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._counter = ThreadSafeTokenCounter()
+
+    def __repr__(self) -> str:
+        return f"<TokenScope name={self.name!r}>"
+
+    def usage(self) -> list[TokenUsage] | None:
+        """
+        Get the token usage (in the same format as [](`~chatlas.token_usage`)).
+        """
+        return self._counter.get_usage()
+
+    def cost(self) -> Optional[float]:
+        """
+        Get the total cost, or `None` if the price of any model used is unknown.
+        """
+        return total_cost(self.usage() or [])
+
+
+@contextlib.contextmanager
+def token_scope(name: Optional[str] = None) -> Iterator[TokenScope]:
+    """
+    Track the token usage of a block of code
+
+    Tokens logged within the `with` block (e.g., by any chat handling a request
+    on behalf of a tenant) are counted in the scope (as well as in
+    [](`~chatlas.token_usage`) and any enclosing scopes).
+
+    Scopes are tracked with a context variable, so they apply to `asyncio`
+    tasks created within the block, but not to other threads (unless the
+    context is copied to them, e.g., via `contextvars.copy_context()`).
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, token_scope
+
+    chat = ChatOpenAI()
+    with token_scope("team-a") as scope:
+        chat.chat("What is the capital of France?")
+
+    print(scope.usage(), scope.cost())
+    ```
+
+    Parameters
+    ----------
+    name
+        A name for the scope (e.g., of a request or tenant).
+
+    Returns
+    -------
+    TokenScope
+        The scope, whose token usage can be queried (during or after the block).
+    """
+    scope = TokenScope(name)
+    token = _scope_counters.set((*_scope_counters.get(), scope._counter))
+    try:
+        yield scope
+    finally:
+        _scope_counters.reset(token)
+
+
+def turns_usage(
+    turns: Iterable[Turn], name: str, model: Optional[str]
+) -> list[TokenUsage] | None:
+    """
+    Sum the token usage of turns (by the provider and model that generated them,
+    defaulting to `name` and `model`).
+    """
+    counter = ThreadSafeTokenCounter()
+    for turn in turns:
+        if turn.tokens is None:
+            continue
+        cache_read, cache_creation = turn.cached_tokens or (0, 0)
+        counter.log_tokens(
+            turn.provider or name,
+            turn.tokens[0],
+            turn.tokens[1],
+            cache_read,
+            cache_creation,
+            turn.model if turn.provider else model,
+        )
+    return counter.get_usage()
+
+
+_prices: dict[tuple[str, Optional[str]], TokenPrice] = {}
+_prices_lock = Lock()
+
+
+def token_price(
+    provider: str,
+    model: Optional[str] = None,
+    *,
+    input_tokens: Optional[float] = None,
+    output_tokens: Optional[float] = None,
+    cache_read_tokens: Optional[float] = None,
+    cache_creation_tokens: Optional[float] = None,
+) -> None:
+    """
+    Set the price of a provider's (and model's) tokens
+
+    Prices are used to report the cost of token usage (see
+    [](`~chatlas.token_usage`), [](`~chatlas.token_scope`), and
+    [](`~chatlas.Chat.token_usage`)), and to estimate the cost of a request
+    before it's sent (see [](`~chatlas.Chat.estimate_cost`)). Since prices
+    change (and vary by contract), chatlas doesn't come with any; set the ones
+    that apply to you.
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import token_price, token_usage
+
+    token_price(
+        "OpenAI", "gpt-4o", input_tokens=2.5, output_tokens=10, cache_read_tokens=1.25
+    )
+    token_price(
+        "Anthropic",
+        input_tokens=3,
+        output_tokens=15,
+        cache_read_tokens=0.3,
+        cache_creation_tokens=3.75,
+    )
+
+    print(sum(x["cost"] or 0 for x in token_usage() or []))
+    ```
+
+    Parameters
+    ----------
+    provider
+        The name of the provider (e.g., "OpenAI" or "Anthropic"), as reported by
+        [](`~chatlas.token_usage`).
+    model
+        The name of the model. If `None`, the price applies to every model of
+        the provider that doesn't have a price of its own.
+    input_tokens
+        The price per million input tokens. If `None` (as well as
+        `output_tokens`), the price of the provider and model is removed.
+    output_tokens
+        The price per million output tokens.
+    cache_read_tokens
+        The price per million input tokens read from the provider's prompt
+        cache. Defaults to `input_tokens`.
+    cache_creation_tokens
+        The price per million input tokens written to the provider's prompt
+        cache. Defaults to `input_tokens`.
+    """
+    key = (provider, model)
+    with _prices_lock:
+        if input_tokens is None and output_tokens is None:
+            _prices.pop(key, None)
+            return
+        if input_tokens is None or output_tokens is None:
+            raise ValueError(
+                "Both `input_tokens` and `output_tokens` prices are required."
+            )
+        if cache_read_tokens is None:
+            cache_read_tokens = input_tokens
+        if cache_creation_tokens is None:
+            cache_creation_tokens = input_tokens
+        _prices[key] = {
+            "input": input_tokens,
+            "output": output_tokens,
+            "cache_read": cache_read_tokens,
+            "cache_creation": cache_creation_tokens,
+        }
+
+
+def token_cost(usage: TokenUsage) -> Optional[float]:
+    """
+    Get the cost of token usage, or `None` if the price is unknown.
+    """
+    key = (usage["name"], usage["model"])
+    price = _prices.get(key) or _prices.get((key[0], None))
+    if price is None:
+        return None
+    return (
+        usage["input"] * price["input"]
+        + usage["output"] * price["output"]
+        + usage["cache_read"] * price["cache_read"]
+        + usage["cache_creation"] * price["cache_creation"]
+    ) / 1e6
+
+
+def total_cost(usage: list[TokenUsage]) -> Optional[float]:
+    """
+    Get the total cost of token usage, or `None` if any price is unknown.
+    """
+    costs = [x["cost"] for x in usage]
+    if any(x is None for x in costs):
+        return None
+    return sum(costs)  # type: ignore
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import inspect
+import json
+import time
 import warnings
-from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Optional
 
 from pydantic import BaseModel, Field, create_model
 
 from . import _utils
 
-__all__ = ("Tool",)
+__all__ = (
+    "Tool",
+    "ToolCache",
+)
 
 if TYPE_CHECKING:
     from openai.types.chat import ChatCompletionToolParam
@@ -31,6 +38,14 @@ class Tool:
         The primary reason why you might want to provide a model in
         Note that the name and docstring of the model takes precedence over the
         name and docstring of the function.
+    timeout
+        The maximum number of seconds to wait for the tool to return. If a call
+        takes longer, the model is sent an error result instead (the call is
+        cancelled if the tool is async, and abandoned otherwise). If `None`, the
+        chat-wide default (see `Chat.set_tool_options()`) applies.
+    cache
+        A [](`~chatlas.ToolCache`) to memoize the tool's results with. This is
+        only appropriate for tools whose result depends only on their arguments.
     """
 
     func: Callable[..., Any] | Callable[..., Awaitable[Any]]
@@ -40,13 +55,148 @@ class Tool:
         func: Callable[..., Any] | Callable[..., Awaitable[Any]],
         *,
         model: Optional[type[BaseModel]] = None,
+        timeout: Optional[float] = None,
+        cache: Optional[ToolCache] = None,
     ):
+        if timeout is not None and timeout <= 0:
+            raise ValueError("`timeout` must be a positive number or `None`.")
+
         self.func = func
+        self.timeout = timeout
+        self.cache = cache
         self._is_async = _utils.is_async_callable(func)
         self.schema = func_to_schema(func, model)
         self.name = self.schema["function"]["name"]
 
 
+class ToolCache:
+    """
+    Memoize the results of a tool
+
+    Many tools are pure lookups that the model may call repeatedly with the
+    same arguments (across turns, or even across chats). Give such tools a
+    `ToolCache` (via `Chat.register_tool(cache=...)` or `Tool(cache=...)`) to
+    return the previous result instead of calling the function again. Share a
+    `ToolCache` object between chats (or tools) to share it between them.
+    Results are keyed by the tool's name as well as its arguments, so tools
+    that share a cache never see each other's results.
+
+    Only successful results are cached (i.e., errors and timeouts are not).
+
+    Examples
+    --------
+
+    ```python
+    from chatlas import ChatOpenAI, ToolCache
+
+
+    def get_weather(city: str) -> str:
+        "Get the current weather for a city."
+        ...
+
+
+    cache = ToolCache(maxsize=256, ttl=600)
+
+    chat = ChatOpenAI()
+    chat.register_tool(get_weather, cache=cache)
+    chat.chat("What's the weather like in Paris and in Rome?")
+    print(cache.hits, cache.misses)
+    ```
+
+    Parameters
+    ----------
+    maxsize
+        The maximum number of results to keep. When the cache is full, the least
+        recently used result is discarded. If `None`, the cache is unbounded.
+    ttl
+        The number of seconds a result remains valid. If `None`, results never
+        expire.
+    key
+        A function that takes the tool call arguments (usually a dictionary) and
+        returns a hashable cache key. By default, the arguments are serialized
+        to (canonical) JSON.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        key: Optional[Callable[[Any], Hashable]] = None,
+    ):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer or `None`.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("`ttl` must be a positive number or `None`.")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key_func = key or _default_cache_key
+        self._lock = Lock()
+        # Maps each key to an (expiry time, result) pair
+        self._results: OrderedDict[Hashable, tuple[Optional[float], Any]] = (
+            OrderedDict()
+        )
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """The number of tool calls answered from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of tool calls that weren't found in the cache."""
+        return self._misses
+
+    def clear(self) -> None:
+        """Remove all results and reset the hit/miss counters."""
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ToolCache size={len(self)} maxsize={self.maxsize} ttl={self.ttl} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+    def _key(self, name: str, arguments: Any) -> Hashable:
+        # Include the tool's name, since a cache may be shared by several tools
+        return (name, self._key_func(arguments))
+
+    def _get(self, key: Hashable) -> Any:
+        """Get a result (or `MISSING`), counting the hit or miss."""
+        with self._lock:
+            entry = self._results.get(key, None)
+            if entry is not None:
+                expires, result = entry
+                if expires is None or time.monotonic() < expires:
+                    self._results.move_to_end(key)
+                    self._hits += 1
+                    return result
+                del self._results[key]
+            self._misses += 1
+            return _utils.MISSING
+
+    def _set(self, key: Hashable, result: Any) -> None:
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._results[key] = (expires, result)
+            self._results.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+
+
+def _default_cache_key(arguments: Any) -> Hashable:
+    return json.dumps(arguments, sort_keys=True, default=repr)
+
+
 def func_to_schema(
     func: Callable[..., Any] | Callable[..., Awaitable[Any]],
     model: Optional[type[BaseModel]] = None,
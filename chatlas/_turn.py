@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from typing import Any, Generic, Literal, Optional, Sequence, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 from ._content import Content, ContentText
 
+if TYPE_CHECKING:
+    from ._timing import TurnTiming
+
 __all__ = ("Turn",)
 
 CompletionT = TypeVar("CompletionT")
+T = TypeVar("T")
 
 
 class Turn(Generic[CompletionT]):
@@ -55,6 +68,11 @@ class Turn(Generic[CompletionT]):
         A numeric vector of length 2 representing the number of input and output
         tokens (respectively) used in this turn. Currently only recorded for
         assistant turns.
+    cached_tokens
+        A numeric vector of length 2 representing the number of input tokens
+        read from, and written to, the provider's prompt cache (respectively).
+        These are in addition to the input tokens in `tokens`. Currently only
+        recorded for assistant turns (of providers that support prompt caching).
     finish_reason
         A string indicating the reason why the conversation ended. This is only
         relevant for assistant turns.
@@ -62,6 +80,17 @@ class Turn(Generic[CompletionT]):
         The completion object returned by the provider. This is useful if there's
         information returned by the provider that chatlas doesn't otherwise expose.
         This is only relevant for assistant turns.
+    provider
+        The name of the provider that generated the turn (e.g., "OpenAI"). This is
+        only relevant for assistant turns, and is particularly useful when a chat
+        may use one of several providers (e.g., [](`~chatlas.FallbackProvider`)).
+    model
+        The name of the model that generated the turn (if known). Like
+        `provider`, this is only relevant for assistant turns.
+    timing
+        The timing of the request that generated the turn (e.g., the time to
+        first token). This is only relevant for assistant turns, and is recorded
+        by [](`~chatlas.Chat`).
     """
 
     def __init__(
@@ -70,8 +99,12 @@ class Turn(Generic[CompletionT]):
         contents: str | Sequence[Content | str],
         *,
         tokens: Optional[tuple[int, int]] = None,
+        cached_tokens: Optional[tuple[int, int]] = None,
         finish_reason: Optional[str] = None,
         completion: Optional[CompletionT] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        timing: Optional[TurnTiming] = None,
     ):
         self.role = role
 
@@ -90,8 +123,23 @@ class Turn(Generic[CompletionT]):
         self.contents = contents2
         self.text = "".join(x.text for x in self.contents if isinstance(x, ContentText))
         self.tokens = tokens
+        self.cached_tokens = cached_tokens
         self.finish_reason = finish_reason
         self.completion = completion
+        self.provider = provider
+        self.model = model
+        self.timing = timing
+        # Provider-specific representations of this turn (e.g., message params),
+        # keyed by provider. Since turns are sent to the provider on every
+        # request, this avoids rebuilding the same payload over and over (which
+        # assumes the turn isn't modified after being sent).
+        self._provider_cache: dict[str, Any] = {}
+
+    def _cached(self, key: str, fn: Callable[[Turn], T]) -> T:
+        """Get (or compute and cache) a provider-specific representation."""
+        if key not in self._provider_cache:
+            self._provider_cache[key] = fn(self)
+        return self._provider_cache[key]
 
     def __str__(self) -> str:
         return self.text
@@ -100,6 +148,8 @@ class Turn(Generic[CompletionT]):
         res = " " * indent + f"<Turn role='{self.role}'"
         if self.tokens:
             res += f" tokens={self.tokens}"
+        if self.cached_tokens:
+            res += f" cached_tokens={self.cached_tokens}"
         if self.finish_reason:
             res += f" finish_reason='{self.finish_reason}'"
         if self.completion:
@@ -116,6 +166,7 @@ class Turn(Generic[CompletionT]):
             self.role == other.role
             and self.contents == other.contents
             and self.tokens == other.tokens
+            and self.cached_tokens == other.cached_tokens
             and self.finish_reason == other.finish_reason
             and self.completion == other.completion
         )
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import functools
 import inspect
 import logging
 import os
 import re
-from typing import Awaitable, Callable, TypeVar, cast
+import threading
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Optional, TypeVar, cast
 
 from ._typing_extensions import ParamSpec, TypeGuard
 
@@ -39,6 +43,78 @@ def wrap_async(
     return fn_async
 
 
+def wrap_async_threaded(
+    fn: Callable[P, R],
+    executor: Optional[Executor] = None,
+) -> Callable[P, Awaitable[R]]:
+    """
+    Given a synchronous function that returns R, return an async function that runs
+    the original function in a worker thread (so that it doesn't block the event
+    loop). If `executor` is `None`, `asyncio.to_thread()` is used; otherwise, the
+    function is run via `loop.run_in_executor(executor, ...)`. In both cases, the
+    current `contextvars` context is propagated to the worker.
+    """
+
+    if executor is None:
+
+        @functools.wraps(fn)
+        async def fn_to_thread(*args: P.args, **kwargs: P.kwargs) -> R:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+        return fn_to_thread
+
+    @functools.wraps(fn)
+    async def fn_in_executor(*args: P.args, **kwargs: P.kwargs) -> R:
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        return await loop.run_in_executor(executor, call)
+
+    return fn_in_executor
+
+
+def wrap_async_daemon(fn: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """
+    Given a synchronous function that returns R, return an async function that runs
+    the original function in a new daemon thread. Unlike `wrap_async_threaded()`,
+    the thread can be abandoned: if the awaiting task is cancelled (e.g., by
+    `asyncio.wait_for()`), the function keeps running in the background, but it
+    doesn't hold on to a pooled worker or keep the interpreter from exiting.
+    """
+
+    @functools.wraps(fn)
+    async def fn_in_daemon(*args: P.args, **kwargs: P.kwargs) -> R:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        ctx = contextvars.copy_context()
+
+        def resolve(value: object, error: Optional[BaseException]) -> None:
+            # The future is already cancelled if the caller gave up on it
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(cast(R, value))
+
+        def target() -> None:
+            value, error = None, None
+            try:
+                value = ctx.run(fn, *args, **kwargs)
+            except Exception as e:
+                error = e
+            try:
+                loop.call_soon_threadsafe(resolve, value, error)
+            except RuntimeError:
+                # The event loop was closed before the function returned
+                pass
+
+        threading.Thread(target=target, daemon=True).start()
+        return await future
+
+    return fn_in_daemon
+
+
 def is_async_callable(
     obj: Callable[P, R] | Callable[P, Awaitable[R]],
 ) -> TypeGuard[Callable[P, Awaitable[R]]]:
@@ -64,6 +140,34 @@ def is_async_callable(
     return False
 
 
+class ContentAccumulator:
+    """
+    A mixin that accumulates chunks of text into a (read-only) `content` property.
+
+    Chunks are joined only when the content is requested, and the result is kept
+    until the next chunk arrives, so appending is cheap however often the content
+    is read.
+    """
+
+    def _reset_content(self) -> None:
+        self._chunks: list[str] = []
+        self._content: Optional[str] = ""
+
+    def _append_content(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        self._content = None
+
+    @property
+    def content(self) -> str:
+        """
+        The content received so far.
+        """
+        if self._content is None:
+            self._content = "".join(self._chunks)
+            self._chunks = [self._content]
+        return self._content
+
+
 # https://docs.pytest.org/en/latest/example/simple.html#pytest-current-test-environment-variable
 def is_testing():
     return os.environ.get("PYTEST_CURRENT_TEST", None) is not None
@@ -1,3 +1,4 @@
+from .._batch import BatchClient
 from .._chat import ChatResponse, ChatResponseAsync, SubmitInputArgsT
 from .._content import (
     Content,
@@ -10,10 +11,13 @@ from .._content import (
     ContentToolResult,
     ImageContentTypes,
 )
-from .._tokens import TokenUsage
+from .._context import ContextPolicy
+from .._timing import TurnTiming
+from .._tokens import TokenPrice, TokenScope, TokenUsage
 from .._utils import MISSING, MISSING_TYPE
 
 __all__ = (
+    "BatchClient",
     "Content",
     "ContentImage",
     "ContentImageInline",
@@ -22,11 +26,15 @@ __all__ = (
     "ContentText",
     "ContentToolRequest",
     "ContentToolResult",
+    "ContextPolicy",
     "ChatResponse",
     "ChatResponseAsync",
     "ImageContentTypes",
     "SubmitInputArgsT",
+    "TokenPrice",
+    "TokenScope",
     "TokenUsage",
+    "TurnTiming",
     "MISSING_TYPE",
     "MISSING",
 )
@@ -0,0 +1,88 @@
+# Microbenchmark of token logging across threads.
+#
+# Compares the (sharded) token counter against the previous implementation,
+# which took a single lock on every log (and deep-copied the usage on every
+# read), by the throughput of logging from an increasing number of threads at
+# once (and the time it takes to read the usage afterwards).
+#
+#   python scripts/bench_tokens.py [--logs-per-thread N]
+
+import argparse
+import copy
+import threading
+import time
+from threading import Lock
+
+from chatlas._tokens import ThreadSafeTokenCounter
+
+
+class PreviousTokenCounter:
+    "The previous implementation (which counted tokens per provider only)."
+
+    def __init__(self):
+        self._lock = Lock()
+        self._tokens: dict = {}
+
+    def log_tokens(self, name, input_tokens, output_tokens):
+        with self._lock:
+            if name not in self._tokens:
+                self._tokens[name] = {
+                    "name": name,
+                    "input": input_tokens,
+                    "output": output_tokens,
+                }
+            else:
+                self._tokens[name]["input"] += input_tokens
+                self._tokens[name]["output"] += output_tokens
+
+    def get_usage(self):
+        with self._lock:
+            if not self._tokens:
+                return None
+            return copy.deepcopy(list(self._tokens.values()))
+
+
+def run(counter, logs: list[tuple], n_threads: int, logs_per_thread: int):
+    barrier = threading.Barrier(n_threads + 1)
+
+    def work():
+        barrier.wait()
+        for i in range(logs_per_thread):
+            counter.log_tokens(*logs[i % len(logs)])
+
+    threads = [threading.Thread(target=work) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counter.get_usage()
+    read = time.perf_counter() - start
+    return n_threads * logs_per_thread / elapsed, read
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--logs-per-thread", type=int, default=20_000)
+args = parser.parse_args()
+
+print(
+    f"{'threads':>8} {'previous (logs/s)':>18} {'sharded (logs/s)':>17} "
+    f"{'previous read':>14} {'sharded read':>13}"
+)
+previous_logs = [("OpenAI", 10, 20)]
+sharded_logs = [("OpenAI", 10, 20, 0, 0, m) for m in ["gpt-4o", "gpt-4o-mini", "o1"]]
+for n_threads in [1, 2, 4, 8, 16, 32, 64, 128]:
+    previous, previous_read = run(
+        PreviousTokenCounter(), previous_logs, n_threads, args.logs_per_thread
+    )
+    sharded, sharded_read = run(
+        ThreadSafeTokenCounter(), sharded_logs, n_threads, args.logs_per_thread
+    )
+    print(
+        f"{n_threads:>8} {previous:>18,.0f} {sharded:>17,.0f} "
+        f"{previous_read * 1e6:>12.0f}us {sharded_read * 1e6:>11.0f}us"
+    )
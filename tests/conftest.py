@@ -1,9 +1,11 @@
+import asyncio
 import tempfile
+import time
 from pathlib import Path
 from typing import Awaitable, Callable
 
 import pytest
-from chatlas import Chat, Turn, content_image_file, content_image_url
+from chatlas import Chat, Provider, Turn, content_image_file, content_image_url
 from PIL import Image
 from pydantic import BaseModel
 
@@ -26,6 +28,57 @@ Except for red delicious, that is. They are NOT delicious.
 """
 
 
+class FakeProvider(Provider):
+    "Streams `reply` (word by word) after waiting `latency` seconds."
+
+    def __init__(self, reply: str, latency: float = 0, fail: bool = False):
+        self.reply = reply
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    def _chunks(self):
+        return [x + " " for x in self.reply.split()]
+
+    def chat_perform(self, *, stream, turns, tools, data_model=None, kwargs=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError(self.reply)
+        return iter(self._chunks()) if stream else self.reply
+
+    async def chat_perform_async(
+        self, *, stream, turns, tools, data_model=None, kwargs=None
+    ):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError(self.reply)
+        if not stream:
+            return self.reply
+
+        async def chunks():
+            for x in self._chunks():
+                yield x
+
+        return chunks()
+
+    def stream_text(self, chunk):
+        return chunk
+
+    def stream_merge_chunks(self, completion, chunk):
+        return (completion or "") + chunk
+
+    def stream_turn(self, completion, has_data_model, stream):
+        return Turn("assistant", completion.strip())
+
+    async def stream_turn_async(self, completion, has_data_model, stream):
+        return self.stream_turn(completion, has_data_model, stream)
+
+    def value_turn(self, completion, has_data_model):
+        return Turn("assistant", completion)
+
+
 def retryassert(assert_func: Callable[..., None], retries=1):
     for _ in range(retries):
         try:
@@ -0,0 +1,85 @@
+from pydantic import BaseModel
+
+from chatlas import ChatOpenAI
+from chatlas.types import BatchClient
+
+
+class StubBatchClient(BatchClient):
+    "Answers each request with its last user message, reversed."
+
+    def __init__(self):
+        self.requests = {}
+        self.polls = 0
+
+    def submit(self, requests):
+        self.requests = requests
+        return "batch-1"
+
+    def poll(self, batch_id):
+        self.polls += 1
+        return self.polls > 1
+
+    def results(self, batch_id):
+        res = {}
+        for id_, body in self.requests.items():
+            prompt = body["messages"][-1]["content"][0]["text"]
+            if prompt == "fail":
+                continue
+            if "response_format" in body:
+                content = '{"name": "%s"}' % prompt
+            else:
+                content = prompt[::-1]
+            res[id_] = {
+                "id": id_,
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": content},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 2,
+                    "total_tokens": 3,
+                },
+            }
+        return res
+
+
+def test_chat_batch():
+    chat = ChatOpenAI(system_prompt="Be terse")
+    client = StubBatchClient()
+    turns = chat.chat_batch(
+        ["abc", "fail", ["de", "f"]],
+        client=client,
+        poll_interval=0,
+    )
+
+    assert len(client.requests) == 3
+    assert all("stream" not in x for x in client.requests.values())
+    assert client.polls == 2
+
+    assert turns[0] is not None and turns[0].text == "cba"
+    assert turns[0].tokens == (1, 2)
+    assert turns[1] is None
+    assert turns[2] is not None and turns[2].text == "ed"
+    # The chat itself is left unchanged
+    assert len(chat.turns()) == 0
+
+
+def test_extract_data_batch():
+    class Person(BaseModel):
+        name: str
+
+    chat = ChatOpenAI()
+    data = chat.extract_data_batch(
+        ["Susan", "fail"],
+        data_model=Person,
+        client=StubBatchClient(),
+        poll_interval=0,
+    )
+    assert data == [{"name": "Susan"}, None]
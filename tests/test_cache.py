@@ -0,0 +1,159 @@
+import pytest
+
+from chatlas import Chat, ChatOpenAI, ResponseCache, Turn
+from chatlas._cache import _dump_turn, replay_chunks
+from chatlas.types import ContentJson, ContentToolRequest
+
+from .conftest import FakeProvider
+
+
+class CachingProvider(FakeProvider):
+    "A fake provider that exposes its request (and reports tokens)."
+
+    def _chat_perform_args(self, stream, turns, tools, data_model, kwargs):
+        return {"stream": stream, "messages": [str(turn) for turn in turns]}
+
+    def stream_turn(self, completion, has_data_model, stream):
+        return Turn("assistant", completion.strip(), tokens=(5, 3))
+
+    def value_turn(self, completion, has_data_model):
+        return Turn("assistant", completion, tokens=(5, 3))
+
+
+def test_response_cache_roundtrip(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    turn = Turn(
+        "assistant",
+        [
+            "Hello",
+            ContentToolRequest("1", "get_weather", {"city": "Paris"}),
+            ContentJson({"answer": 42}),
+        ],
+        tokens=(1, 2),
+        finish_reason="stop",
+        completion=object(),
+    )
+
+    assert cache._get("key") is None
+    cache._set("key", turn)
+    # Only the contents (and finish reason) are kept
+    expected = Turn("assistant", turn.contents, finish_reason="stop")
+    assert cache._get("key") == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+    # Responses persist across cache instances
+    cache.close()
+    cache2 = ResponseCache(tmp_path / "cache.sqlite")
+    assert cache2._get("key") == expected
+
+    cache2.clear()
+    assert len(cache2) == 0
+    assert (cache2.hits, cache2.misses) == (0, 0)
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    size = len(_dump_turn(Turn("assistant", "x" * 100)))
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_size=int(size * 2.5))
+
+    for key in ["a", "b"]:
+        cache._set(key, Turn("assistant", key * 100))
+    assert cache._get("a") is not None  # "b" is now the least recently used
+    cache._set("c", Turn("assistant", "c" * 100))
+
+    assert len(cache) == 2
+    assert cache._get("b") is None
+    assert cache._get("a") is not None
+    assert cache._get("c") is not None
+
+
+def test_response_cache_tracks_size(tmp_path):
+    turn = Turn("assistant", "x" * 100)
+    size = len(_dump_turn(turn))
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_size=size * 2)
+
+    # Replacing a response doesn't count its size twice
+    for _ in range(3):
+        cache._set("a", turn)
+    cache._set("b", turn)
+    assert len(cache) == 2
+
+    # The total size persists across cache instances
+    cache.close()
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_size=size * 2)
+    cache._set("c", turn)
+    assert len(cache) == 2
+    assert cache._get("a") is None
+
+
+def test_response_cache_key(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    chat = ChatOpenAI()
+    provider = chat.provider
+
+    def key(prompt, **kwargs):
+        return cache._key(provider, [Turn("user", prompt)], {}, None, kwargs)
+
+    assert key("Hi") == key("Hi")
+    assert key("Hi") != key("Hello")
+    assert key("Hi") != key("Hi", temperature=0)
+
+
+def test_replay_chunks():
+    text = "line 1\nline 2\n\nline 4"
+    assert "".join(replay_chunks(text)) == text
+    assert len(replay_chunks(text)) == 4
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_chat_replays_cached_response(tmp_path, stream):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    provider = CachingProvider("Paris is the capital of France")
+
+    chat = Chat(provider)
+    chat.set_response_cache(cache)
+    first = chat.chat("What is the capital of France?", echo="none", stream=stream)
+    assert provider.calls == 1
+
+    chat2 = Chat(provider)
+    chat2.set_response_cache(cache)
+    second = chat2.chat("What is the capital of France?", echo="none", stream=stream)
+    assert provider.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert str(second).strip() == str(first).strip()
+    assert chat2.last_turn() == Turn("assistant", "Paris is the capital of France")
+
+    # Replayed responses don't count towards the chat's token usage
+    assert chat.token_usage() is not None
+    assert chat2.token_usage() is None
+
+
+def test_chat_replays_cached_stream(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    provider = CachingProvider("Paris is the capital of France")
+
+    chat = Chat(provider)
+    chat.set_response_cache(cache)
+    chunks = list(chat.stream("What is the capital?"))
+
+    chat2 = Chat(provider)
+    chat2.set_response_cache(cache)
+    replayed = list(chat2.stream("What is the capital?"))
+    assert provider.calls == 1
+    assert "".join(replayed) == "".join(chunks).strip()
+
+
+def test_response_cache_errors_dont_fail_the_request(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    provider = CachingProvider("Paris is the capital of France")
+
+    chat = Chat(provider)
+    chat.set_response_cache(cache)
+    # Every database call now raises a sqlite3.ProgrammingError
+    cache.close()
+
+    response = chat.chat("What is the capital?", echo="none")
+    assert str(response).strip() == "Paris is the capital of France"
+    assert provider.calls == 1
+    assert cache.misses == 1
+    assert len(chat.turns()) == 2
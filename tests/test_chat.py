@@ -4,7 +4,7 @@ import tempfile
 import pytest
 from pydantic import BaseModel
 
-from chatlas import ChatOpenAI, Turn
+from chatlas import ChatOpenAI, KeepLastTurns, Turn
 
 
 def test_simple_batch_chat():
@@ -163,3 +163,58 @@ def test_modify_system_prompt():
     # string -> NULL
     chat.system_prompt = None
     assert chat.system_prompt is None
+
+
+def test_chat_response_accumulates_content():
+    from chatlas._chat import ChatResponse
+
+    response = ChatResponse(x for x in ["a", "b", "c"])
+    assert response.content == ""
+    assert next(response) == "a"
+    assert response.content == "a"
+    assert list(response) == ["b", "c"]
+    assert response.content == "abc"
+    assert response.get_content() == "abc"
+
+    with pytest.raises(AttributeError):
+        response.content = "xyz"  # type: ignore
+
+
+def test_fork_shares_history_until_modified():
+    chat = ChatOpenAI()
+    chat.set_turns([Turn("user", "Hi"), Turn("assistant", "Hello")])
+
+    fork = chat.fork()
+    assert fork.provider is chat.provider
+    assert fork._turns is chat._turns
+    assert fork.turns() == chat.turns()
+    assert fork.tools == chat.tools
+
+    # The turns returned are a copy, so modifying them doesn't leak into forks
+    turns = chat.turns()
+    turns.append(Turn("user", "Bye"))
+    assert len(chat.turns()) == 2
+    assert len(fork.turns()) == 2
+
+    # Modifying one chat leaves the other (and shared turns) as is
+    fork.system_prompt = "Be verbose"
+    assert fork._turns is not chat._turns
+    assert chat.system_prompt is None
+    assert fork.turns()[0] is chat.turns()[0]
+
+    def add(x: int, y: int) -> int:
+        "Add two numbers"
+        return x + y
+
+    fork.register_tool(add)
+    assert "add" in fork.tools
+    assert "add" not in chat.tools
+
+    # Stateful options are copied, rather than shared
+    chat.set_context_policy(KeepLastTurns(4))
+    chat._echo_options["rich_markdown"]["code_theme"] = "monokai"  # type: ignore
+    fork = chat.fork()
+    assert fork._context_policy is not chat._context_policy
+    assert fork._context_policy.n == 4  # type: ignore
+    fork._echo_options["rich_markdown"]["code_theme"] = "github"  # type: ignore
+    assert chat._echo_options["rich_markdown"]["code_theme"] == "monokai"
@@ -1,9 +1,13 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 import pytest
 
-from chatlas import ChatOpenAI
-from chatlas.types import ContentToolResult
+from chatlas import ChatOpenAI, ToolCache, Turn
+from chatlas.types import MISSING, ContentToolRequest, ContentToolResult
 
 
 def test_register_tool():
@@ -151,3 +155,316 @@ async def test_invoke_tool_returns_tool_result_async():
     assert res.id == "x"
     assert res.error == "Unknown tool"
     assert res.value is None
+
+
+def tool_request_turns(name: str, n: int) -> list[Turn]:
+    requests = [ContentToolRequest(f"id_{i}", name, {"x": i}) for i in range(n)]
+    return [Turn("user", "Call some tools"), Turn("assistant", requests)]
+
+
+@pytest.mark.asyncio
+async def test_invoke_tools_async_concurrently():
+    chat = ChatOpenAI()
+
+    running = 0
+    max_running = 0
+
+    async def slow_double(x: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Finish in reverse order to check that results remain ordered
+        await asyncio.sleep(0.2 - x * 0.02)
+        running -= 1
+        return x * 2
+
+    chat.register_tool(slow_double)
+    chat.set_turns(tool_request_turns("slow_double", 5))
+
+    turn = await chat._invoke_tools_async()
+    assert turn is not None
+    assert [x.value for x in turn.contents] == [0, 2, 4, 6, 8]
+    assert max_running == 1
+
+    max_running = 0
+    chat.set_tool_options(concurrent=True)
+    start = time.perf_counter()
+    turn = await chat._invoke_tools_async()
+    assert time.perf_counter() - start < 0.5
+    assert turn is not None
+    assert [x.id for x in turn.contents] == [f"id_{i}" for i in range(5)]
+    assert [x.value for x in turn.contents] == [0, 2, 4, 6, 8]
+    assert max_running == 5
+
+    max_running = 0
+    chat.set_tool_options(concurrent=True, max_concurrency=2)
+    turn = await chat._invoke_tools_async()
+    assert turn is not None
+    assert [x.value for x in turn.contents] == [0, 2, 4, 6, 8]
+    assert max_running == 2
+
+    with pytest.raises(ValueError, match="max_concurrency"):
+        chat.set_tool_options(concurrent=True, max_concurrency=0)
+
+
+def test_invoke_tools_in_thread_pool():
+    chat = ChatOpenAI()
+
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def slow_double(x: int) -> int:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.2 - x * 0.02)
+        with lock:
+            running -= 1
+        return x * 2
+
+    chat.register_tool(slow_double)
+    chat.set_turns(tool_request_turns("slow_double", 5))
+
+    chat.set_tool_options(concurrent=True, max_concurrency=5)
+    start = time.perf_counter()
+    turn = chat._invoke_tools()
+    assert time.perf_counter() - start < 0.5
+    assert turn is not None
+    assert [x.id for x in turn.contents] == [f"id_{i}" for i in range(5)]
+    assert [x.value for x in turn.contents] == [0, 2, 4, 6, 8]
+    assert max_running == 5
+
+    max_running = 0
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        chat.set_tool_options(concurrent=True, executor=executor)
+        turn = chat._invoke_tools()
+    assert turn is not None
+    assert [x.value for x in turn.contents] == [0, 2, 4, 6, 8]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_dont_block_the_event_loop():
+    chat = ChatOpenAI()
+
+    threads = set()
+    ticks = 0
+    ticks_seen = []
+
+    def slow_double(x: int) -> int:
+        threads.add(threading.get_ident())
+        time.sleep(0.2)
+        ticks_seen.append(ticks)
+        return x * 2
+
+    chat.register_tool(slow_double)
+    chat.set_turns(tool_request_turns("slow_double", 2))
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    turn, _ = await asyncio.gather(chat._invoke_tools_async(), ticker())
+    assert turn is not None
+    assert [x.value for x in turn.contents] == [0, 2]
+    assert threading.get_ident() not in threads
+    # The ticker was able to run while the (blocking) tool was running
+    assert ticks_seen[0] > 0
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tools") as executor:
+        chat.set_tool_options(executor=executor)
+        turn = await chat._invoke_tools_async()
+    assert turn is not None
+    assert [x.value for x in turn.contents] == [0, 2]
+
+
+def test_invoke_tool_timeout():
+    chat = ChatOpenAI()
+
+    def slow(x: int = 0):
+        time.sleep(1)
+        return x
+
+    start = time.perf_counter()
+    res = chat._invoke_tool(slow, {}, id_="x", timeout=0.1)
+    assert time.perf_counter() - start < 0.5
+    assert res.value is None
+    assert res.error == "Tool call timed out after 0.1 seconds."
+
+    res = chat._invoke_tool(lambda: 1, {}, id_="x", timeout=0.1)
+    assert res.error is None
+    assert res.value == 1
+
+    chat.register_tool(slow, timeout=0.1)
+    chat.set_turns(tool_request_turns("slow", 2))
+    chat.set_tool_options(concurrent=True)
+    start = time.perf_counter()
+    turn = chat._invoke_tools()
+    assert time.perf_counter() - start < 0.5
+    assert turn is not None
+    assert all("timed out" in x.error for x in turn.contents)
+
+
+@pytest.mark.asyncio
+async def test_invoke_tool_timeout_async():
+    chat = ChatOpenAI()
+
+    cancelled = False
+
+    async def slow():
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return 1
+
+    res = await chat._invoke_tool_async(slow, {}, id_="x", timeout=0.1)
+    assert res.value is None
+    assert res.error == "Tool call timed out after 0.1 seconds."
+    assert cancelled
+
+    def slow_sync(x: int = 0):
+        time.sleep(1)
+        return x
+
+    chat.register_tool(slow_sync)
+    chat.set_turns(tool_request_turns("slow_sync", 1))
+    chat.set_tool_options(timeout=0.1)
+    start = time.perf_counter()
+    turn = await chat._invoke_tools_async()
+    assert time.perf_counter() - start < 0.5
+    assert turn is not None
+    assert "timed out" in turn.contents[0].error
+
+
+def test_timed_out_sync_tool_is_abandoned_async():
+    chat = ChatOpenAI()
+
+    release = threading.Event()
+    daemon = []
+
+    def stuck(x: int = 0):
+        daemon.append(threading.current_thread().daemon)
+        release.wait(5)
+        return x
+
+    chat.register_tool(stuck, timeout=0.1)
+    chat.set_turns(tool_request_turns("stuck", 1))
+
+    # asyncio.run() would wait on the default executor's (stuck) worker at
+    # shutdown, if that's where the tool was running
+    try:
+        turn = asyncio.run(chat._invoke_tools_async())
+        assert turn is not None
+        assert "timed out" in turn.contents[0].error
+        assert daemon == [True]
+        assert not release.is_set()
+    finally:
+        release.set()
+
+
+def test_tool_cache():
+    chat = ChatOpenAI()
+
+    calls = []
+
+    def lookup(x: int, y: int = 0) -> int:
+        calls.append((x, y))
+        if x < 0:
+            raise ValueError("x must be positive")
+        return x + y
+
+    cache = ToolCache(maxsize=2)
+    chat.register_tool(lookup, cache=cache)
+    assert chat.tools["lookup"].cache is cache
+
+    def invoke(args):
+        return chat._invoke_tool(lookup, args, id_="x", cache=cache)
+
+    assert invoke({"x": 1, "y": 2}).value == 3
+    # Argument order doesn't matter for the (default) key
+    assert invoke({"y": 2, "x": 1}).value == 3
+    assert calls == [(1, 2)]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Errors aren't cached
+    assert invoke({"x": -1}).error == "x must be positive"
+    assert invoke({"x": -1}).error == "x must be positive"
+    assert len(calls) == 3
+
+    # Least recently used results are evicted
+    invoke({"x": 2})
+    invoke({"x": 3})
+    assert len(cache) == 2
+    invoke({"x": 1, "y": 2})
+    assert calls[-1] == (1, 2)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_tool_cache_ttl_and_key():
+    cache = ToolCache(ttl=0.1, key=lambda args: args["x"])
+    cache._set(cache._key("f", {"x": 1, "ignored": True}), "a")
+    assert cache._get(cache._key("f", {"x": 1})) == "a"
+    time.sleep(0.15)
+    assert cache._get(cache._key("f", {"x": 1})) is MISSING
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_tool_cache_shared_by_tools():
+    chat = ChatOpenAI()
+
+    def get_weather(city: str) -> str:
+        return f"sunny in {city}"
+
+    def get_population(city: str) -> int:
+        return 1000
+
+    cache = ToolCache()
+    chat.register_tool(get_weather, cache=cache)
+    chat.register_tool(get_population, cache=cache)
+    chat.set_turns(
+        [
+            Turn("user", "Weather and population of Paris?"),
+            Turn(
+                "assistant",
+                [
+                    ContentToolRequest("1", "get_weather", {"city": "Paris"}),
+                    ContentToolRequest("2", "get_population", {"city": "Paris"}),
+                ],
+            ),
+        ]
+    )
+    for _ in range(2):
+        turn = chat._invoke_tools()
+        assert turn is not None
+        values = [x.value for x in turn.contents]  # type: ignore
+        assert values == ["sunny in Paris", 1000]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_tool_cache_async():
+    chat = ChatOpenAI()
+
+    calls = 0
+
+    async def lookup(x: int) -> int:
+        nonlocal calls
+        calls += 1
+        return x
+
+    cache = ToolCache()
+    for _ in range(3):
+        res = await chat._invoke_tool_async(lookup, {"x": 1}, id_="x", cache=cache)
+        assert res.value == 1
+    assert calls == 1
+    assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,130 @@
+import pytest
+
+from chatlas import (
+    Chat,
+    KeepLastTurns,
+    SummarizeOlderTurns,
+    TokenBudget,
+    Turn,
+    register_tokenizer,
+)
+from chatlas.types import ContentToolRequest, ContentToolResult
+
+from .conftest import FakeProvider
+
+
+class RecordingProvider(FakeProvider):
+    "Records the turns of each request."
+
+    def __init__(self, reply: str):
+        super().__init__(reply)
+        self.requests: list[list[Turn]] = []
+
+    def chat_perform(self, *, stream, turns, tools, data_model=None, kwargs=None):
+        self.requests.append(turns)
+        return super().chat_perform(stream=stream, turns=turns, tools=tools)
+
+
+def history(n: int) -> list[Turn]:
+    turns = [Turn("system", "Be terse.")]
+    for i in range(n):
+        turns.append(Turn("user", f"question {i}"))
+        turns.append(Turn("assistant", f"answer {i}"))
+    return turns
+
+
+def tool_history() -> list[Turn]:
+    request = ContentToolRequest("x", "get_weather", {})
+    return [
+        Turn("user", "question"),
+        Turn("assistant", [request]),
+        Turn("user", [ContentToolResult("x", "sunny")]),
+        Turn("assistant", "answer"),
+        Turn("user", "another question"),
+    ]
+
+
+def test_keep_last_turns():
+    turns = history(5)
+    res = KeepLastTurns(4).apply(turns)
+    assert res == [turns[0], *turns[-4:]]
+    assert KeepLastTurns(10).apply(turns) is turns
+
+    # Tool requests aren't separated from their results
+    turns = tool_history()
+    assert KeepLastTurns(2).apply(turns) == turns[-1:]
+    assert KeepLastTurns(4).apply(turns) == turns[-1:]
+    assert KeepLastTurns(1).apply(turns[:3]) == turns[:3]
+
+    with pytest.raises(ValueError):
+        KeepLastTurns(0)
+
+
+def test_token_budget():
+    # Count 10 tokens per turn (4 of which are overhead)
+    register_tokenizer("Recording", tokenizer=lambda text: 6)
+    provider = RecordingProvider("reply")
+    try:
+        turns = history(5)
+        budget = TokenBudget(110, provider=provider)
+        assert budget.apply(turns) is turns
+        budget.max_tokens = 50
+        assert budget.apply(turns) == [turns[0], *turns[-4:]]
+        budget.max_tokens = 1
+        assert budget.apply(turns) == [turns[0], *turns[-2:]]
+
+        turns = tool_history()
+        budget = TokenBudget(30, provider=provider)
+        assert budget.apply(turns) == turns[-1:]
+    finally:
+        register_tokenizer("Recording", tokenizer=None)
+
+
+def test_summarize_older_turns():
+    summarizer = RecordingProvider("summary")
+    policy = SummarizeOlderTurns(Chat(summarizer), max_turns=6, keep_last=2)
+
+    turns = history(3)
+    assert policy.apply(turns) is turns
+
+    turns = history(4)
+    res = policy.apply(turns)
+    assert [x.role for x in res] == ["system", "user", "assistant"]
+    assert res[0].text == "Be terse.\n\nSummary of the conversation so far:\n\nsummary"
+    assert res[1:] == turns[-2:]
+    assert len(summarizer.requests) == 1
+    assert "question 2" in summarizer.requests[0][-1].text
+    assert "question 3" not in summarizer.requests[0][-1].text
+
+    # The summary is reused until there are too many new turns again
+    turns = [*turns, Turn("user", "question 4"), Turn("assistant", "answer 4")]
+    system = res[0]
+    res = policy.apply(turns)
+    assert res[1:] == turns[-4:]
+    assert len(summarizer.requests) == 1
+    # ...along with the system turn it's sent in (so that it stays cacheable)
+    assert res[0] is system
+
+    for i in range(5, 8):
+        turns += [Turn("user", f"question {i}"), Turn("assistant", f"answer {i}")]
+    res = policy.apply(turns)
+    assert res[1:] == turns[-2:]
+    # Only the new turns are summarized (along with the previous summary)
+    prompt = summarizer.requests[1][-1].text
+    assert "<summary>\nsummary\n</summary>" in prompt
+    assert "question 3" in prompt and "question 2" not in prompt
+
+
+def test_chat_context_policy_only_limits_sent_turns():
+    provider = RecordingProvider("reply")
+    chat = Chat(provider, turns=history(3))
+    chat.set_context_policy(KeepLastTurns(3))
+    chat.chat("Hi", echo="none")
+
+    sent = provider.requests[-1]
+    assert [x.text for x in sent] == ["Be terse.", "question 2", "answer 2", "Hi"]
+    assert len(chat.turns(include_system_prompt=True)) == 9
+
+    chat.set_context_policy(None)
+    chat.chat("Hi again", echo="none")
+    assert len(provider.requests[-1]) == 10
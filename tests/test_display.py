@@ -0,0 +1,58 @@
+import io
+
+from chatlas._display import LiveMarkdownDisplay, MarkdownDisplay
+
+
+class RecordingDisplay(MarkdownDisplay):
+    def __init__(self, refresh_per_second: float):
+        super().__init__(refresh_per_second)
+        self.renders: list[str] = []
+
+    def _render(self, content: str):
+        self.renders.append(content)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        self._reset()
+
+
+def test_display_throttles_and_flushes_burst():
+    display = RecordingDisplay(refresh_per_second=1)
+    with display:
+        for i in range(100):
+            display.update(f"{i} ")
+        # Only the first chunk is rendered right away
+        assert display.renders == ["0 "]
+        assert display.content == "".join(f"{i} " for i in range(100))
+
+        display.flush()
+        assert len(display.renders) == 2
+        assert display.renders[-1] == display.content
+        # Nothing new to render
+        display.flush()
+        assert len(display.renders) == 2
+
+        display.update("done")
+    # Content received since the last refresh is rendered on exit
+    assert len(display.renders) == 3
+    assert display.renders[-1].endswith("99 done")
+    assert display.content == ""
+
+
+def test_live_display_renders_final_content():
+    file = io.StringIO()
+    display = LiveMarkdownDisplay(
+        {
+            "rich_markdown": {},
+            "rich_console": {"file": file, "width": 80},
+            "css_styles": {},
+            "refresh_per_second": 1,
+        }
+    )
+    with display:
+        for word in ["Hello", " there,", " world!"]:
+            display.update(word)
+    assert "Hello there, world!" in file.getvalue()
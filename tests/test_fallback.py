@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from chatlas import Chat, FallbackProvider, Turn
+
+from .conftest import FakeProvider
+
+
+class BackupProvider(FakeProvider):
+    pass
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_fallback_provider_uses_first_working_provider(stream):
+    primary = FakeProvider("primary reply")
+    backup = BackupProvider("backup reply")
+    chat = Chat(FallbackProvider([primary, backup]))
+    chat.chat("Hi", echo="none", stream=stream)
+    turn = chat.last_turn()
+    assert turn.text == "primary reply"  # type: ignore
+    assert turn.provider == "Fake"  # type: ignore
+    assert backup.calls == 0
+
+    primary.fail = True
+    chat.chat("Hi", echo="none", stream=stream)
+    turn = chat.last_turn()
+    assert turn.text == "backup reply"  # type: ignore
+    assert turn.provider == "Backup"  # type: ignore
+    assert (primary.calls, backup.calls) == (2, 1)
+
+
+def test_fallback_provider_raises_last_error():
+    chat = Chat(
+        FallbackProvider(
+            [FakeProvider("first", fail=True), FakeProvider("last", fail=True)]
+        )
+    )
+    with pytest.raises(ConnectionError, match="last"):
+        chat.chat("Hi", echo="none")
+    assert chat.turns() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stream", [True, False])
+async def test_fallback_provider_async(stream):
+    broken = FakeProvider("broken", fail=True)
+    backup = BackupProvider("backup reply")
+    chat = Chat(FallbackProvider([broken, backup]))
+    if stream:
+        response = await chat.stream_async("Hi")
+        assert await response.get_content() == "backup reply "
+    else:
+        await chat.chat_async("Hi", echo="none")
+    assert chat.last_turn().provider == "Backup"  # type: ignore
+
+
+def test_turn_provider_defaults_to_chat_provider():
+    chat = Chat(FakeProvider("reply"))
+    chat.chat("Hi", echo="none")
+    assert chat.last_turn().provider == "Fake"  # type: ignore
+    assert Turn("user", "Hi").provider is None
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_fallback_provider_timeout(stream):
+    slow = FakeProvider("slow reply", latency=1)
+    backup = BackupProvider("backup reply")
+    chat = Chat(FallbackProvider([slow, backup], timeout=0.1))
+    start = time.perf_counter()
+    chat.chat("Hi", echo="none", stream=stream)
+    assert time.perf_counter() - start < 0.5
+    assert chat.last_turn().provider == "Backup"  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_fallback_provider_timeout_async():
+    slow = FakeProvider("slow reply", latency=1)
+    backup = BackupProvider("backup reply")
+    chat = Chat(FallbackProvider([slow, backup], timeout=0.1))
+    await chat.chat_async("Hi", echo="none")
+    assert chat.last_turn().provider == "Backup"  # type: ignore
+
+    chat = Chat(FallbackProvider([slow], timeout=0.1))
+    with pytest.raises(TimeoutError, match="within 0.1 seconds"):
+        await chat.chat_async("Hi", echo="none")
+
+
+class InvalidRequestProvider(FakeProvider):
+    def chat_perform(self, **kwargs):
+        self.calls += 1
+        raise ValueError("invalid request")
+
+
+def test_fallback_provider_only_falls_back_on_transient_errors():
+    backup = BackupProvider("backup reply")
+    chat = Chat(FallbackProvider([InvalidRequestProvider("x"), backup]))
+    with pytest.raises(ValueError, match="invalid request"):
+        chat.chat("Hi", echo="none")
+    assert backup.calls == 0
+
+    chat = Chat(
+        FallbackProvider(
+            [InvalidRequestProvider("x"), backup],
+            should_fall_back=lambda e: True,
+        )
+    )
+    chat.chat("Hi", echo="none")
+    assert chat.last_turn().provider == "Backup"  # type: ignore
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import pytest
+
+from chatlas import Chat, HedgedProvider
+
+from .conftest import FakeProvider
+
+
+class StuckProvider(FakeProvider):
+    "Doesn't respond until `release` is set (or, if async, until cancelled)."
+
+    def __init__(self, reply: str):
+        super().__init__(reply)
+        self.release = threading.Event()
+        self.started = 0
+        self.cancelled = False
+
+    def chat_perform(self, **kwargs):
+        self.started += 1
+        self.release.wait(5)
+        return super().chat_perform(**kwargs)
+
+    async def chat_perform_async(self, **kwargs):
+        self.started += 1
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().chat_perform_async(**kwargs)
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_hedged_provider_uses_fastest(stream):
+    slow = StuckProvider("slow reply")
+    fast = FakeProvider("fast reply")
+    chat = Chat(HedgedProvider([slow, fast], delay=0.05))
+
+    try:
+        chat.chat("Hi", echo="none", stream=stream)
+        # The request was hedged (rather than waiting for the stuck provider)
+        assert chat.last_turn().text == "fast reply"  # type: ignore
+        assert (slow.started, fast.calls) == (1, 1)
+        assert slow.calls == 0
+    finally:
+        slow.release.set()
+
+
+def test_hedged_provider_only_hedges_after_delay():
+    primary = FakeProvider("primary reply")
+    backup = FakeProvider("backup reply")
+    chat = Chat(HedgedProvider([primary, backup], delay=1))
+    chat.chat("Hi", echo="none")
+    assert chat.last_turn().text == "primary reply"  # type: ignore
+    assert backup.calls == 0
+
+
+def test_hedged_provider_failover_and_errors():
+    broken = FakeProvider("broken", fail=True)
+    backup = FakeProvider("backup reply")
+    chat = Chat(HedgedProvider([broken, backup], delay=10))
+    chat.chat("Hi", echo="none")
+    assert chat.last_turn().text == "backup reply"  # type: ignore
+
+    chat = Chat(HedgedProvider([broken, FakeProvider("x", fail=True)], delay=0))
+    with pytest.raises(ConnectionError, match="broken"):
+        chat.chat("Hi", echo="none")
+
+
+@pytest.mark.asyncio
+async def test_hedged_provider_async():
+    slow = StuckProvider("slow reply")
+    fast = FakeProvider("fast reply")
+    chat = Chat(HedgedProvider([slow, fast], delay=0.05))
+
+    await chat.chat_async("Hi", echo="none")
+    assert chat.last_turn().text == "fast reply"  # type: ignore
+    assert (slow.started, fast.calls) == (1, 1)
+    # The slow request is cancelled (rather than waited on)
+    assert slow.cancelled
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from chatlas import Chat, Turn
+from chatlas._parallel import _parallel_map
+
+from .conftest import FakeProvider
+
+
+@pytest.mark.asyncio
+async def test_parallel_map_orders_retries_and_limits():
+    chat = Chat(FakeProvider("reply"))
+    chat.set_turns([Turn("user", "Hi"), Turn("assistant", "Hello")])
+
+    active = 0
+    max_active = 0
+    attempts: dict[str, int] = {}
+    progress: list[tuple[int, int]] = []
+
+    async def submit(clone, args):
+        nonlocal active, max_active
+        prompt = args[0]
+        attempts[prompt] = attempts.get(prompt, 0) + 1
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01 * (5 - len(prompt)))
+        active -= 1
+        if prompt == "bad" or (prompt == "flaky" and attempts[prompt] == 1):
+            raise ValueError(prompt)
+        reply = Turn("assistant", "", tokens=(1, 2))
+        clone._mutable_turns().extend([Turn("user", prompt), reply])
+        return prompt.upper()
+
+    res = await _parallel_map(
+        chat,
+        ["a", "bad", "flaky", "dd"],
+        submit,
+        max_concurrency=2,
+        max_retries=1,
+        retry_delay=0,
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    assert res.values == ["A", None, "FLAKY", "DD"]
+    assert [e is None for e in res.errors] == [True, False, True, True]
+    assert isinstance(res.errors[1], ValueError)
+    assert res.chats[1] is None
+    assert len(res.chats[0].turns()) == 4  # type: ignore
+    assert res.tokens == (3, 6)
+    assert attempts == {"a": 1, "bad": 2, "flaky": 2, "dd": 1}
+    assert max_active <= 2
+    assert progress[-1] == (4, 4)
+    # The template chat is left unchanged
+    assert len(chat.turns()) == 2
+    assert len(res.chats[3].turns()) == 4  # type: ignore
@@ -84,3 +84,27 @@ def test_anthropic_images():
     chat_fun = ChatAnthropic
     assert_images_inline(chat_fun)
     assert_images_remote_error(chat_fun)
+
+
+def test_anthropic_prompt_caching_breakpoints():
+    from chatlas._anthropic import AnthropicProvider
+
+    message = {"role": "user", "content": [{"type": "text", "text": "Hi"}]}
+    kwargs = {
+        "system": "Be terse",
+        "tools": [{"name": "a"}, {"name": "b"}],
+        "messages": [message],
+    }
+    AnthropicProvider._add_cache_breakpoints(kwargs)  # type: ignore
+
+    ephemeral = {"type": "ephemeral"}
+    assert kwargs["system"] == [
+        {"type": "text", "text": "Be terse", "cache_control": ephemeral}
+    ]
+    assert kwargs["tools"] == [
+        {"name": "a"},
+        {"name": "b", "cache_control": ephemeral},
+    ]
+    assert kwargs["messages"][-1]["content"][-1]["cache_control"] == ephemeral
+    # The original message param (which is cached on the turn) is left as is
+    assert "cache_control" not in message["content"][-1]
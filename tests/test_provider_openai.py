@@ -1,5 +1,8 @@
 import pytest
-from chatlas import ChatOpenAI
+from chatlas import ChatOpenAI, Turn
+from chatlas._merge import merge_dicts
+from chatlas._openai import ChatCompletionAccumulator, OpenAIProvider
+from chatlas.types import ContentToolRequest, ContentToolResult
 
 from .conftest import (
     assert_data_extraction,
@@ -82,3 +85,123 @@ async def test_openai_logprobs():
     logprobs = turn.completion.choices[0].logprobs.content
     assert logprobs is not None
     assert len(logprobs) == len(pieces)
+
+
+def test_openai_stream_accumulator_matches_merge():
+    from openai.types.chat import ChatCompletionChunk
+
+    def chunk(delta, finish_reason=None, usage=None):
+        choices = []
+        if delta is not None:
+            choices = [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-123",
+                "object": "chat.completion.chunk",
+                "created": 1,
+                "model": "gpt-4o",
+                "choices": choices,
+                "usage": usage,
+            }
+        )
+
+    def tool_call(index, arguments, call_id=None, name=None):
+        res = {"index": index, "function": {"arguments": arguments}}
+        if call_id is not None:
+            res.update(id=call_id, type="function")
+            res["function"]["name"] = name
+        return res
+
+    chunks = [
+        chunk({"role": "assistant", "content": ""}),
+        chunk({"content": "Hello"}),
+        chunk({"content": " world"}),
+        chunk({"tool_calls": [tool_call(0, "", call_id="a", name="foo")]}),
+        chunk({"tool_calls": [tool_call(1, "", call_id="b", name="bar")]}),
+        chunk({"tool_calls": [tool_call(0, '{"x":'), tool_call(1, "{}")]}),
+        chunk({"tool_calls": [tool_call(0, " 1}")]}, finish_reason="tool_calls"),
+        chunk(
+            None, usage={"prompt_tokens": 5, "completion_tokens": 7, "total_tokens": 12}
+        ),
+    ]
+
+    expected = chunks[0].model_dump()
+    for x in chunks[1:]:
+        expected = merge_dicts(expected, x.model_dump())
+
+    acc = ChatCompletionAccumulator()
+    for x in chunks:
+        acc.add(x)
+    result = acc.result()
+
+    delta = result["choices"][0]["delta"]
+    expected_delta = expected["choices"][0]["delta"]
+    assert delta["content"] == expected_delta["content"] == "Hello world"
+    assert delta["role"] == "assistant"
+    assert delta["tool_calls"] == expected_delta["tool_calls"]
+    assert delta["tool_calls"][0]["function"] == {
+        "arguments": '{"x": 1}',
+        "name": "foo",
+    }
+    assert result["choices"][0]["finish_reason"] == "tool_calls"
+    assert result["usage"] == expected["usage"]
+
+
+def test_openai_stream_accumulator_merges_names_and_extras():
+    from openai.types.chat import ChatCompletionChunk
+
+    def chunk(delta):
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chatcmpl-123",
+                "object": "chat.completion.chunk",
+                "created": 1,
+                "model": "gpt-4o",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            }
+        )
+
+    def tool_call(index, name, arguments, call_id=None):
+        res = {"index": index, "function": {"name": name, "arguments": arguments}}
+        if call_id is not None:
+            res.update(id=call_id, type="function")
+        return res
+
+    chunks = [
+        chunk({"role": "assistant", "reasoning_content": "Let me"}),
+        chunk({"reasoning_content": " think"}),
+        # A name split across chunks...
+        chunk({"tool_calls": [tool_call(0, "get_", "", call_id="a")]}),
+        chunk({"tool_calls": [tool_call(0, "weather", '{"city":')]}),
+        chunk({"tool_calls": [tool_call(0, None, ' "Paris"}')]}),
+        # ...and a name repeated in every chunk
+        chunk({"tool_calls": [tool_call(1, "get_time", "", call_id="b")]}),
+        chunk({"tool_calls": [tool_call(1, "get_time", "{}")]}),
+    ]
+
+    acc = ChatCompletionAccumulator()
+    for x in chunks:
+        acc.add(x)
+    delta = acc.result()["choices"][0]["delta"]
+
+    assert delta["reasoning_content"] == "Let me think"
+    assert [x["function"] for x in delta["tool_calls"]] == [
+        {"name": "get_weather", "arguments": '{"city": "Paris"}'},
+        {"name": "get_time", "arguments": "{}"},
+    ]
+
+
+def test_openai_message_params_are_built_once_per_turn():
+    turns = [
+        Turn("system", "Be terse"),
+        Turn("user", "What's the weather?"),
+        Turn("assistant", [ContentToolRequest("id", "weather", {"city": "Paris"})]),
+        Turn("user", [ContentToolResult("id", "sunny")]),
+    ]
+
+    params = OpenAIProvider._as_message_param(turns)
+    assert [x["role"] for x in params] == ["system", "user", "assistant", "tool"]
+
+    params2 = OpenAIProvider._as_message_param([*turns, Turn("user", "Thanks")])
+    assert len(params2) == 5
+    assert all(x is y for x, y in zip(params, params2))
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from chatlas import Chat, RateLimiter, RetryPolicy, Turn, rate_limit
+from chatlas._openai import OpenAIProvider
+from chatlas._ratelimit import get_rate_limiter, rate_limit_reset
+from chatlas._tokens import provider_key
+
+from .conftest import FakeProvider
+
+
+class FlakyProvider(FakeProvider):
+    "Fails the first `failures` requests, and reports 15 tokens per response."
+
+    def __init__(self, reply: str, failures: int):
+        super().__init__(reply)
+        self.failures = failures
+
+    def chat_perform(self, **kwargs):
+        self.fail = self.calls < self.failures
+        return super().chat_perform(**kwargs)
+
+    def value_turn(self, completion, has_data_model):
+        return Turn("assistant", completion, tokens=(10, 5))
+
+
+def test_rate_limiter_requests():
+    limiter = RateLimiter(requests_per_minute=60)
+    # The bucket starts full...
+    for _ in range(60):
+        assert limiter._reserve(0) == 0
+    # ...and then refills at one request per second (queued requests wait in order)
+    assert limiter._reserve(0) == pytest.approx(1, abs=0.05)
+    assert limiter._reserve(0) == pytest.approx(2, abs=0.05)
+
+
+def test_rate_limiter_tokens_and_reconcile():
+    limiter = RateLimiter(tokens_per_minute=600)
+    assert limiter._reserve(500) == 0
+    assert limiter._reserve(200) == pytest.approx(10, abs=0.05)
+
+    # The request actually used fewer tokens than estimated
+    limiter.reconcile(200, 100)
+    assert limiter._reserve(0) == 0
+    assert limiter._reserve(100) == pytest.approx(10, abs=0.05)
+
+
+def test_rate_limiter_reconciles_reserved_tokens():
+    limiter = RateLimiter(tokens_per_minute=600)
+    # Only the bucket's capacity is reserved (and credited back)
+    reserved = limiter.acquire(1000)
+    assert reserved == 600
+    limiter.reconcile(reserved, 300)
+    assert limiter._tokens == pytest.approx(300, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_cancelled_wait_gives_back_reservation():
+    limiter = RateLimiter(requests_per_minute=60)
+    for _ in range(60):
+        limiter._reserve(0)
+
+    task = asyncio.create_task(limiter.acquire_async())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The cancelled request no longer holds its place in the queue
+    assert limiter._reserve(0) == pytest.approx(1, abs=0.1)
+
+
+def test_chat_retries_dont_leak_reservations():
+    rate_limit_reset()
+    limiter = rate_limit("Flaky", tokens_per_minute=1000)
+    assert limiter is not None
+
+    chat = Chat(FlakyProvider("Hello", failures=2))
+    chat.set_retry_policy(RetryPolicy(initial_delay=0, jitter=0))
+    chat.chat("Hi", echo="none", stream=False)
+    assert chat.provider.calls == 3  # type: ignore
+
+    # Only the successful request's (actual) tokens are taken from the bucket
+    assert limiter._tokens == pytest.approx(985, abs=1)
+    rate_limit_reset()
+
+
+class BrokenStreamProvider(FakeProvider):
+    "Streams the first word of `reply`, and then fails."
+
+    def chat_perform(self, **kwargs):
+        chunks = super().chat_perform(**kwargs)
+
+        def broken():
+            yield next(chunks)
+            raise ConnectionError("Stream interrupted")
+
+        return broken()
+
+
+@pytest.mark.parametrize(
+    "provider,stream",
+    [
+        (BrokenStreamProvider("Hello there"), True),
+        # Doesn't report its token usage
+        (FakeProvider("Hello there"), False),
+    ],
+)
+def test_chat_reconciles_reservation_once(provider, stream):
+    rate_limit_reset()
+    limiter = rate_limit(provider_key(provider)[0], tokens_per_minute=1000)
+    assert limiter is not None
+    reconciled = []
+    limiter.reconcile = lambda reserved, actual: reconciled.append((reserved, actual))
+
+    chat = Chat(provider)
+    try:
+        chat.chat("Hi", echo="none", stream=stream)
+    except ConnectionError:
+        pass
+
+    # The request is charged the estimated tokens
+    (estimate,) = set(reconciled[0])
+    assert reconciled == [(estimate, estimate)]
+    rate_limit_reset()
+
+
+def test_rate_limit_registry():
+    rate_limit_reset()
+    provider = OpenAIProvider(model="gpt-4o")
+    assert get_rate_limiter(provider) is None
+
+    default = rate_limit("OpenAI", requests_per_minute=10)
+    assert get_rate_limiter(provider) is default
+
+    limiter = rate_limit("OpenAI", "gpt-4o", tokens_per_minute=1000)
+    assert get_rate_limiter(provider) is limiter
+    assert get_rate_limiter(OpenAIProvider(model="gpt-4o-mini")) is default
+
+    rate_limit("OpenAI", "gpt-4o")
+    assert get_rate_limiter(provider) is default
+
+    rate_limit_reset()
+    assert get_rate_limiter(provider) is None
@@ -0,0 +1,76 @@
+import pytest
+
+from chatlas import ChatOpenAI, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.response = FakeResponse(headers or {})
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(max_retries=2, initial_delay=1, backoff=2, jitter=0)
+
+    assert policy._delay(FakeStatusError(500), 1) == 1
+    assert policy._delay(FakeStatusError(429), 2) == 2
+    assert policy._delay(FakeStatusError(429), 3) is None
+    assert policy._delay(ConnectionError(), 1) == 1
+    assert policy._delay(FakeStatusError(400), 1) is None
+    assert policy._delay(ValueError(), 1) is None
+
+    jittered = RetryPolicy(initial_delay=10, jitter=0.5)
+    assert 5 <= jittered._delay(TimeoutError(), 1) <= 10  # type: ignore
+
+
+def test_retry_policy_honors_retry_after():
+    policy = RetryPolicy(max_delay=30)
+    assert policy._delay(FakeStatusError(429, {"retry-after": "7"}), 1) == 7
+    assert policy._delay(FakeStatusError(429, {"retry-after-ms": "250"}), 1) == 0.25
+    assert policy._delay(FakeStatusError(503, {"retry-after": "120"}), 1) == 30
+
+
+def test_chat_retries_failed_requests():
+    from openai.types.chat import ChatCompletion
+
+    chat = ChatOpenAI()
+    chat.set_retry_policy(RetryPolicy(initial_delay=0))
+
+    calls = []
+
+    def chat_perform(**kwargs):
+        calls.append(kwargs)
+        if len(calls) < 3:
+            raise FakeStatusError(503)
+        return ChatCompletion.construct(
+            id="1",
+            object="chat.completion",
+            created=0,
+            model="gpt-4o",
+            choices=[
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Hello"},
+                }
+            ],
+        )
+
+    chat.provider.chat_perform = chat_perform  # type: ignore
+    response = chat.chat("Hi", stream=False, echo="none")
+    assert str(response) == "Hello"
+    assert len(calls) == 3
+    assert len(chat.turns()) == 2
+
+    # Errors that shouldn't be retried leave the turns as is
+    calls.clear()
+    chat.set_retry_policy(None)
+    with pytest.raises(FakeStatusError):
+        chat.chat("Hi again", stream=False, echo="none")
+    assert len(calls) == 1
+    assert len(chat.turns()) == 2
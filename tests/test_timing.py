@@ -0,0 +1,47 @@
+import pytest
+
+from chatlas import Chat, Turn
+
+from .conftest import FakeProvider
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_turns_record_timing(stream):
+    turns: list[Turn] = []
+    chat = Chat(FakeProvider("one two three", latency=0.05))
+    chat.set_timing_callback(turns.append)
+    chat.chat("Hi", echo="none", stream=stream)
+
+    turn = chat.last_turn()
+    assert turns == [turn]
+    timing = turn.timing  # type: ignore
+    assert timing is not None
+    assert timing.attempts == 1
+    assert 0 <= timing.build < 0.05
+    assert 0.05 <= timing.ttft <= timing.duration
+    assert timing.chunks == (3 if stream else 0)
+    # The fake provider doesn't report tokens
+    assert timing.tokens_per_second is None
+    assert chat.turns()[0].timing is None
+
+
+@pytest.mark.asyncio
+async def test_turns_record_timing_async():
+    chat = Chat(FakeProvider("one two three", latency=0.05))
+    await chat.chat_async("Hi", echo="none")
+    timing = chat.last_turn().timing  # type: ignore
+    assert timing is not None
+    assert timing.chunks == 3
+    assert timing.ttft >= 0.05
+
+
+def test_timing_callback_error_keeps_turn():
+    def callback(turn: Turn):
+        raise RuntimeError("metrics are down")
+
+    chat = Chat(FakeProvider("one two three"))
+    chat.set_timing_callback(callback)
+    with pytest.warns(UserWarning, match="metrics are down"):
+        chat.chat("Hi", echo="none")
+    assert [turn.role for turn in chat.turns()] == ["user", "assistant"]
+    assert chat.last_turn().text == "one two three"  # type: ignore
@@ -0,0 +1,51 @@
+from chatlas import Chat, Turn, count_tokens, register_tokenizer, token_price
+
+from .conftest import FakeProvider
+
+
+def test_count_tokens_heuristic():
+    turns = [Turn("user", "x" * 400), Turn("assistant", "y" * 400)]
+    assert count_tokens(turns) == 2 * (100 + 4)
+
+
+def test_count_tokens_is_cached_per_turn():
+    calls = []
+
+    def tokenizer(text: str) -> int:
+        calls.append(text)
+        return len(text.split())
+
+    register_tokenizer("Fake", tokenizer=tokenizer)
+    try:
+        chat = Chat(FakeProvider("hello there"))
+        assert chat.estimate_tokens() == 0
+        assert chat.estimate_tokens("How are you?") == 3 + 4
+        chat.chat("Hi", echo="none")
+        assert chat.estimate_tokens("How are you?") == (1 + 4) + (2 + 4) + (3 + 4)
+        # Only the new turns were counted
+        assert calls == ["How are you?", "Hi", "hello there", "How are you?"]
+
+        # Model-specific tokenizers take precedence
+        chat.provider._model = "fake-1"  # type: ignore
+        register_tokenizer("Fake", "fake-1", tokenizer=lambda text: 1)
+        assert chat.estimate_tokens() == 2 * 5
+    finally:
+        register_tokenizer("Fake", tokenizer=None)
+        register_tokenizer("Fake", "fake-1", tokenizer=None)
+
+    assert count_tokens([Turn("user", "x" * 40)], chat.provider) == 14
+
+
+def test_estimate_cost():
+    chat = Chat(FakeProvider("hello there"))
+    assert chat.estimate_cost("x" * 400) is None
+
+    token_price("Fake", input_tokens=2, output_tokens=10)
+    try:
+        # (100 + 4) input tokens, at $2 per million
+        assert chat.estimate_cost("x" * 400) == 104 * 2 / 1e6
+        assert chat.estimate_cost("x" * 400, output_tokens=50) == (
+            (104 * 2 + 50 * 10) / 1e6
+        )
+    finally:
+        token_price("Fake")
@@ -1,5 +1,15 @@
+import threading
+
+import pytest
+
+from chatlas import Chat, Turn, token_price, token_scope
 from chatlas._openai import OpenAIAzureProvider, OpenAIProvider
-from chatlas._tokens import token_usage, tokens_log, tokens_reset
+from chatlas._tokens import (
+    ThreadSafeTokenCounter,
+    token_usage,
+    tokens_log,
+    tokens_reset,
+)
 
 
 def test_usage_is_none():
@@ -32,3 +42,135 @@ def test_can_retrieve_and_log_tokens():
     assert usage[1]["output"] == 25
 
     tokens_reset()
+
+
+def test_can_log_cached_tokens():
+    tokens_reset()
+
+    provider = OpenAIProvider(model="foo")
+
+    tokens_log(provider, (10, 50), (100, 20))
+    tokens_log(provider, (5, 10))
+    usage = token_usage()
+    assert usage is not None
+    assert usage[0]["input"] == 15
+    assert usage[0]["cache_read"] == 100
+    assert usage[0]["cache_creation"] == 20
+
+    tokens_reset()
+
+
+def test_tokens_are_logged_per_model():
+    tokens_reset()
+
+    tokens_log(OpenAIProvider(model="foo"), (10, 50))
+    tokens_log(OpenAIProvider(model="bar"), (5, 10))
+    usage = token_usage()
+    assert usage is not None
+    assert [(x["model"], x["input"], x["output"]) for x in usage] == [
+        ("foo", 10, 50),
+        ("bar", 5, 10),
+    ]
+
+    tokens_reset()
+
+
+def test_token_scopes():
+    tokens_reset()
+    provider = OpenAIProvider(model="foo")
+
+    with token_scope("outer") as outer:
+        tokens_log(provider, (10, 50))
+        with token_scope("inner") as inner:
+            tokens_log(provider, (5, 10))
+        assert outer.usage() is not None
+    tokens_log(provider, (1, 1))
+
+    assert [x["input"] for x in outer.usage() or []] == [15]
+    assert [x["input"] for x in inner.usage() or []] == [5]
+    assert [x["input"] for x in token_usage() or []] == [16]
+
+    tokens_reset()
+
+
+def test_token_prices():
+    tokens_reset()
+
+    tokens_log(OpenAIProvider(model="foo"), (1_000_000, 100_000), (200_000, 0))
+    usage = token_usage()
+    assert usage is not None
+    assert usage[0]["cost"] is None
+
+    token_price("OpenAI", input_tokens=2, output_tokens=10)
+    token_price("OpenAI", "foo", input_tokens=1, output_tokens=5, cache_read_tokens=0.5)
+    try:
+        usage = token_usage()
+        assert usage is not None
+        assert usage[0]["cost"] == pytest.approx(1 + 0.5 + 0.1)
+
+        token_price("OpenAI", "foo")
+        usage = token_usage()
+        assert usage is not None
+        assert usage[0]["cost"] == pytest.approx(2 + 1 + 0.4)
+    finally:
+        token_price("OpenAI")
+
+    with pytest.raises(ValueError):
+        token_price("OpenAI", input_tokens=1)
+
+    tokens_reset()
+
+
+def test_chat_token_usage():
+    turns = [
+        Turn("user", "Hi"),
+        Turn("assistant", "Hello", tokens=(10, 2)),
+        Turn("user", "Bye"),
+        Turn("assistant", "Bye", tokens=(15, 1), provider="Other", model="x"),
+        Turn("user", "Hi again"),
+        Turn("assistant", "Hello again", tokens=(20, 3)),
+    ]
+    chat = Chat(OpenAIProvider(model="foo"), turns=turns)
+    usage = chat.token_usage()
+    assert usage is not None
+    assert [(x["name"], x["model"], x["input"], x["output"]) for x in usage] == [
+        ("OpenAI", "foo", 30, 5),
+        ("Other", "x", 15, 1),
+    ]
+    assert Chat(OpenAIProvider(model="foo")).token_usage() is None
+
+
+def test_token_counter_merges_thread_shards():
+    counter = ThreadSafeTokenCounter()
+
+    def work():
+        for _ in range(1000):
+            counter.log_tokens("OpenAI", 1, 2, model="foo")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.log_tokens("OpenAI", 1, 2, model="foo")
+
+    assert counter.snapshot() == {("OpenAI", "foo"): (8001, 16002, 0, 0)}
+    # The shards of exited threads have been folded together
+    assert len(counter._shards) == 1
+    assert counter.snapshot() == {("OpenAI", "foo"): (8001, 16002, 0, 0)}
+
+
+def test_token_counter_folds_shards_without_reads():
+    counter = ThreadSafeTokenCounter()
+
+    def work():
+        counter.log_tokens("OpenAI", 1, 2, model="foo")
+
+    # Threads come and go without the usage ever being read
+    for _ in range(200):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        assert len(counter._shards) <= ThreadSafeTokenCounter._FOLD_MIN
+
+    assert counter.snapshot() == {("OpenAI", "foo"): (200, 400, 0, 0)}
@@ -28,3 +28,22 @@ def test_normalize_turns_errors():
 def test_can_extract_text_easily():
     turn = Turn("assistant", [ContentText("ABC"), ContentImage(), ContentText("DEF")])
     assert turn.text == "ABCDEF"
+
+
+def test_provider_representations_are_cached():
+    turn = Turn("user", "Hello")
+    calls = []
+
+    def convert(x: Turn):
+        calls.append(x)
+        return {"role": x.role, "content": x.text}
+
+    assert turn._cached("foo", convert) == {"role": "user", "content": "Hello"}
+    assert turn._cached("foo", convert) is turn._cached("foo", convert)
+    assert len(calls) == 1
+
+    turn._cached("bar", convert)
+    assert len(calls) == 2
+
+    # The cache doesn't affect equality
+    assert turn == Turn("user", "Hello")
@@ -48,3 +48,37 @@ def test_respects_index_when_merging_lists():
     assert merge_dicts(
         {"a": [{"index": 0, "b": "a"}]}, {"a": [{"index": 1, "b": "b"}]}
     ) == {"a": [{"index": 0, "b": "a"}, {"index": 1, "b": "b"}]}
+
+
+def test_merges_many_indexed_list_elements():
+    left = {
+        "a": [
+            {"index": i, "id": f"call_{i}", "type": "function", "args": ""}
+            for i in range(20)
+        ]
+    }
+    right = {
+        "a": [{"index": i, "type": None, "args": str(i)} for i in reversed(range(20))]
+    }
+    right2 = {"a": [{"index": i, "args": "}"} for i in range(20)]}
+    merged = merge_dicts(left, right, right2)
+    assert merged == {
+        "a": [
+            {"index": i, "id": f"call_{i}", "type": "function", "args": f"{i}}}"}
+            for i in range(20)
+        ]
+    }
+    # Inputs are left untouched
+    assert left["a"][0]["args"] == ""
+
+
+def test_new_indexed_list_elements_are_merged_within_the_same_list():
+    assert merge_dicts(
+        {"a": [{"index": 0, "b": "x"}]},
+        {
+            "a": [
+                {"index": 1, "b": "y", "type": "t"},
+                {"index": 1, "b": "z", "type": "u"},
+            ]
+        },
+    ) == {"a": [{"index": 0, "b": "x"}, {"index": 1, "b": "yz", "type": "t"}]}